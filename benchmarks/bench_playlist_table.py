@@ -0,0 +1,104 @@
+# benchmarks/bench_playlist_table.py
+"""
+Gerenciador de Playlist - Benchmark da Tabela Colunar
+Versão 1.0.0
+
+Compara memória e tempo de carga de um catálogo grande (100 mil faixas
+por padrão) no formato antigo, com um dict por faixa e uma dataclass com
+__dict__, e no formato colunar da PlaylistTable.
+
+Uso: python benchmarks/bench_playlist_table.py [--tracks N] [--files N]
+"""
+# benchmarks/bench_playlist_table.py
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.playlist import Track, tracks_from_table  # noqa: E402
+from models.playlist_table import PlaylistTable  # noqa: E402
+
+
+@dataclass
+class LegacyTrack:
+    """Faixa como era antes: dataclass comum, com __dict__ por instância"""
+    sequence: int
+    event: str
+    name: str
+    file_path: str
+    volume: float
+
+
+def make_records(count: int, files: int):
+    """Gera registros no formato antigo, repetindo caminhos e eventos"""
+    return [
+        {
+            "sequence": i + 1,
+            "event": f"Cena {i % 200}",
+            "name": f"Faixa {i % files}",
+            "file_path": f"/musicas/album_{(i % files) // 12}/faixa_{i % files:05d}.mp3",
+            "volume": (i % 100) / 100
+        }
+        for i in range(count)
+    ]
+
+
+def measure(label: str, fn):
+    """Executa fn medindo tempo e memória retida pelo resultado"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<38} {elapsed:9.1f} ms {retained / 1e6:9.1f} MB {peak / 1e6:9.1f} MB")
+    return result, elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da tabela colunar de faixas")
+    parser.add_argument("--tracks", type=int, default=100_000, help="Quantidade de faixas")
+    parser.add_argument("--files", type=int, default=5_000, help="Arquivos distintos")
+    args = parser.parse_args()
+
+    records = make_records(args.tracks, args.files)
+    rows_json = json.dumps({"name": "bench", "tracks": records}, ensure_ascii=False)
+    table_json = json.dumps(
+        {"name": "bench", "columns": PlaylistTable.from_records(records).to_columns()},
+        ensure_ascii=False
+    )
+    del records
+
+    print(f"{args.tracks} faixas, {args.files} arquivos distintos")
+    print(f"JSON por faixa: {len(rows_json) / 1e6:.1f} MB, colunar: {len(table_json) / 1e6:.1f} MB")
+    print(f"{'':<38} {'tempo':>12} {'retida':>12} {'pico':>12}")
+
+    legacy, legacy_ms, legacy_mem = measure(
+        "antigo: json + dict + dataclass",
+        lambda: [LegacyTrack(**r) for r in json.loads(rows_json)["tracks"]]
+    )
+    del legacy
+    table, table_ms, table_mem = measure(
+        "colunar: json + PlaylistTable",
+        lambda: PlaylistTable.from_columns(json.loads(table_json)["columns"])
+    )
+    slotted, _, slotted_mem = measure(
+        "Track com slots a partir da tabela",
+        lambda: tracks_from_table(table)
+    )
+    assert isinstance(slotted[0], Track)
+
+    print(f"Carga: {legacy_ms / table_ms:.1f}x mais rápida, "
+          f"memória: {legacy_mem / max(1, table_mem):.1f}x menor "
+          f"(Track com slots: {legacy_mem / max(1, slotted_mem):.1f}x menor)")
+
+
+if __name__ == "__main__":
+    main()
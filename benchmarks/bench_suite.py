@@ -0,0 +1,377 @@
+# benchmarks/bench_suite.py
+"""
+Gerenciador de Playlist - Suíte de Benchmarks
+Versão 1.0.0
+
+Mede, sem tela e sem placa de som (Qt offscreen, SDL com driver de áudio
+dummy), os caminhos que mais pesam com bibliotecas grandes:
+
+    storage   salvar e carregar playlists de 10, 1 mil e 100 mil faixas
+              em cada backend (JSON, binário, SQLite)
+    probe     sondagem de arquivos (cache frio e quente) e validate_audio_file
+    play      tempo da chamada de reprodução até o mixer reportar a voz
+              tocando, com o som já decodificado e por streaming
+    ui        tempo de MainWindow.load_playlist (carga em segundo plano,
+              apply_playlist e deixas) até a tabela pintada
+
+Os arquivos de áudio de teste (senoides e ruído) são gerados com o ffmpeg
+em um diretório temporário, junto com a configuração e as playlists, sem
+tocar nos dados do usuário. Grupos cujas dependências não estão
+instaladas são pulados e registrados no resultado.
+
+O resultado sai em JSON; com --baseline, cada medida é comparada com um
+resultado anterior e o script termina com código 1 se alguma piorar além
+do limite (--threshold).
+
+Uso: python benchmarks/bench_suite.py [--output resultado.json]
+                                      [--baseline baseline.json] [--threshold 20]
+                                      [--sizes 10,1000,100000] [--only storage,probe]
+"""
+# benchmarks/bench_suite.py
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Precisam estar definidos antes de importar o Qt e o pygame
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+GROUPS = ("storage", "probe", "play", "ui")
+
+# Backends de armazenamento: (nome, storage_backend, storage_format)
+BACKENDS = (
+    ("json", "files", "json"),
+    ("binary", "files", "binary"),
+    ("sqlite", "sqlite", "json"),
+)
+
+LOWER = "lower"
+HIGHER = "higher"
+
+
+class Results:
+    """Medidas coletadas, no formato gravado em JSON"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.skipped = {}
+
+    def add(self, name: str, value: float, unit: str, better: str = LOWER) -> None:
+        self.metrics[name] = {"value": value, "unit": unit, "better": better}
+        print(f"  {name:<44} {value:12.3f} {unit}")
+
+    def skip(self, group: str, reason: str) -> None:
+        self.skipped[group] = reason
+        print(f"  [{group}] pulado: {reason}")
+
+
+def timed(fn, repeat: int = 1) -> float:
+    """Mediana do tempo de fn, em milissegundos"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def make_tracks(count: int):
+    """Faixas sintéticas, com caminhos e eventos repetidos como numa biblioteca real"""
+    from models.playlist import Track
+    files = max(1, min(count, 5_000))
+    return [
+        Track(i + 1, f"Cena {i % 200}", f"Faixa {i % files}",
+              f"/musicas/album_{(i % files) // 12}/faixa_{i % files:05d}.mp3",
+              (i % 100) / 100)
+        for i in range(count)
+    ]
+
+
+def configure(work_dir: str, **overrides):
+    """Aponta a configuração compartilhada para o diretório temporário"""
+    from utils.config_manager import get_config_manager
+    config_manager = get_config_manager()
+    config_manager.config.update({
+        "playlist_directory": os.path.join(work_dir, "data"),
+        "waveforms": False,
+        "autosave": False,
+        **overrides
+    })
+    return config_manager
+
+
+def bench_storage(results: Results, work_dir: str, sizes) -> None:
+    """Salvar e carregar playlists em cada backend"""
+    from models.playlist import PlaylistModel
+    config_manager = configure(work_dir)
+
+    for label, backend, storage_format in BACKENDS:
+        config_manager.config.update({
+            "playlist_directory": os.path.join(work_dir, f"storage_{label}"),
+            "storage_backend": backend,
+            "storage_format": storage_format,
+        })
+        model = PlaylistModel(config_manager)
+        for size in sizes:
+            tracks = make_tracks(size)
+            repeat = 5 if size <= 1000 else 1
+            name = f"bench_{size}"
+
+            save_ms = timed(lambda: model.save_playlist(name, tracks), repeat)
+
+            def load():
+                model.clear_cache()
+                model.load_playlist(name)
+            load_ms = timed(load, repeat)
+
+            results.add(f"storage.{label}.save.{size}", save_ms, "ms")
+            results.add(f"storage.{label}.load.{size}", load_ms, "ms")
+            results.add(f"storage.{label}.load_rate.{size}",
+                        size / max(load_ms / 1000, 1e-9), "tracks/s", HIGHER)
+        model.flush()
+
+
+def generate_audio(directory: str, count: int = 12, duration: float = 3.0):
+    """
+    Gera arquivos de teste com o ffmpeg (senoides e ruído rosa)
+
+    Returns:
+        List[str]: Arquivos gerados; formatos sem codificador disponível são omitidos
+    """
+    import ffmpeg
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    extensions = (".wav", ".ogg", ".mp3")
+    unavailable = set()
+    for i in range(count):
+        if i % 3 == 2:
+            source = f"anoisesrc=color=pink:amplitude=0.3:duration={duration}"
+        else:
+            source = f"sine=frequency={220 * (i % 4 + 1)}:duration={duration}"
+        extension = extensions[i % len(extensions)]
+        # Sem o codificador nesta instalação do ffmpeg, gera WAV
+        if extension in unavailable:
+            extension = ".wav"
+        path = os.path.join(directory, f"bench_{i:03d}{extension}")
+        try:
+            (ffmpeg.input(source, f="lavfi")
+             .output(path, ac=2, ar=44100)
+             .overwrite_output()
+             .run(quiet=True))
+        except ffmpeg.Error:
+            if extension == ".wav":
+                raise
+            unavailable.add(extension)
+            continue
+        paths.append(path)
+    return paths
+
+
+def bench_probe(results: Results, work_dir: str, audio_files) -> None:
+    """Sondagem de arquivos com cache frio e quente"""
+    from utils.media_probe import MediaProbe
+    from utils.audio_handler import AudioUtils
+    configure(work_dir)
+
+    probe = MediaProbe(os.path.join(work_dir, "probe_bench.json"))
+    cold_ms = timed(lambda: probe.probe_many(audio_files))
+    warm_ms = timed(lambda: probe.probe_many(audio_files), 5)
+    results.add("probe.cold.files_per_s", len(audio_files) / (cold_ms / 1000), "files/s", HIGHER)
+    results.add("probe.warm.files_per_s", len(audio_files) / (warm_ms / 1000), "files/s", HIGHER)
+
+    AudioUtils.validate_audio_files(audio_files)
+    validate_ms = timed(lambda: [AudioUtils.validate_audio_file(p) for p in audio_files], 5)
+    results.add("probe.validate_audio_file", validate_ms / len(audio_files), "ms")
+
+
+def bench_play(results: Results, work_dir: str, audio_files, repeat: int = 30) -> None:
+    """Da chamada de reprodução até a voz aparecer tocando no mixer"""
+    from controllers.main_controller import MainController
+    from utils.metrics import Histogram
+    configure(work_dir, prerender=False, loudness_normalization=False)
+
+    controller = MainController()
+    controller.initialize_audio()
+    audio = controller.audio_utils
+
+    def first_buffer(key, path) -> float:
+        start = time.perf_counter()
+        controller.play_voice(key, path, 1.0)
+        # Com o driver dummy o SDL consome os buffers sem dispositivo: a voz
+        # ocupada é o sinal mais próximo do primeiro buffer entregue
+        while not controller.is_voice_playing(key):
+            if time.perf_counter() - start > 2:
+                raise RuntimeError(f"A voz não começou a tocar: {path}")
+        elapsed = (time.perf_counter() - start) * 1000
+        controller.stop_voice(key)
+        return elapsed
+
+    preloaded, streamed = audio_files[0], audio_files[1]
+    audio.sound_bank.load(preloaded)
+    for label, path in (("preloaded", preloaded), ("streamed", streamed)):
+        histogram = Histogram()
+        for i in range(repeat):
+            histogram.record(first_buffer(label, path))
+        summary = histogram.summary()
+        for key in ("p50", "p95", "p99"):
+            results.add(f"play.{label}.first_buffer.{key}", summary[key], "ms")
+
+
+def bench_ui(results: Results, work_dir: str, sizes) -> None:
+    """Carregamento pela janela (MainWindow.load_playlist) e primeira pintura da tabela"""
+    from unittest import mock
+    from PyQt6.QtCore import QEventLoop
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    app = QApplication.instance() or QApplication(["bench"])
+    configure(work_dir, storage_backend="files", storage_format="json",
+              playlist_directory=os.path.join(work_dir, "ui"), silence_trim=False)
+
+    from controllers.main_controller import MainController
+    from views.main_window import MainWindow
+    controller = MainController()
+    # O motor de áudio sobe no primeiro set_cues: inicia antes, fora da medida
+    controller.initialize_audio()
+    window = MainWindow(controller)
+    window.resize(1200, 800)
+    window.show()
+    app.processEvents()
+
+    # apply_playlist termina com um aviso modal, que bloquearia sem tela
+    applied, failures = [], []
+    original_apply = window.apply_playlist
+
+    def apply_playlist(name, tracks, remote=False):
+        original_apply(name, tracks, remote)
+        applied.append(name)
+    window.apply_playlist = apply_playlist
+
+    with mock.patch.object(QMessageBox, "information"), \
+            mock.patch.object(QMessageBox, "critical",
+                              side_effect=lambda parent, title, text: failures.append(text)):
+        for size in sizes:
+            name = f"ui_{size}"
+            controller.playlist_model.save_playlist(name, make_tracks(size))
+
+            def populate():
+                controller.playlist_model.clear_cache()
+                applied.clear()
+                window.load_playlist(name)
+                # Carregamento na thread pool, faixas e deixas aplicadas na da interface
+                deadline = time.perf_counter() + 120
+                while not applied:
+                    if failures:
+                        raise RuntimeError(failures.pop())
+                    if time.perf_counter() > deadline:
+                        raise RuntimeError(f"A playlist {name} não terminou de carregar")
+                    app.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents, 50)
+                window.track_view.viewport().repaint()
+                app.processEvents()
+            results.add(f"ui.populate.{size}", timed(populate, 3 if size <= 1000 else 1), "ms")
+
+        window.close()
+
+
+def compare(results: Results, baseline_path: str, threshold: float) -> bool:
+    """
+    Compara as medidas com um resultado anterior
+
+    Returns:
+        bool: True se alguma medida piorou além do limite
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)["metrics"]
+
+    regressed = False
+    print(f"\nComparação com {baseline_path} (limite {threshold:.0f}%)")
+    for name, current in results.metrics.items():
+        previous = baseline.get(name)
+        if previous is None or not previous["value"]:
+            continue
+        change = (current["value"] - previous["value"]) / previous["value"] * 100
+        worse = change > threshold if current["better"] == LOWER else change < -threshold
+        regressed |= worse
+        flag = "PIOROU" if worse else ""
+        print(f"  {name:<44} {previous['value']:12.3f} -> {current['value']:12.3f} "
+              f"({change:+6.1f}%) {flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do Gerenciador de Playlist")
+    parser.add_argument("--output", help="Arquivo JSON com o resultado")
+    parser.add_argument("--baseline", help="Resultado anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="Piora máxima aceita, em porcentagem (padrão: 20)")
+    parser.add_argument("--sizes", default="10,1000,100000",
+                        help="Quantidades de faixas, separadas por vírgula")
+    parser.add_argument("--only", default=",".join(GROUPS),
+                        help=f"Grupos a executar ({', '.join(GROUPS)})")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    groups = [g for g in args.only.split(",") if g]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"Grupos desconhecidos: {', '.join(sorted(unknown))}")
+
+    results = Results()
+    with tempfile.TemporaryDirectory(prefix="playlist_bench_") as work_dir:
+        # setup.json é lido do diretório atual
+        previous_cwd = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            audio_files = []
+            if {"probe", "play"} & set(groups):
+                try:
+                    audio_files = generate_audio(os.path.join(work_dir, "audio"))
+                except Exception as e:
+                    print(f"Erro ao gerar arquivos de áudio: {str(e)}")
+
+            for group in groups:
+                print(f"[{group}]")
+                try:
+                    if group == "storage":
+                        bench_storage(results, work_dir, sizes)
+                    elif group == "ui":
+                        bench_ui(results, work_dir, sizes)
+                    elif len(audio_files) < 2:
+                        results.skip(group, "arquivos de áudio não gerados (ffmpeg ausente?)")
+                    elif group == "probe":
+                        bench_probe(results, work_dir, audio_files)
+                    else:
+                        bench_play(results, work_dir, audio_files)
+                except ImportError as e:
+                    results.skip(group, f"dependência ausente: {e.name}")
+        finally:
+            os.chdir(previous_cwd)
+
+    document = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "metrics": results.metrics,
+        "skipped": results.skipped,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResultado gravado em {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# cli.py
+"""
+Gerenciador de Playlist - Linha de Comando
+Versão 1.0.0
+
+Operações em lote sobre as playlists, sem interface gráfica: verificar
+os arquivos de todas as playlists, pré-renderizar e normalizar o áudio no
+cache e exportar as playlists. Usa o mesmo MainController do aplicativo,
+sem importar PyQt6 nem pygame.
+
+### Uso
+    python cli.py list
+    python cli.py validate [PLAYLIST ...] [--json]
+    python cli.py render [PLAYLIST ...] [--no-normalize]
+    python cli.py export [PLAYLIST ...] --output DIR [--format m3u|json]
+
+A opção global --jobs N define quantos ffprobe/ffmpeg rodam ao mesmo
+tempo (padrão: um por núcleo).
+"""
+# cli.py
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.config_manager import get_config_manager
+
+
+class Progress:
+    """Mostra o andamento de uma operação na saída de erro"""
+
+    def __init__(self, label: str, enabled: bool = True):
+        self.label = label
+        self.enabled = enabled
+        self.interactive = sys.stderr.isatty()
+        self._last = -1
+
+    def __call__(self, done: int, total: int) -> None:
+        if not self.enabled or not total:
+            return
+        percent = done * 100 // total
+        if self.interactive:
+            sys.stderr.write(f"\r{self.label}: {done}/{total} ({percent}%)")
+            if done == total:
+                sys.stderr.write("\n")
+            sys.stderr.flush()
+        elif percent // 10 != self._last // 10 or done == total:
+            # Fora de um terminal, uma linha a cada 10%
+            print(f"{self.label}: {done}/{total} ({percent}%)", file=sys.stderr)
+        self._last = percent
+
+
+def configure_jobs(jobs: int) -> None:
+    """Aplica --jobs aos pools de sondagem, renderização e análise (sem gravar no setup.json)"""
+    config = get_config_manager().config
+    for key in ("probe_workers", "render_workers", "analysis_workers"):
+        config[key] = jobs
+
+
+def safe_filename(name: str) -> str:
+    """Nome de arquivo derivado do nome da playlist"""
+    return re.sub(r'[^\w\-. ]+', '_', name).strip() or "playlist"
+
+
+def export_paths(names, directory: str, ext: str):
+    """
+    Arquivo de destino de cada playlist, sem repetição
+
+    Nomes distintos podem virar o mesmo arquivo ("a/b" e "a?b" viram
+    "a_b"); os seguintes recebem um sufixo numérico. A comparação ignora
+    maiúsculas, por causa dos sistemas de arquivos que também ignoram.
+    """
+    used = set()
+    paths = {}
+    for name in names:
+        base = candidate = safe_filename(name)
+        suffix = 2
+        while candidate.casefold() in used:
+            candidate = f"{base} ({suffix})"
+            suffix += 1
+        used.add(candidate.casefold())
+        paths[name] = os.path.join(directory, f"{candidate}.{ext}")
+    return paths
+
+
+def select_playlists(controller, names):
+    """Confere os nomes pedidos contra as playlists existentes"""
+    available = controller.get_playlist_names()
+    if not names:
+        return available
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        raise SystemExit(f"Playlist não encontrada: {', '.join(unknown)}")
+    return names
+
+
+def cmd_list(controller, args) -> int:
+    for name in controller.get_playlist_names():
+        print(name)
+    return 0
+
+
+def cmd_validate(controller, args) -> int:
+    names = select_playlists(controller, args.playlists)
+    report = controller.validate_playlists(names, progress=Progress("Verificando", not args.quiet))
+    problems = sum(len(r["missing"]) + len(r["invalid"]) for r in report.values())
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for name, result in report.items():
+            status = "OK" if not (result["missing"] or result["invalid"]) else "ERRO"
+            print(f"[{status}] {name}: {result['files']} arquivo(s)")
+            for path in result["missing"]:
+                print(f"    ausente:  {path}")
+            for path in result["invalid"]:
+                print(f"    inválido: {path}")
+        print(f"{len(report)} playlist(s), {problems} problema(s)")
+    return 1 if problems else 0
+
+
+def cmd_render(controller, args) -> int:
+    names = select_playlists(controller, args.playlists)
+    result = controller.prepare_audio(names, normalize=not args.no_normalize,
+                                      progress=Progress("Renderizando", not args.quiet))
+    for path, error in result["errors"].items():
+        print(f"    falhou: {path}: {error}")
+    print(f"{result['rendered']}/{result['files']} arquivo(s) renderizado(s)")
+    return 1 if result["failed"] else 0
+
+
+def cmd_export(controller, args) -> int:
+    names = select_playlists(controller, args.playlists)
+    os.makedirs(args.output, exist_ok=True)
+    ext = "m3u8" if args.format == "m3u" else "json"
+
+    # Aquece o cache de sondagem em paralelo antes de gravar as durações
+    if args.format == "m3u":
+        controller.validate_playlists(names, progress=Progress("Sondando", not args.quiet))
+
+    paths = export_paths(names, args.output, ext)
+
+    def export(name):
+        path = paths[name]
+        return path, controller.export_playlist(name, path, args.format)
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        for path, count in executor.map(export, names):
+            print(f"{path}: {count} faixa(s)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Operações em lote do Gerenciador de Playlist"
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="processos ffprobe/ffmpeg simultâneos (padrão: núcleos da CPU)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="não mostra o progresso")
+
+    # As opções globais também são aceitas depois do comando
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-j", "--jobs", type=int, default=argparse.SUPPRESS)
+    common.add_argument("-q", "--quiet", action="store_true", default=argparse.SUPPRESS)
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="lista as playlists", parents=[common]).set_defaults(func=cmd_list)
+
+    validate = commands.add_parser("validate", help="verifica arquivos ausentes ou inválidos",
+                                   parents=[common])
+    validate.add_argument("playlists", nargs="*", help="playlists (todas, se omitido)")
+    validate.add_argument("--json", action="store_true", help="relatório em JSON")
+    validate.set_defaults(func=cmd_validate)
+
+    render = commands.add_parser("render", help="pré-renderiza e normaliza o áudio no cache",
+                                 parents=[common])
+    render.add_argument("playlists", nargs="*", help="playlists (todas, se omitido)")
+    render.add_argument("--no-normalize", action="store_true", help="não mede a loudness")
+    render.set_defaults(func=cmd_render)
+
+    export = commands.add_parser("export", help="exporta as playlists", parents=[common])
+    export.add_argument("playlists", nargs="*", help="playlists (todas, se omitido)")
+    export.add_argument("-o", "--output", required=True, help="diretório de destino")
+    export.add_argument("-f", "--format", choices=("m3u", "json"), default="m3u")
+    export.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Função principal da linha de comando"""
+    args = build_parser().parse_args(argv)
+    args.jobs = max(1, args.jobs)
+    configure_jobs(args.jobs)
+
+    from controllers.main_controller import MainController
+    controller = MainController()
+    try:
+        return args.func(controller, args)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    finally:
+        controller.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
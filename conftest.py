@@ -0,0 +1,2 @@
+# conftest.py
+# Mantém a raiz do projeto no sys.path para os testes importarem os pacotes
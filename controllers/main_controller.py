@@ -8,61 +8,734 @@ Data: 04/12/2023
 Controlador principal que gerencia a lógica de negócio do sistema.
 """
 # controllers/main_controller.py
+import os
+import threading
 from models.playlist import PlaylistModel, Track
-from utils.audio_handler import AudioUtils
-from typing import List
+from utils.config_manager import ConfigManager, get_config_manager
+from utils.metrics import get_metrics
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class OperationCancelled(Exception):
+    """Indica que a operação foi cancelada antes de terminar"""
+
+
+def cue_to_event(track: Optional[Track]) -> Optional[Dict]:
+    """Dados da deixa enviados aos ouvintes dos eventos de reprodução"""
+    if track is None:
+        return None
+    return {
+        "sequence": track.sequence,
+        "event": track.event,
+        "name": track.name,
+        "file_path": track.file_path
+    }
+
 
 class MainController:
     """Controlador principal do aplicativo"""
 
-    def __init__(self):
-        self.playlist_model = PlaylistModel()
-        self.audio_utils = AudioUtils()
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        self.config_manager = config_manager or get_config_manager()
+        self.playlist_model = PlaylistModel(self.config_manager)
+        self.metrics = get_metrics()
+        self.metrics.enabled = bool(self.config_manager.config.get("metrics_enabled", False))
+
+        # O áudio (pygame, ffmpeg) é inicializado depois, sob demanda ou em segundo plano
+        self._engine = None
+        self._audio_lock = threading.Lock()
+        self._peak_generator = None
+
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._remote_server = None
+        self.current_playlist: Optional[str] = None
+
+    def initialize_audio(self) -> None:
+        """Inicia o motor de áudio, dono do mixer, se ainda não estiver pronto"""
+        with self._audio_lock:
+            if self._engine is not None:
+                return
+
+            from utils.audio_engine import AudioEngine
+            config = self.config_manager.config
+            engine = AudioEngine(config, self._on_engine_event, config.get("engine_queue_size", 256))
+            engine.start()
+            self._engine = engine
+
+    @property
+    def audio_ready(self) -> bool:
+        """Indica se o áudio já foi inicializado"""
+        return self._engine is not None
+
+    @property
+    def engine(self):
+        """Motor de áudio, iniciado no primeiro uso"""
+        if self._engine is None:
+            self.initialize_audio()
+        return self._engine
+
+    @property
+    def audio_utils(self):
+        """Utilitário de áudio do motor (banco de sons, loudness, renderização)"""
+        return self.engine.audio_utils
+
+    @property
+    def cue_scheduler(self):
+        """Agendador de deixas do motor; comandos devem passar pelo motor"""
+        return self.engine.cue_scheduler
 
     def play_audio(self, file_path: str, volume: float) -> None:
         """
         Reproduz um arquivo de áudio
 
+        Um arquivo fora do banco de sons é aberto pelo motor sem travar
+        quem chamou; uma falha chega como o evento "voice_error".
+
         Args:
             file_path (str): Caminho do arquivo
             volume (float): Volume da reprodução
         """
-        self.audio_utils.play_audio(file_path, volume)
+        with self.metrics.time("controller.play_audio"):
+            self.engine.play_audio(file_path, volume)
+
+    def _stop_fade(self, fade_ms: Optional[int]) -> int:
+        """Saída gradual da parada: a informada ou a configurada em stop_fade_ms"""
+        if fade_ms is None:
+            fade_ms = self.config_manager.config.get("stop_fade_ms", 0)
+        return max(0, int(fade_ms))
+
+    def stop_audio(self, fade_ms: Optional[int] = None) -> None:
+        """
+        Para a reprodução do áudio atual
 
-    def stop_audio(self) -> None:
-        """Para a reprodução do áudio atual"""
-        self.audio_utils.stop_audio()
+        Args:
+            fade_ms (int, opcional): Saída gradual em milissegundos (padrão: stop_fade_ms)
+        """
+        if self.audio_ready:
+            self.engine.stop_all(self._stop_fade(fade_ms))
 
-    def save_playlist(self, name: str, tracks: List[Track]) -> None:
+    def set_cues(self, tracks: List[Track], name: Optional[str] = None) -> None:
+        """
+        Define as deixas encadeadas pelo agendador
+
+        Args:
+            tracks (List[Track]): Faixas da playlist
+            name (str, opcional): Nome da playlist, informado aos ouvintes
+        """
+        self.engine.set_cues(tracks)
+        if name is not None:
+            self.current_playlist = name
+            self._publish("playlist", name=name, tracks=len(tracks))
+
+    def go_next(self) -> Track:
+        """
+        Dispara a próxima deixa da playlist
+
+        Returns:
+            Track: Faixa disparada
+        """
+        return self.engine.go_next()
+
+    def go_to_cue(self, sequence: int) -> Track:
+        """
+        Dispara a deixa de número informado
+
+        Args:
+            sequence (int): Sequência da faixa
+
+        Returns:
+            Track: Faixa disparada
+        """
+        return self.engine.go_to(sequence)
+
+    def set_cue_level(self, level: float) -> float:
+        """
+        Ajusta o nível geral das deixas, inclusive da que está tocando
+
+        Args:
+            level (float): Nível (0.0 a 1.0)
+
+        Returns:
+            float: Nível aplicado
+        """
+        return self.engine.set_cue_level(level)
+
+    def get_cue_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Obtém as latências medidas no disparo e na emenda das deixas
+
+        Returns:
+            Dict: Estatísticas em milissegundos
+        """
+        return self.cue_scheduler.latency_stats()
+
+    def set_volume(self, volume: float) -> None:
+        """
+        Ajusta o volume do áudio em reprodução
+
+        Args:
+            volume (float): Volume da reprodução
+        """
+        self.engine.set_voice_volume(None, volume)
+
+    def play_voice(self, key, file_path: str, volume: float,
+                   fade_in: float = 0.0, fade_out: float = 0.0) -> None:
+        """
+        Reproduz um arquivo em uma voz própria, sem interromper as demais
+
+        Um arquivo fora do banco de sons é aberto pelo motor sem travar
+        quem chamou; uma falha chega como o evento "voice_error".
+
+        Args:
+            key: Identificador da voz (ex.: linha da playlist)
+            file_path (str): Caminho do arquivo
+            volume (float): Volume da reprodução
+            fade_in (float): Entrada gradual, em segundos
+            fade_out (float): Saída gradual antes do fim, em segundos
+        """
+        with self.metrics.time("controller.play_voice"):
+            self.engine.play_voice(key, file_path, volume, fade_in, fade_out)
+
+    def stop_voice(self, key, fade_ms: Optional[int] = None) -> None:
+        """Para a voz informada (fade_ms padrão: stop_fade_ms)"""
+        self.engine.stop_voice(key, self._stop_fade(fade_ms))
+
+    def set_voice_volume(self, key, volume: float) -> None:
+        """
+        Ajusta o volume de uma voz em reprodução, sem aguardar o motor
+
+        Args:
+            key: Identificador da voz
+            volume (float): Volume da reprodução
+        """
+        with self.metrics.time("controller.set_volume"):
+            self.engine.set_voice_volume(key, volume)
+
+    def is_voice_playing(self, key) -> bool:
+        """Indica se a voz informada está soando"""
+        return self.audio_ready and key in self._engine.state.voices
+
+    def active_voices(self) -> list:
+        """Retorna as chaves das vozes que estão soando"""
+        return list(self._engine.state.voices) if self.audio_ready else []
+
+    def stop_cues(self, fade_ms: Optional[int] = None) -> None:
+        """Interrompe as deixas do agendador, mantendo as demais vozes (fade_ms padrão: stop_fade_ms)"""
+        if self.audio_ready:
+            self.engine.stop_cues(self._stop_fade(fade_ms))
+
+    def is_cue_playing(self) -> bool:
+        """Indica se há uma deixa do agendador em reprodução"""
+        return self.current_cue() is not None
+
+    def current_cue(self) -> Optional[Track]:
+        """Faixa da deixa em reprodução, ou None"""
+        return self._engine.state.cue if self.audio_ready else None
+
+    def playback_state(self) -> Dict:
+        """
+        Resumo do estado da reprodução das deixas
+
+        Lido do retrato publicado pelo motor, sem esperar pela fila de comandos.
+
+        Returns:
+            Dict: playlist atual, deixa em reprodução (ou None), nível e vozes
+        """
+        state = self._engine.state if self.audio_ready else None
+        track = state.cue if state else None
+        return {
+            "playlist": self.current_playlist,
+            "playing": track is not None,
+            "cue": cue_to_event(track),
+            "level": state.cue_level if state else 1.0,
+            "voices": list(state.voices) if state else []
+        }
+
+    def _on_engine_event(self, event: str, data: Dict) -> None:
+        """Repassa aos ouvintes os eventos do motor de áudio (na thread do motor)"""
+        if "cue" in data:
+            data = {**data, "cue": cue_to_event(data["cue"])}
+        self._publish(event, **data)
+
+    def add_listener(self, callback: Callable[[Dict], None]) -> None:
+        """
+        Registra um ouvinte dos eventos de reprodução
+
+        O ouvinte recebe um dicionário com a chave "event" ("cue",
+        "stopped", "level", "voice_ended", "voice_error" ou "playlist") e
+        os dados do evento, na thread que provocou a mudança (em geral a do
+        motor).
+
+        Args:
+            callback (Callable): Função chamada a cada evento
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict], None]) -> None:
+        """Remove um ouvinte registrado com add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _publish(self, event: str, **data) -> None:
+        """Entrega o evento a todos os ouvintes"""
+        payload = {"event": event, **data}
+        for callback in list(self._listeners):
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"Erro ao notificar evento {event}: {str(e)}")
+
+    def load_cues(self, name: str) -> int:
+        """
+        Carrega uma playlist e a define como deixas, sem a interface
+
+        Args:
+            name (str): Nome da playlist
+
+        Returns:
+            int: Quantidade de deixas
+        """
+        if name not in self.get_playlist_names():
+            raise Exception(f"Playlist '{name}' não encontrada")
+        tracks = self.load_playlist(name)
+        self.set_cues(tracks, name)
+        return len(tracks)
+
+    def start_remote_control(self) -> Tuple[str, int]:
+        """
+        Inicia o servidor de controle remoto das deixas
+
+        Returns:
+            Tuple[str, int]: Endereço e porta em que o servidor escuta
+        """
+        if self._remote_server is None:
+            from controllers.remote_control import RemoteControlServer
+            config = self.config_manager.config
+            server = RemoteControlServer(
+                self,
+                config.get("remote_host", "127.0.0.1"),
+                config.get("remote_port", 7890),
+                config.get("remote_token", "")
+            )
+            server.start()
+            self._remote_server = server
+        return self._remote_server.address
+
+    def stop_remote_control(self) -> None:
+        """Encerra o servidor de controle remoto, se estiver ativo"""
+        if self._remote_server is not None:
+            self._remote_server.stop()
+            self._remote_server = None
+
+    def save_playlist(self, name: str, tracks: List[Track],
+                      should_cancel: Optional[Callable[[], bool]] = None) -> None:
         """
         Salva uma playlist
 
         Args:
             name (str): Nome da playlist
             tracks (List[Track]): Lista de faixas
+            should_cancel (Callable, opcional): Cancela o salvamento quando
+                retornar True
         """
         try:
-            # Valida arquivos de áudio
-            for track in tracks:
-                if not self.audio_utils.validate_audio_file(track.file_path):
-                    raise Exception(f"Arquivo inválido: {track.file_path}")
+            # Valida arquivos de áudio em paralelo (sem precisar do mixer)
+            from utils.audio_handler import AudioUtils
+            results = AudioUtils.validate_audio_files(
+                [t.file_path for t in tracks], should_cancel
+            )
+            if should_cancel is not None and should_cancel():
+                raise OperationCancelled()
+
+            invalid = [path for path, valid in results.items() if not valid]
+            if invalid:
+                raise Exception(f"Arquivo inválido: {', '.join(invalid)}")
 
             self.playlist_model.save_playlist(name, tracks)
 
+        except OperationCancelled:
+            raise
         except Exception as e:
             raise Exception(f"Erro ao salvar playlist: {str(e)}")
 
-    def load_playlist(self, name: str) -> List[Track]:
+    def load_playlist(self, name: str,
+                      should_cancel: Optional[Callable[[], bool]] = None) -> List[Track]:
         """
         Carrega uma playlist
 
         Args:
             name (str): Nome da playlist
+            should_cancel (Callable, opcional): Cancela o carregamento quando
+                retornar True
 
         Returns:
             List[Track]: Lista de faixas
         """
-        return self.playlist_model.load_playlist(name)
+        tracks = self.playlist_model.load_playlist(name)
+        if should_cancel is not None and should_cancel():
+            raise OperationCancelled()
+
+        # Decodifica as faixas em segundo plano para disparo imediato, já cortadas
+        ordered = sorted(tracks, key=lambda t: t.sequence)
+        self.audio_utils.set_trims(ordered)
+        self.audio_utils.preload([t.file_path for t in ordered])
+
+        # Mede a loudness para normalizar o volume na reprodução
+        self.audio_utils.analyze_loudness([t.file_path for t in ordered])
+
+        return tracks
+
+    def save_playlist_async(self, name: str, tracks: List[Track]):
+        """
+        Salva uma playlist fora da thread da interface
+
+        A tarefa é iniciada com start() depois de conectados os sinais.
+
+        Args:
+            name (str): Nome da playlist
+            tracks (List[Track]): Lista de faixas
+
+        Returns:
+            ControllerTask: Tarefa com os sinais finished/failed/cancelled
+        """
+        from controllers.tasks import ControllerTask
+        return ControllerTask(self.save_playlist, name, list(tracks))
+
+    def load_playlist_async(self, name: str):
+        """
+        Carrega uma playlist fora da thread da interface
+
+        A tarefa é iniciada com start() depois de conectados os sinais.
+
+        Args:
+            name (str): Nome da playlist
+
+        Returns:
+            ControllerTask: Tarefa cujo sinal finished entrega a lista de faixas
+        """
+        from controllers.tasks import ControllerTask
+        return ControllerTask(self.load_playlist, name)
+
+    def analyze_silence(self, name: str,
+                        should_cancel: Optional[Callable[[], bool]] = None) -> List[Track]:
+        """
+        Detecta o silêncio no início e no fim das faixas ainda sem corte
+
+        Os arquivos são analisados em paralelo (com cache pelo hash do
+        conteúdo), os pontos de corte são gravados na playlist e aplicados
+        aos sons já carregados.
+
+        Args:
+            name (str): Nome da playlist
+            should_cancel (Callable, opcional): Descarta o resultado quando
+                retornar True
+
+        Returns:
+            List[Track]: Faixas que receberam pontos de corte
+        """
+        if not self.config_manager.config.get("silence_trim", True):
+            return []
+
+        from utils.silence import get_silence_analyzer
+        tracks = self.playlist_model.load_playlist(name)
+        untrimmed = [t for t in tracks if t.file_path and not (t.start_offset or t.end_offset)]
+        offsets = get_silence_analyzer().analyze_many(t.file_path for t in untrimmed)
+        if should_cancel is not None and should_cancel():
+            raise OperationCancelled()
+
+        # A análise é demorada: grava só os cortes, de uma vez, sobre a versão
+        # atual da playlist, e ignora as faixas que mudaram nesse meio-tempo
+        updates, expected = {}, {}
+        for track in untrimmed:
+            found = offsets.get(track.file_path)
+            if not (found and any(found)):
+                continue
+            updates[track.sequence] = {"start_offset": found[0], "end_offset": found[1]}
+            expected[track.sequence] = {"file_path": track.file_path,
+                                        "start_offset": 0.0, "end_offset": 0.0}
+        if not updates:
+            return []
+        updated = set(self.playlist_model.update_tracks(name, updates, expected))
+        changed = [t for t in self.playlist_model.load_playlist(name) if t.sequence in updated]
+        if changed and self.audio_ready:
+            self.audio_utils.set_trims(changed)
+        return changed
+
+    def analyze_silence_async(self, name: str):
+        """
+        Detecta o silêncio das faixas fora da thread da interface
+
+        Args:
+            name (str): Nome da playlist
+
+        Returns:
+            ControllerTask: Tarefa cujo sinal finished entrega as faixas cortadas
+        """
+        from controllers.tasks import ControllerTask
+        return ControllerTask(self.analyze_silence, name)
+
+    def _playlist_files(self, names: Optional[List[str]]) -> Dict[str, List[str]]:
+        """Arquivos de cada playlist, sem repetição e na ordem das faixas"""
+        names = list(names) if names else self.get_playlist_names()
+        return {name: list(dict.fromkeys(p for p in self.playlist_model.load_table(name).file_paths() if p))
+                for name in names}
+
+    def validate_playlists(self, names: Optional[List[str]] = None,
+                           should_cancel: Optional[Callable[[], bool]] = None,
+                           progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict]:
+        """
+        Verifica os arquivos de várias playlists em paralelo
+
+        Cada arquivo é sondado uma única vez, mesmo que apareça em várias
+        playlists; os resultados ficam no cache de sondagem.
+
+        Args:
+            names (List[str], opcional): Playlists a verificar (todas, se omitido)
+            should_cancel (Callable, opcional): Interrompe a verificação
+                quando retornar True
+            progress (Callable, opcional): Recebe (arquivos verificados, total)
+
+        Returns:
+            Dict[str, Dict]: Por playlist, a quantidade de arquivos ("files"),
+            os inexistentes ("missing") e os sem áudio reconhecível ("invalid")
+        """
+        from utils.media_probe import get_media_probe
+        files = self._playlist_files(names)
+        unique = list(dict.fromkeys(p for paths in files.values() for p in paths))
+        results = get_media_probe().probe_many(unique, should_cancel, progress)
+        if should_cancel is not None and should_cancel():
+            raise OperationCancelled()
+
+        exists = {p: os.path.exists(p) for p in unique}
+        return {
+            name: {
+                "files": len(paths),
+                "missing": [p for p in paths if not exists[p]],
+                "invalid": [p for p in paths if exists[p] and results.get(p) is None]
+            }
+            for name, paths in files.items()
+        }
+
+    def prepare_audio(self, names: Optional[List[str]] = None, normalize: bool = True,
+                      progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Pré-renderiza os arquivos das playlists no cache de renderização
+
+        Os arquivos são convertidos em paralelo para o formato nativo do
+        mixer e, com normalize, também têm a loudness medida, de modo que a
+        reprodução posterior não precise decodificar nem analisar nada.
+
+        Args:
+            names (List[str], opcional): Playlists a preparar (todas, se omitido)
+            normalize (bool): Mede a loudness para a normalização de volume
+            progress (Callable, opcional): Recebe (etapas concluídas, total)
+
+        Returns:
+            Dict: Quantidade de arquivos ("files"), renderizados ("rendered"),
+            a lista dos que falharam ("failed") e o erro de cada um ("errors")
+        """
+        from concurrent.futures import as_completed
+        from utils.transcoder import get_transcoder
+
+        files = self._playlist_files(names)
+        paths = [p for p in dict.fromkeys(p for ps in files.values() for p in ps) if os.path.exists(p)]
+        normalize = normalize and self.config_manager.config.get("loudness_normalization", True)
+        total = len(paths) * (2 if normalize else 1)
+
+        transcoder = get_transcoder()
+        futures = {transcoder.submit(p): p for p in paths}
+        errors = {}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                future.result()
+            except Exception as e:
+                errors[futures[future]] = str(e)
+            if progress is not None:
+                progress(done, total)
+
+        if normalize and paths:
+            from utils.loudness import get_loudness_analyzer
+            rendered = len(paths)
+            get_loudness_analyzer().analyze_many(
+                paths, None if progress is None else lambda done, _: progress(rendered + done, total)
+            )
+
+        return {"files": len(paths), "rendered": len(paths) - len(errors),
+                "failed": list(errors), "errors": errors}
+
+    def export_playlist(self, name: str, path: str, fmt: str = "m3u") -> int:
+        """
+        Exporta uma playlist para outro formato
+
+        Args:
+            name (str): Nome da playlist
+            path (str): Arquivo de destino
+            fmt (str): "m3u" (M3U estendido em UTF-8) ou "json"
+
+        Returns:
+            int: Quantidade de faixas exportadas
+        """
+        from models.playlist import track_to_record
+        from utils.atomic_io import atomic_write, atomic_write_json
+
+        try:
+            tracks = sorted(self.playlist_model.load_playlist(name), key=lambda t: t.sequence)
+            if fmt == "json":
+                atomic_write_json(path, {"name": name, "tracks": [track_to_record(t) for t in tracks]},
+                                  indent=2, ensure_ascii=False)
+            elif fmt == "m3u":
+                from utils.media_probe import get_media_probe
+                probe = get_media_probe()
+                lines = ["#EXTM3U", f"#PLAYLIST:{name}"]
+                for track in tracks:
+                    info = probe.probe(track.file_path) or {}
+                    duration = info.get("duration")
+                    title = f"{track.event} - {track.name}" if track.event else track.name
+                    lines.append(f"#EXTINF:{round(duration) if duration else -1},{title}")
+                    lines.append(track.file_path)
+                with atomic_write(path) as f:
+                    f.write("\n".join(lines) + "\n")
+            else:
+                raise ValueError(f"formato desconhecido: {fmt}")
+            return len(tracks)
+        except Exception as e:
+            raise Exception(f"Erro ao exportar playlist: {str(e)}")
+
+    def update_track(self, name: str, sequence: int, **changes) -> bool:
+        """
+        Altera campos de uma faixa salva, sem regravar a playlist inteira
+
+        Args:
+            name (str): Nome da playlist
+            sequence (int): Sequência da faixa
+            **changes: Campos de Track a alterar
+
+        Returns:
+            bool: True se a faixa foi encontrada
+        """
+        return self.playlist_model.update_track(name, sequence, **changes)
+
+    def find_playlists_using(self, file_path: str) -> List[str]:
+        """
+        Obtém as playlists que usam o arquivo
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            List[str]: Nomes das playlists
+        """
+        return self.playlist_model.find_playlists_using(file_path)
+
+    def find_tracks_by_event(self, event: str) -> List[Tuple[str, Track]]:
+        """
+        Obtém as deixas com o evento informado
+
+        Args:
+            event (str): Evento da faixa
+
+        Returns:
+            List[Tuple[str, Track]]: Pares (playlist, faixa)
+        """
+        return self.playlist_model.find_tracks_by_event(event)
+
+    def search(self, query: str, limit: int = 50) -> list:
+        """
+        Busca playlists e deixas por nome, evento ou arquivo
+
+        Args:
+            query (str): Texto digitado
+            limit (int): Quantidade máxima de resultados
+
+        Returns:
+            List[SearchResult]: Resultados, os mais relevantes primeiro
+        """
+        return self.playlist_model.search(query, limit)
+
+    @property
+    def search_ready(self) -> bool:
+        """Indica se o índice de busca já foi montado"""
+        return self.playlist_model.search_ready
+
+    def build_search_index(self) -> int:
+        """
+        Monta o índice de busca; pode ser chamado em segundo plano
+
+        Returns:
+            int: Quantidade de playlists indexadas
+        """
+        return self.playlist_model.build_search_index()
+
+    def start_search_index(self) -> None:
+        """Monta o índice de busca em uma thread, sem travar a interface"""
+        model = self.playlist_model
+
+        def build():
+            try:
+                model.build_search_index()
+            except Exception as e:
+                print(f"Erro ao montar o índice de busca: {str(e)}")
+
+        threading.Thread(target=build, name="SearchIndex", daemon=True).start()
+
+    def library_directories(self) -> List[str]:
+        """Diretórios configurados da biblioteca de mídia"""
+        return list(self.config_manager.config.get("library_directories", []))
+
+    def add_library_directory(self, directory: str) -> None:
+        """
+        Acrescenta um diretório à biblioteca de mídia
+
+        Args:
+            directory (str): Diretório com arquivos de áudio
+        """
+        directories = self.library_directories()
+        if directory not in directories:
+            directories.append(directory)
+            self.config_manager.config["library_directories"] = directories
+            self.config_manager.save_config(self.config_manager.config)
+
+    def scan_library(self, directories: Optional[List[str]] = None,
+                     should_cancel: Optional[Callable[[], bool]] = None) -> Dict:
+        """
+        Varre a biblioteca, sondando só os arquivos novos ou alterados
+
+        Args:
+            directories (List[str], opcional): Diretórios a varrer (padrão: todos)
+            should_cancel (Callable, opcional): Interrompe a varredura quando
+                retornar True
+
+        Returns:
+            Dict: Resumo da varredura (added, changed, removed, unchanged,
+            invalid, directories)
+        """
+        from utils.library_scanner import get_library_scanner
+        if directories is None:
+            directories = self.library_directories()
+        return get_library_scanner().scan(directories, should_cancel)
+
+    def scan_library_async(self, directories: Optional[List[str]] = None):
+        """
+        Varre a biblioteca fora da thread da interface
+
+        Args:
+            directories (List[str], opcional): Diretórios a varrer (padrão: todos)
+
+        Returns:
+            ControllerTask: Tarefa cujo sinal finished entrega o resumo
+        """
+        from controllers.tasks import ControllerTask
+        return ControllerTask(self.scan_library, directories)
+
+    def library_entries(self) -> list:
+        """
+        Obtém os arquivos da biblioteca
+
+        Returns:
+            List[LibraryEntry]: Arquivos, ordenados pelo caminho
+        """
+        from utils.library_scanner import get_library_scanner
+        return get_library_scanner().entries()
 
     def get_playlist_names(self) -> List[str]:
         """
@@ -72,3 +745,142 @@ class MainController:
             List[str]: Lista de nomes
         """
         return self.playlist_model.get_playlist_names()
+
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Obtém os contadores do cache de playlists
+
+        Returns:
+            Dict[str, int]: Acertos, falhas e ocupação do cache
+        """
+        return self.playlist_model.cache_stats()
+
+    def autosave_playlist(self, name: str, tracks: List[Track]) -> None:
+        """
+        Agenda o salvamento automático da playlist
+
+        Edições seguidas são agrupadas em uma única gravação; os arquivos
+        não são validados, como no salvamento explícito.
+
+        Args:
+            name (str): Nome da playlist
+            tracks (List[Track]): Lista de faixas
+        """
+        self.playlist_model.save_playlist_deferred(name, tracks)
+
+    def flush_pending_saves(self) -> int:
+        """
+        Grava imediatamente os salvamentos automáticos pendentes
+
+        Returns:
+            int: Quantidade de playlists gravadas
+
+        Raises:
+            Exception: Se alguma playlist não pôde ser gravada
+        """
+        return self.playlist_model.flush()
+
+    def change_playlist_directory(self, directory: str) -> None:
+        """
+        Passa a usar outro diretório de playlists
+
+        As edições pendentes do modelo atual são gravadas antes da troca;
+        se a gravação falhar, o diretório continua o mesmo. O índice de
+        busca do novo modelo é montado em segundo plano.
+
+        Args:
+            directory (str): Novo diretório
+
+        Raises:
+            Exception: Se alguma playlist pendente não pôde ser gravada
+        """
+        previous = self.playlist_model
+        previous.flush()
+
+        config = self.config_manager.config
+        config["playlist_directory"] = directory
+        self.config_manager.save_config(config)
+        self.playlist_model = PlaylistModel(self.config_manager)
+        self.start_search_index()
+        try:
+            previous.close()
+        except Exception as e:
+            print(f"Erro ao gravar playlists pendentes: {str(e)}")
+
+    @property
+    def peak_generator(self):
+        """Gerador de picos da forma de onda, criado no primeiro uso"""
+        if self._peak_generator is None:
+            from utils.peaks import get_peak_generator
+            self._peak_generator = get_peak_generator()
+        return self._peak_generator
+
+    def peak_file(self, file_path: str):
+        """
+        Obtém os picos já gerados da faixa, sem decodificar o áudio
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Optional[PeakFile]: Picos abertos por mmap ou None
+        """
+        return self.peak_generator.get(file_path)
+
+    def request_peaks(self, file_path: str,
+                      callback: Optional[Callable[[str, bool], None]] = None):
+        """
+        Agenda a geração dos picos da faixa no pool de processos
+
+        Args:
+            file_path (str): Caminho do arquivo
+            callback (Callable, opcional): Chamado com o caminho e se os
+                picos foram gerados, ao fim da geração
+
+        Returns:
+            Optional[Future]: Geração agendada, ou None se não houver o que gerar
+        """
+        return self.peak_generator.request(file_path, callback)
+
+    def shutdown(self) -> None:
+        """Grava o que estiver pendente e encerra os trabalhadores em segundo plano"""
+        self.stop_remote_control()
+        try:
+            self.playlist_model.close()
+        except Exception as e:
+            print(f"Erro ao gravar playlists pendentes: {str(e)}")
+        if self._peak_generator is not None:
+            self._peak_generator.shutdown()
+        if self._engine is not None:
+            self._engine.stop()
+            self._engine = None
+
+    def set_metrics_enabled(self, enabled: bool) -> None:
+        """Liga ou desliga a coleta de métricas de desempenho"""
+        self.metrics.enabled = enabled
+
+    def metrics_snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Obtém os tempos medidos nos pontos críticos
+
+        Returns:
+            Dict: Por métrica, count, mean, p50, p95, p99 e max em milissegundos
+        """
+        return self.metrics.snapshot()
+
+    def reset_metrics(self) -> None:
+        """Descarta as métricas coletadas"""
+        self.metrics.reset()
+
+    def dump_metrics(self, path: str) -> None:
+        """
+        Grava as métricas coletadas em um arquivo JSON
+
+        Args:
+            path (str): Arquivo de destino
+        """
+        try:
+            self.metrics.dump(path)
+        except Exception as e:
+            raise Exception(f"Erro ao exportar métricas: {str(e)}")
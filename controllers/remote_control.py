@@ -0,0 +1,277 @@
+# controllers/remote_control.py
+"""
+Gerenciador de Playlist - Controle Remoto
+Versão 1.0.0
+
+Servidor TCP (asyncio, em thread própria) para disparar as deixas de
+outra máquina ou de um painel de botões. Cada linha é um comando, em
+texto simples ou JSON, e cada comando recebe uma linha JSON de resposta:
+
+    next                          {"cmd": "next"}
+    play 3                        {"cmd": "play", "sequence": 3}
+    stop [ms]                     {"cmd": "stop", "fade_ms": 500}
+    volume 0.8                    {"cmd": "volume", "level": 0.8}
+    load Show de Sábado           {"cmd": "load", "name": "Show de Sábado"}
+    status | playlists | ping     {"cmd": "status", "id": 7}
+
+Resposta: {"ok": true, "result": ...} ou {"ok": false, "error": "..."},
+com o "id" do pedido quando informado. Depois de "subscribe", o cliente
+recebe também os eventos de reprodução ({"event": "cue", ...}). Com
+remote_token configurado, o primeiro comando deve ser "auth <token>".
+"""
+# controllers/remote_control.py
+import asyncio
+import hmac
+import json
+import socket
+import threading
+from typing import Dict, Optional, Tuple
+from utils.metrics import get_metrics
+
+# Comandos respondidos no próprio laço; os demais aguardam o motor de áudio
+# ou o disco e rodam fora dele, para não atrasar os outros clientes
+_LOOP_COMMANDS = {"ping", "status"}
+
+# Cliente que não lê os eventos é desconectado ao acumular isto na saída
+_MAX_PENDING_BYTES = 256 * 1024
+
+
+class RemoteControlServer:
+    """Recebe comandos de deixa pela rede e os repassa ao MainController"""
+
+    def __init__(self, controller, host: str = "127.0.0.1", port: int = 7890, token: str = ""):
+        self.controller = controller
+        self.host = host
+        self.port = int(port)
+        self.token = token or ""
+        self.metrics = get_metrics()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._error: Optional[Exception] = None
+        self._clients: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._subscribers = set()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Endereço e porta em que o servidor escuta (porta real, se 0 foi pedido)"""
+        return self.host, self.port
+
+    def start(self) -> Tuple[str, int]:
+        """
+        Inicia o servidor e aguarda até que esteja aceitando conexões
+
+        Returns:
+            Tuple[str, int]: Endereço e porta em uso
+        """
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="RemoteControl", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread = None
+            raise Exception(f"Erro ao iniciar controle remoto: {str(self._error)}")
+
+        self.controller.add_listener(self.publish)
+        return self.address
+
+    def stop(self) -> None:
+        """Desconecta os clientes e encerra o servidor"""
+        self.controller.remove_listener(self.publish)
+        if self._thread is None:
+            return
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def publish(self, event: Dict) -> None:
+        """
+        Envia um evento aos clientes inscritos; pode ser chamado de qualquer thread
+
+        Args:
+            event (Dict): Evento, com a chave "event"
+        """
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            loop.call_soon_threadsafe(self._broadcast, line)
+        except RuntimeError:
+            # Laço já encerrado
+            pass
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self._error = e
+        finally:
+            self._loop = None
+            self._ready.set()
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+        async with server:
+            await self._stopping.wait()
+            self._subscribers.clear()
+            tasks = list(self._clients.values())
+            for writer in list(self._clients):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _broadcast(self, line: bytes) -> None:
+        """Grava o evento na saída de cada inscrito, sem aguardar a entrega"""
+        for writer in list(self._subscribers):
+            if writer.is_closing() or writer.transport.get_write_buffer_size() > _MAX_PENDING_BYTES:
+                self._subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(line)
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> None:
+        # Respostas e eventos são linhas curtas: envia sem esperar o Nagle
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        authenticated = not self.token
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    raw = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                if not raw:
+                    break
+                if not raw.strip():
+                    continue
+
+                request_id = None
+                try:
+                    request = parse_command(raw.decode("utf-8"))
+                    request_id = request.pop("id", None)
+                    command = request.pop("cmd")
+                    if command == "auth":
+                        authenticated = authenticated or hmac.compare_digest(str(request.get("token", "")), self.token)
+                        if not authenticated:
+                            raise Exception("Token inválido")
+                        result = True
+                    elif not authenticated:
+                        raise Exception("Autenticação necessária")
+                    elif command == "subscribe":
+                        self._subscribers.add(writer)
+                        result = self.controller.playback_state()
+                    elif command == "unsubscribe":
+                        self._subscribers.discard(writer)
+                        result = True
+                    elif command in _LOOP_COMMANDS:
+                        result = self.dispatch(command, request)
+                    else:
+                        result = await self._loop.run_in_executor(None, self.dispatch, command, request)
+                    response = {"ok": True, "result": result}
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                if request_id is not None:
+                    response["id"] = request_id
+
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            self._subscribers.discard(writer)
+            writer.close()
+
+    def dispatch(self, command: str, args: Dict):
+        """
+        Executa um comando no controlador
+
+        Args:
+            command (str): Nome do comando
+            args (Dict): Argumentos do comando
+
+        Returns:
+            Resultado serializável em JSON
+        """
+        handler = getattr(self, f"_cmd_{command}", None)
+        if handler is None:
+            raise Exception(f"Comando desconhecido: {command}")
+        with self.metrics.time(f"remote.{command}"):
+            return handler(args)
+
+    def _cmd_ping(self, args: Dict):
+        return "pong"
+
+    def _cmd_status(self, args: Dict):
+        return self.controller.playback_state()
+
+    def _cmd_next(self, args: Dict):
+        self.controller.go_next()
+        return self.controller.playback_state()
+
+    def _cmd_play(self, args: Dict):
+        if args.get("sequence") is None:
+            self.controller.go_next()
+        else:
+            self.controller.go_to_cue(int(args["sequence"]))
+        return self.controller.playback_state()
+
+    def _cmd_stop(self, args: Dict):
+        fade_ms = args.get("fade_ms")
+        self.controller.stop_cues(None if fade_ms is None else int(fade_ms))
+        return self.controller.playback_state()
+
+    def _cmd_volume(self, args: Dict):
+        return self.controller.set_cue_level(float(args["level"]))
+
+    def _cmd_load(self, args: Dict):
+        return self.controller.load_cues(args["name"])
+
+    def _cmd_playlists(self, args: Dict):
+        return sorted(self.controller.get_playlist_names())
+
+
+# Nome do argumento de cada comando na forma de texto simples
+_TEXT_ARGUMENTS = {"play": "sequence", "stop": "fade_ms", "volume": "level", "load": "name", "auth": "token"}
+
+
+def parse_command(line: str) -> Dict:
+    """
+    Converte uma linha do protocolo em um pedido
+
+    Args:
+        line (str): Linha JSON ({"cmd": ...}) ou texto ("play 3")
+
+    Returns:
+        Dict: Pedido com a chave "cmd" e os argumentos
+    """
+    line = line.strip()
+    if line.startswith("{"):
+        request = json.loads(line)
+        if not isinstance(request, dict) or not isinstance(request.get("cmd"), str):
+            raise Exception("Pedido JSON sem 'cmd'")
+        request["cmd"] = request["cmd"].lower()
+        return request
+
+    command, _, rest = line.partition(" ")
+    command = command.lower()
+    request = {"cmd": command}
+    rest = rest.strip()
+    if rest:
+        if command not in _TEXT_ARGUMENTS:
+            raise Exception(f"O comando {command} não recebe argumentos")
+        request[_TEXT_ARGUMENTS[command]] = rest
+    return request
@@ -0,0 +1,71 @@
+# controllers/tasks.py
+"""
+Gerenciador de Playlist - Tarefas em Segundo Plano
+Versão 1.0.0
+
+Executa operações do controlador no QThreadPool, fora da thread da
+interface, e informa o resultado por sinais Qt.
+"""
+# controllers/tasks.py
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from controllers.main_controller import OperationCancelled
+
+
+class TaskSignals(QObject):
+    """Sinais emitidos por uma tarefa ao terminar"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ControllerTask(QRunnable):
+    """Executa uma função do controlador em uma thread do QThreadPool"""
+
+    # Mantém as tarefas vivas até terminarem (o Python não guarda o QRunnable)
+    _running = set()
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.signals = TaskSignals()
+        self._cancel_event = threading.Event()
+
+        # Libera a referência só depois que os demais slots forem executados
+        for signal in (self.signals.finished, self.signals.failed, self.signals.cancelled):
+            signal.connect(self._release)
+
+    def cancel(self) -> None:
+        """Solicita o cancelamento da tarefa"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """Indica se o cancelamento foi solicitado"""
+        return self._cancel_event.is_set()
+
+    def start(self) -> "ControllerTask":
+        """Envia a tarefa para o QThreadPool global"""
+        ControllerTask._running.add(self)
+        QThreadPool.globalInstance().start(self)
+        return self
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args, should_cancel=self.is_cancelled)
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+        except OperationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e))
+
+    def _release(self, *args) -> None:
+        """Descarta a tarefa concluída na próxima volta do laço de eventos"""
+        QTimer.singleShot(0, lambda: ControllerTask._running.discard(self))
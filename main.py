@@ -15,6 +15,7 @@ Arquivo principal do sistema que inicializa a aplicação.
 
 ### Estrutura do Projeto
 - `main.py`: Arquivo principal
+- `cli.py`: Operações em lote pela linha de comando (sem interface gráfica)
 - `controllers/`: Controladores do sistema
 - `models/`: Modelos de dados
 - `views/`: Interface gráfica
@@ -28,19 +29,60 @@ Arquivo principal do sistema que inicializa a aplicação.
 
 """
 # main.py
+import multiprocessing
 import sys
+import threading
+from utils.startup_timer import StartupTimer
+
+STARTUP = StartupTimer(enabled="--startup-report" in sys.argv)
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from controllers.main_controller import MainController
 from views.main_window import MainWindow
 
+STARTUP.mark("imports")
+
 def main():
     """Função principal do aplicativo"""
     try:
-        app = QApplication(sys.argv)
+        argv = [arg for arg in sys.argv if arg != "--startup-report"]
+        app = QApplication(argv)
+        STARTUP.mark("qapplication")
 
         controller = MainController()
+        STARTUP.mark("controller")
+
         window = MainWindow(controller)
+        STARTUP.watch_first_paint(window)
         window.show()
+        STARTUP.mark("window_shown")
+
+        # pygame.mixer e ffmpeg só são carregados depois que a janela aparece
+        def initialize_audio():
+            controller.initialize_audio()
+            STARTUP.mark("audio_ready")
+
+        QTimer.singleShot(0, lambda: threading.Thread(
+            target=initialize_audio, name="AudioInit", daemon=True
+        ).start())
+
+        # O índice de busca também é montado em segundo plano
+        def build_search_index():
+            controller.build_search_index()
+            STARTUP.mark("search_ready")
+
+        QTimer.singleShot(0, lambda: threading.Thread(
+            target=build_search_index, name="SearchIndex", daemon=True
+        ).start())
+
+        # Controle remoto das deixas (outra máquina, painel de botões)
+        if controller.config_manager.config.get("remote_control", False):
+            try:
+                host, port = controller.start_remote_control()
+                print(f"Controle remoto em {host}:{port}")
+            except Exception as e:
+                print(str(e))
 
         sys.exit(app.exec())
 
@@ -49,4 +91,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Os picos da forma de onda são gerados em processos filhos (spawn)
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,164 @@
+# models/binary_format.py
+"""
+Gerenciador de Playlist - Formato Binário de Playlist
+Versão 1.0.0
+
+Formato compacto opcional para os arquivos de playlist:
+
+    cabeçalho   "PLB1", versão (u16), reservado (u16),
+                quantidade de faixas (u32), quantidade de strings (u32)
+    nome        tamanho (u32) + UTF-8
+    strings     para cada string: tamanho (u32) + UTF-8
+    faixas      registros de tamanho fixo: sequência (i64), volume (f64),
+                índices de evento, nome e caminho na tabela de strings (3 x u32),
+                início e fim do trecho tocado, em segundos (2 x f64),
+                entrada e saída do envelope, em segundos, e nível
+                sob outra voz (3 x f64)
+
+A versão 1 não tem os pontos de corte e a 2 não tem os envelopes; os
+arquivos dessas versões continuam legíveis.
+O nome da playlist pode ser lido sem decodificar as faixas, e as faixas
+podem ser percorridas uma a uma, sem carregar o arquivo inteiro.
+Todos os inteiros são little-endian.
+"""
+# models/binary_format.py
+import struct
+from typing import BinaryIO, Iterator, List, Tuple
+from models.playlist_table import PlaylistTable, Row
+
+MAGIC = b"PLB1"
+VERSION = 3
+
+_HEADER = struct.Struct("<4sHHII")
+_LENGTH = struct.Struct("<I")
+_RECORDS = {
+    1: struct.Struct("<qdIII"),
+    2: struct.Struct("<qdIIIdd"),
+    3: struct.Struct("<qdIIIddddd"),
+}
+_RECORD = _RECORDS[VERSION]
+
+# Colunas da tabela na ordem dos campos do registro
+_RECORD_COLUMNS = ("sequence", "volume", "event", "name", "file_path",
+                   "start_offset", "end_offset", "fade_in", "fade_out", "duck_level")
+
+# Valores dos campos que faltam nos registros das versões anteriores
+# (início, fim, entrada, saída, nível sob outra voz), após os 5 da versão 1
+_TRAILING_DEFAULTS = (0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+def _padding(record: struct.Struct) -> tuple:
+    """Campos a acrescentar a um registro de versão anterior (um caractere por campo no formato)"""
+    return _TRAILING_DEFAULTS[len(record.format) - 1 - 5:]
+
+
+def is_binary(path: str) -> bool:
+    """Indica se o arquivo está no formato binário, pelos bytes iniciais"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Arquivo de playlist truncado")
+    return data
+
+
+def _read_string(f: BinaryIO) -> str:
+    (length,) = _LENGTH.unpack(_read_exact(f, _LENGTH.size))
+    return _read_exact(f, length).decode('utf-8')
+
+
+def _write_string(f: BinaryIO, value: str) -> None:
+    data = value.encode('utf-8')
+    f.write(_LENGTH.pack(len(data)))
+    f.write(data)
+
+
+def _read_header(f: BinaryIO) -> Tuple[struct.Struct, int, int, str]:
+    """Lê o cabeçalho e o nome, retornando (registro, faixas, strings, nome)"""
+    magic, version, _, track_count, string_count = _HEADER.unpack(_read_exact(f, _HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Arquivo não está no formato binário de playlist")
+    if version not in _RECORDS:
+        raise ValueError(f"Versão do formato binário não suportada: {version}")
+    return _RECORDS[version], track_count, string_count, _read_string(f)
+
+
+def _unpack_records(record: struct.Struct, body: bytes) -> Iterator[tuple]:
+    """Registros no leiaute da versão atual, completando os das anteriores"""
+    if record is _RECORD:
+        return record.iter_unpack(body)
+    padding = _padding(record)
+    return (values + padding for values in record.iter_unpack(body))
+
+
+def write_table(f: BinaryIO, name: str, table: PlaylistTable) -> None:
+    """
+    Grava a playlist no formato binário
+
+    Args:
+        f (BinaryIO): Arquivo aberto para escrita binária
+        name (str): Nome da playlist
+        table (PlaylistTable): Faixas da playlist
+    """
+    f.write(_HEADER.pack(MAGIC, VERSION, 0, len(table), len(table.strings)))
+    _write_string(f, name)
+    for value in table.strings:
+        _write_string(f, value)
+    f.write(b"".join(
+        _RECORD.pack(*values)
+        for values in zip(table.sequence, table.volume, table.event, table.name,
+                          table.file_path, table.start_offset, table.end_offset,
+                          table.fade_in, table.fade_out, table.duck_level)
+    ))
+
+
+def read_name(path: str) -> str:
+    """Lê apenas o nome da playlist, sem decodificar as faixas"""
+    with open(path, 'rb') as f:
+        return _read_header(f)[3]
+
+
+def read_table(f: BinaryIO) -> PlaylistTable:
+    """
+    Lê a playlist inteira no formato binário
+
+    Args:
+        f (BinaryIO): Arquivo aberto para leitura binária
+
+    Returns:
+        PlaylistTable: Faixas da playlist
+    """
+    record, track_count, string_count, _ = _read_header(f)
+    strings = [_read_string(f) for _ in range(string_count)]
+    body = _read_exact(f, track_count * record.size)
+
+    columns = {c: [] for c in _RECORD_COLUMNS}
+    for values in _unpack_records(record, body):
+        for column, value in zip(_RECORD_COLUMNS, values):
+            columns[column].append(value)
+    columns["strings"] = strings
+    return PlaylistTable.from_columns(columns)
+
+
+def iter_rows(path: str) -> Iterator[Row]:
+    """
+    Percorre as faixas uma a uma, lendo um registro por vez
+
+    Args:
+        path (str): Arquivo no formato binário
+
+    Yields:
+        Tuple: Campos da faixa, na ordem de Track
+    """
+    with open(path, 'rb') as f:
+        record, track_count, string_count, _ = _read_header(f)
+        strings: List[str] = [_read_string(f) for _ in range(string_count)]
+        for _ in range(track_count):
+            values = record.unpack(_read_exact(f, record.size))
+            if record is not _RECORD:
+                values += _padding(record)
+            seq, vol, ev, nm, fp, *offsets_and_envelope = values
+            yield (seq, strings[ev], strings[nm], strings[fp], vol, *offsets_and_envelope)
@@ -1,58 +1,237 @@
 # models/playlist.py
 from dataclasses import dataclass
-from typing import List
-import json
-from utils.config_manager import ConfigManager
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import os
+import sys
+import threading
+from utils.config_manager import ConfigManager, get_config_manager
+from models.playlist_table import PlaylistTable
+from models.search_index import SearchIndex, SearchResult
+from models.sqlite_storage import SQLitePlaylistStorage
+from models.storage import ShardedPlaylistStorage
+from utils.write_behind import WriteBehindQueue
 
-@dataclass
+# slots=True só existe a partir do Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class Track:
     sequence: int
     event: str
     name: str
     file_path: str
     volume: float
+    # Trecho tocado, em segundos; end_offset 0.0 toca até o fim do arquivo
+    start_offset: float = 0.0
+    end_offset: float = 0.0
+    # Envelope de volume: rampas de entrada e saída, em segundos, e nível
+    # ao qual a faixa desce enquanto outra voz toca por cima (1.0 não abaixa)
+    fade_in: float = 0.0
+    fade_out: float = 0.0
+    duck_level: float = 1.0
+
+def track_to_record(track: Track) -> Dict:
+    """Converte uma faixa para o formato gravado em disco"""
+    return {
+        "sequence": track.sequence,
+        "event": track.event,
+        "name": track.name,
+        "file_path": track.file_path,
+        "volume": track.volume,
+        "start_offset": track.start_offset,
+        "end_offset": track.end_offset,
+        "fade_in": track.fade_in,
+        "fade_out": track.fade_out,
+        "duck_level": track.duck_level
+    }
+
+def track_from_record(record: Dict) -> Track:
+    """Converte um registro gravado em disco para uma faixa"""
+    return Track(
+        sequence=record["sequence"],
+        event=record["event"],
+        name=record["name"],
+        file_path=record["file_path"],
+        volume=record["volume"],
+        start_offset=record.get("start_offset", 0.0),
+        end_offset=record.get("end_offset", 0.0),
+        fade_in=record.get("fade_in", 0.0),
+        fade_out=record.get("fade_out", 0.0),
+        duck_level=record.get("duck_level", 1.0)
+    )
+
+def tracks_to_table(tracks: List[Track]) -> PlaylistTable:
+    """Converte as faixas para a tabela colunar"""
+    return PlaylistTable.from_tracks(tracks)
+
+def tracks_from_table(table: PlaylistTable) -> List[Track]:
+    """Converte a tabela colunar para objetos Track"""
+    return [Track(*row) for row in table.rows()]
 
 class PlaylistModel:
     """Modelo para gerenciamento de playlists"""
 
-    def __init__(self):
-        self.config_manager = ConfigManager()
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        self.config_manager = config_manager or get_config_manager()
         self.playlists_file = self.config_manager.get_playlist_path()
+        self.storage = self._create_storage()
+
+        # Cache LRU das playlists já lidas, validado pelo mtime/tamanho do arquivo
+        self.cache_size = int(self.config_manager.config.get("playlist_cache_size", 64))
+        self._playlist_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._names_cache = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._lock = threading.RLock()
+
+        # Índice de busca, montado na primeira consulta e atualizado a cada gravação
+        self.search_index = SearchIndex()
+        self._search_ready = False
+        # Durante a montagem, as playlists gravadas nesse meio-tempo
+        self._search_updates: Optional[Dict[str, PlaylistTable]] = None
+        self._search_build_lock = threading.Lock()
+
+        # Gravações adiadas (salvamento automático), coalescidas por playlist
+        self._pending: Dict[str, PlaylistTable] = {}
+        self.write_queue = WriteBehindQueue(
+            self.config_manager.config.get("autosave_delay_ms", 1000)
+        )
+
+        # Migra automaticamente o arquivo único do formato antigo
+        if not self.storage.exists() and os.path.exists(self.playlists_file):
+            self.import_playlists(self.playlists_file)
+
+    def _create_storage(self):
+        """Cria o backend de armazenamento escolhido na configuração"""
+        config = self.config_manager.config
+        sharded = ShardedPlaylistStorage(
+            self.config_manager.get_storage_directory(),
+            config.get("storage_format", "json")
+        )
+        if config.get("storage_backend", "files") != "sqlite":
+            return sharded
+
+        library = SQLitePlaylistStorage(self.config_manager.get_library_path())
+        # Na primeira utilização, copia as playlists já gravadas em arquivos
+        if not library.exists() and sharded.exists():
+            library.import_storage(sharded)
+        return library
+
+    def import_playlists(self, path: str) -> int:
+        """
+        Importa playlists de um arquivo JSON no formato antigo
+
+        Args:
+            path (str): Caminho do arquivo playlists.json
+
+        Returns:
+            int: Quantidade de playlists importadas
+        """
+        try:
+            with self._lock:
+                return self.storage.import_file(path)
+        except Exception as e:
+            raise Exception(f"Erro ao importar playlists: {str(e)}")
 
     def save_playlist(self, name: str, tracks: List[Track]) -> None:
         """
-        Salva uma playlist no arquivo JSON
+        Salva uma playlist no seu próprio arquivo JSON
 
         Args:
             name (str): Nome da playlist
             tracks (List[Track]): Lista de faixas
         """
         try:
-            try:
-                with open(self.playlists_file, 'r', encoding='utf-8') as f:
-                    playlists = json.load(f)
-            except FileNotFoundError:
-                playlists = {}
-
-            playlists[name] = [
-                {
-                    "sequence": t.sequence,
-                    "event": t.event,
-                    "name": t.name,
-                    "file_path": t.file_path,
-                    "volume": t.volume
-                } for t in tracks
-            ]
-
-            with open(self.playlists_file, 'w', encoding='utf-8') as f:
-                json.dump(playlists, f, indent=4)
-
+            table = tracks_to_table(tracks)
+            with self._lock:
+                # O salvamento explícito substitui o automático pendente
+                self._pending.pop(name, None)
+                self.write_queue.cancel(name)
+                self.storage.save(name, table)
+                self._cache_put(name, self.storage.stamp(name), table)
+                self._reindex(name, table)
         except Exception as e:
             raise Exception(f"Erro ao salvar playlist: {str(e)}")
 
+    def save_playlist_deferred(self, name: str, tracks: List[Track]) -> None:
+        """
+        Agenda a gravação da playlist na fila de gravação adiada
+
+        Salvamentos seguidos da mesma playlist dentro da janela viram uma
+        única gravação. Até lá, load_playlist já retorna as faixas novas.
+
+        Args:
+            name (str): Nome da playlist
+            tracks (List[Track]): Lista de faixas
+        """
+        table = tracks_to_table(tracks)
+        with self._lock:
+            self._pending[name] = table
+            self._reindex(name, table)
+        self.write_queue.submit(name, lambda: self._write_pending(name, table))
+
+    def _write_pending(self, name: str, table: PlaylistTable, retry: bool = True) -> None:
+        """Grava uma playlist da fila, se ainda for a versão mais recente"""
+        with self._lock:
+            if self._pending.get(name) is not table:
+                return
+            try:
+                self.storage.save(name, table)
+            except Exception as e:
+                # A versão continua pendente: tenta de novo na próxima janela
+                if retry:
+                    try:
+                        self.write_queue.submit(name, lambda: self._write_pending(name, table))
+                    except Exception:
+                        pass
+                raise Exception(f"Erro ao salvar playlist {name}: {str(e)}")
+            del self._pending[name]
+            self._cache_put(name, self.storage.stamp(name), table)
+
+    def flush(self) -> int:
+        """
+        Grava imediatamente as playlists com salvamento pendente
+
+        Também regrava as playlists cuja gravação adiada falhou.
+
+        Returns:
+            int: Quantidade de playlists gravadas
+
+        Raises:
+            Exception: Se alguma playlist não pôde ser gravada
+        """
+        with self._lock:
+            count = len(self._pending)
+        self.write_queue.flush()
+        with self._lock:
+            pending = list(self._pending.items())
+
+        errors = []
+        for name, table in pending:
+            try:
+                self._write_pending(name, table, retry=False)
+            except Exception as e:
+                errors.append(str(e))
+        if errors:
+            raise Exception("; ".join(errors))
+        return count
+
+    def close(self) -> None:
+        """
+        Grava as playlists pendentes e encerra a fila de gravação adiada
+
+        Raises:
+            Exception: Se alguma playlist não pôde ser gravada
+        """
+        try:
+            self.flush()
+        finally:
+            self.write_queue.close()
+
     def load_playlist(self, name: str) -> List[Track]:
         """
-        Carrega uma playlist do arquivo JSON
+        Carrega uma playlist do seu arquivo JSON
 
         Args:
             name (str): Nome da playlist
@@ -60,25 +239,201 @@ class PlaylistModel:
         Returns:
             List[Track]: Lista de faixas
         """
+        return tracks_from_table(self.load_table(name))
+
+    def load_table(self, name: str) -> PlaylistTable:
+        """
+        Carrega uma playlist na forma colunar, sem criar objetos Track
+
+        A tabela retornada é a mesma guardada em cache e não deve ser alterada.
+
+        Args:
+            name (str): Nome da playlist
+
+        Returns:
+            PlaylistTable: Faixas da playlist
+        """
         try:
-            with open(self.playlists_file, 'r', encoding='utf-8') as f:
-                playlists = json.load(f)
-
-            if name not in playlists:
-                raise Exception("Playlist não encontrada")
-
-            return [
-                Track(
-                    sequence=t["sequence"],
-                    event=t["event"],
-                    name=t["name"],
-                    file_path=t["file_path"],
-                    volume=t["volume"]
-                ) for t in playlists[name]
-            ]
+            with self._lock:
+                pending = self._pending.get(name)
+                if pending is not None:
+                    return pending
+
+                stamp = self.storage.stamp(name)
+                cached = self._playlist_cache.get(name)
+                if cached is not None and stamp is not None and cached[0] == stamp:
+                    self._playlist_cache.move_to_end(name)
+                    self._cache_hits += 1
+                    return cached[1]
+
+                self._cache_misses += 1
+                try:
+                    table = self.storage.load(name)
+                except KeyError:
+                    self._playlist_cache.pop(name, None)
+                    raise Exception("Playlist não encontrada")
+
+                self._cache_put(name, stamp, table)
+                return table
         except Exception as e:
             raise Exception(f"Erro ao carregar playlist: {str(e)}")
 
+    def iter_tracks(self, name: str) -> Iterator[Track]:
+        """
+        Percorre as faixas da playlist sem carregá-la inteira
+
+        Args:
+            name (str): Nome da playlist
+
+        Yields:
+            Track: Faixas na ordem gravada
+        """
+        with self._lock:
+            pending = self._pending.get(name)
+        if pending is not None:
+            yield from (Track(*row) for row in pending.rows())
+            return
+        try:
+            for row in self.storage.iter_rows(name):
+                yield Track(*row)
+        except KeyError:
+            raise Exception("Erro ao carregar playlist: Playlist não encontrada")
+
+    def update_track(self, name: str, sequence: int, **changes) -> bool:
+        """
+        Altera campos de uma faixa da playlist
+
+        No backend SQLite apenas a linha da faixa é atualizada.
+
+        Args:
+            name (str): Nome da playlist
+            sequence (int): Sequência da faixa
+            **changes: Campos de Track a alterar
+
+        Returns:
+            bool: True se a faixa foi encontrada
+        """
+        return bool(self.update_tracks(name, {sequence: changes}))
+
+    def update_tracks(self, name: str, updates: Dict[int, Dict[str, Any]],
+                      expected: Optional[Dict[int, Dict[str, Any]]] = None) -> List[int]:
+        """
+        Altera campos de várias faixas da playlist de uma só vez
+
+        A playlist é regravada uma única vez (no SQLite, uma transação),
+        sobre a versão atual, incluindo as edições ainda não gravadas.
+
+        Args:
+            name (str): Nome da playlist
+            updates (Dict): Campos a alterar, por sequência da faixa
+            expected (Dict, opcional): Valores que a faixa ainda deve ter,
+                por sequência; a faixa que mudou fica como está
+
+        Returns:
+            List[int]: Sequências das faixas alteradas
+        """
+        try:
+            with self._lock:
+                if name in self._pending:
+                    self._write_pending(name, self._pending[name])
+                updated = self.storage.update_tracks(name, updates, expected)
+                self._playlist_cache.pop(name, None)
+                if updated and self._search_ready:
+                    self._reindex(name, self.load_table(name))
+                return updated
+        except KeyError:
+            raise Exception("Erro ao atualizar faixa: Playlist não encontrada")
+        except Exception as e:
+            raise Exception(f"Erro ao atualizar faixa: {str(e)}")
+
+    def find_playlists_using(self, file_path: str) -> List[str]:
+        """
+        Retorna as playlists que usam o arquivo
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            List[str]: Nomes das playlists
+        """
+        with self._lock:
+            return self.storage.find_playlists_using(file_path)
+
+    def find_tracks_by_event(self, event: str) -> List[Tuple[str, Track]]:
+        """
+        Retorna as faixas com o evento informado
+
+        Args:
+            event (str): Evento da faixa
+
+        Returns:
+            List[Tuple[str, Track]]: Pares (playlist, faixa)
+        """
+        with self._lock:
+            return [(name, Track(*row)) for name, row in self.storage.find_tracks_by_event(event)]
+
+    def _reindex(self, name: str, table: PlaylistTable) -> None:
+        """Atualiza a playlist no índice de busca, se já estiver montado"""
+        if self._search_ready:
+            self.search_index.index_playlist(name, table.rows())
+        elif self._search_updates is not None:
+            # Índice em montagem: a versão nova é aplicada ao final
+            self._search_updates[name] = table
+
+    def build_search_index(self) -> int:
+        """
+        Monta o índice de busca com todas as playlists
+
+        As playlists são lidas e indexadas em um índice novo sem segurar o
+        lock do modelo, que só é tomado para trocar o índice no final.
+
+        Returns:
+            int: Quantidade de playlists indexadas
+        """
+        with self._search_build_lock:
+            if self._search_ready:
+                return len(self.get_playlist_names())
+            with self._lock:
+                self._search_updates = {}
+
+            index = SearchIndex()
+            names = self.get_playlist_names()
+            for name in names:
+                try:
+                    table = self.load_table(name)
+                except Exception as e:
+                    print(f"Erro ao indexar playlist {name}: {str(e)}")
+                    continue
+                index.index_playlist(name, table.rows())
+
+            with self._lock:
+                for name, table in self._search_updates.items():
+                    index.index_playlist(name, table.rows())
+                self._search_updates = None
+                self.search_index = index
+                self._search_ready = True
+            return len(names)
+
+    @property
+    def search_ready(self) -> bool:
+        """Indica se o índice de busca já foi montado"""
+        return self._search_ready
+
+    def search(self, query: str, limit: int = 50) -> List[SearchResult]:
+        """
+        Busca playlists e faixas por nome, evento ou arquivo
+
+        Args:
+            query (str): Texto digitado
+            limit (int): Quantidade máxima de resultados
+
+        Returns:
+            List[SearchResult]: Resultados, os mais relevantes primeiro
+        """
+        if not self._search_ready:
+            self.build_search_index()
+        return self.search_index.search(query, limit)
+
     def get_playlist_names(self) -> List[str]:
         """
         Retorna lista de nomes das playlists salvas
@@ -86,9 +441,44 @@ class PlaylistModel:
         Returns:
             List[str]: Lista de nomes
         """
-        try:
-            with open(self.playlists_file, 'r', encoding='utf-8') as f:
-                playlists = json.load(f)
-            return list(playlists.keys())
-        except FileNotFoundError:
-            return []
\ No newline at end of file
+        with self._lock:
+            stamp = self.storage.index_stamp()
+            if self._names_cache is not None and stamp is not None and self._names_cache[0] == stamp:
+                self._cache_hits += 1
+                names = self._names_cache[1]
+                return names + [n for n in self._pending if n not in names]
+
+            self._cache_misses += 1
+            names = self.storage.names()
+            self._names_cache = (stamp, names)
+            # Playlists novas ainda na fila de gravação
+            return names + [n for n in self._pending if n not in names]
+
+    def _cache_put(self, name: str, stamp, table: PlaylistTable) -> None:
+        """Guarda uma playlist no cache, descartando a menos usada"""
+        if stamp is None or self.cache_size <= 0:
+            return
+        self._playlist_cache[name] = (stamp, table)
+        self._playlist_cache.move_to_end(name)
+        while len(self._playlist_cache) > self.cache_size:
+            self._playlist_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Descarta todas as playlists e nomes em cache"""
+        with self._lock:
+            self._playlist_cache.clear()
+            self._names_cache = None
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do cache de playlists
+
+        Returns:
+            Dict[str, int]: Acertos, falhas e quantidade de playlists em cache
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._playlist_cache),
+            "capacity": self.cache_size
+        }
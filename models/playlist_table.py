@@ -0,0 +1,186 @@
+# models/playlist_table.py
+"""
+Gerenciador de Playlist - Tabela Colunar de Faixas
+Versão 1.0.0
+
+Representação compacta de uma playlist: sequências, volumes, pontos de
+corte e envelopes de volume ficam em arrays, e os textos (evento, nome,
+caminho) em uma tabela de strings internadas referenciada por índices. É
+o formato guardado em cache e gravado em disco, sem um dicionário por
+faixa.
+"""
+# models/playlist_table.py
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Campos de uma faixa, na ordem de Track
+TRACK_FIELDS = ("sequence", "event", "name", "file_path", "volume", "start_offset", "end_offset",
+                "fade_in", "fade_out", "duck_level")
+
+# Colunas de texto, guardadas como índices na tabela de strings
+STRING_COLUMNS = ("event", "name", "file_path")
+
+# Colunas numéricas em ponto flutuante
+FLOAT_COLUMNS = ("volume", "start_offset", "end_offset", "fade_in", "fade_out", "duck_level")
+
+# Valores das colunas acrescentadas depois da primeira versão, para arquivos que não as têm
+COLUMN_DEFAULTS = {"start_offset": 0.0, "end_offset": 0.0,
+                   "fade_in": 0.0, "fade_out": 0.0, "duck_level": 1.0}
+
+Row = Tuple[int, str, str, str, float, float, float, float, float, float]
+
+
+class PlaylistTable:
+    """Faixas de uma playlist guardadas em colunas"""
+
+    __slots__ = ("sequence", "volume", "start_offset", "end_offset", "fade_in", "fade_out",
+                 "duck_level", "event", "name", "file_path", "strings", "_string_ids")
+
+    def __init__(self):
+        self.sequence = array('q')
+        self.volume = array('d')
+        self.start_offset = array('d')
+        self.end_offset = array('d')
+        self.fade_in = array('d')
+        self.fade_out = array('d')
+        self.duck_level = array('d')
+        self.event = array('I')
+        self.name = array('I')
+        self.file_path = array('I')
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+    def _string_id(self, value: str) -> int:
+        """Índice da string na tabela, acrescentando-a se for nova"""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(sys.intern(value))
+            self._string_ids[value] = string_id
+        return string_id
+
+    def append(self, sequence: int, event: str, name: str, file_path: str,
+               volume: float, start_offset: float = 0.0, end_offset: float = 0.0,
+               fade_in: float = 0.0, fade_out: float = 0.0, duck_level: float = 1.0) -> None:
+        """Acrescenta uma faixa ao final da tabela"""
+        self.sequence.append(int(sequence))
+        self.volume.append(float(volume))
+        self.start_offset.append(float(start_offset))
+        self.end_offset.append(float(end_offset))
+        self.fade_in.append(float(fade_in))
+        self.fade_out.append(float(fade_out))
+        self.duck_level.append(float(duck_level))
+        self.event.append(self._string_id(event))
+        self.name.append(self._string_id(name))
+        self.file_path.append(self._string_id(file_path))
+
+    @classmethod
+    def from_tracks(cls, tracks: Iterable) -> "PlaylistTable":
+        """
+        Monta a tabela a partir de objetos Track
+
+        Args:
+            tracks (Iterable[Track]): Faixas da playlist
+
+        Returns:
+            PlaylistTable: Tabela com as faixas
+        """
+        table = cls()
+        for t in tracks:
+            table.append(t.sequence, t.event, t.name, t.file_path, t.volume,
+                         t.start_offset, t.end_offset, t.fade_in, t.fade_out, t.duck_level)
+        return table
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, list]) -> "PlaylistTable":
+        """
+        Monta a tabela a partir das colunas gravadas em disco
+
+        Arquivos anteriores aos pontos de corte ou aos envelopes não têm
+        essas colunas; as faixas ficam sem corte e sem rampas.
+
+        Args:
+            columns (Dict[str, list]): Colunas no formato de to_columns()
+
+        Returns:
+            PlaylistTable: Tabela com as faixas
+        """
+        table = cls()
+        table.sequence = array('q', columns["sequence"])
+        table.volume = array('d', columns["volume"])
+        count = len(table.sequence)
+        for column, default in COLUMN_DEFAULTS.items():
+            setattr(table, column, array('d', columns.get(column, [default] * count)))
+        table.strings = [sys.intern(s) for s in columns["strings"]]
+        table._string_ids = {s: i for i, s in enumerate(table.strings)}
+        for column in STRING_COLUMNS:
+            setattr(table, column, array('I', columns[column]))
+
+        if any(len(getattr(table, c)) != count for c in FLOAT_COLUMNS + STRING_COLUMNS):
+            raise ValueError("Colunas da playlist com tamanhos diferentes")
+        return table
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "PlaylistTable":
+        """Monta a tabela a partir de registros no formato antigo (um dict por faixa)"""
+        table = cls()
+        for r in records:
+            table.append(r["sequence"], r["event"], r["name"], r["file_path"], r["volume"],
+                         **{column: r.get(column, default)
+                            for column, default in COLUMN_DEFAULTS.items()})
+        return table
+
+    def to_columns(self) -> Dict[str, list]:
+        """
+        Converte a tabela para colunas serializáveis em JSON
+
+        Returns:
+            Dict[str, list]: Listas por coluna e a tabela de strings
+        """
+        return {
+            "sequence": self.sequence.tolist(),
+            "volume": self.volume.tolist(),
+            "start_offset": self.start_offset.tolist(),
+            "end_offset": self.end_offset.tolist(),
+            "fade_in": self.fade_in.tolist(),
+            "fade_out": self.fade_out.tolist(),
+            "duck_level": self.duck_level.tolist(),
+            "event": self.event.tolist(),
+            "name": self.name.tolist(),
+            "file_path": self.file_path.tolist(),
+            "strings": list(self.strings)
+        }
+
+    def __len__(self) -> int:
+        return len(self.sequence)
+
+    def row(self, index: int) -> Row:
+        """Campos da faixa na ordem de Track"""
+        strings = self.strings
+        return (
+            self.sequence[index],
+            strings[self.event[index]],
+            strings[self.name[index]],
+            strings[self.file_path[index]],
+            self.volume[index],
+            self.start_offset[index],
+            self.end_offset[index],
+            self.fade_in[index],
+            self.fade_out[index],
+            self.duck_level[index]
+        )
+
+    def rows(self) -> Iterator[Row]:
+        """Percorre as faixas como tuplas, na ordem de Track"""
+        strings = self.strings
+        for seq, ev, nm, fp, *numbers in zip(self.sequence, self.event, self.name,
+                                             self.file_path, self.volume,
+                                             self.start_offset, self.end_offset,
+                                             self.fade_in, self.fade_out, self.duck_level):
+            yield (seq, strings[ev], strings[nm], strings[fp], *numbers)
+
+    def file_paths(self) -> List[str]:
+        """Caminhos dos arquivos, na ordem das faixas"""
+        strings = self.strings
+        return [strings[i] for i in self.file_path]
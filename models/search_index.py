@@ -0,0 +1,304 @@
+# models/search_index.py
+"""
+Gerenciador de Playlist - Índice de Busca
+Versão 1.0.0
+
+Índice invertido em memória sobre nomes de playlist, eventos, nomes das
+faixas e nomes dos arquivos. Os textos são normalizados (minúsculas, sem
+acentos) e indexados por trigramas; consultas de uma ou duas letras usam
+os prefixos das palavras. Textos repetidos (o mesmo arquivo em várias
+playlists) são indexados uma única vez.
+"""
+# models/search_index.py
+import bisect
+import itertools
+import math
+import os
+import sys
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+KIND_PLAYLIST = "playlist"
+KIND_EVENT = "event"
+KIND_NAME = "name"
+KIND_FILE = "file"
+
+# Ordem dos campos no desempate dos resultados
+_KIND_RANK = {KIND_PLAYLIST: 0, KIND_EVENT: 1, KIND_NAME: 2, KIND_FILE: 3}
+
+# Fração mínima de trigramas em comum para um resultado aproximado
+_FUZZY_THRESHOLD = 0.5
+
+# Máximo de textos avaliados na busca aproximada, para limitar o tempo por tecla
+_FUZZY_MAX_CANDIDATES = 4096
+
+# Acima disso, os textos novos entram na ordem alfabética por intercalação
+_INSORT_LIMIT = 32
+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class SearchResult:
+    """Um resultado da busca"""
+    kind: str
+    playlist: str
+    sequence: Optional[int]
+    text: str
+    score: float
+
+
+def normalize(text: str) -> str:
+    """Minúsculas e sem acentos, para comparação"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _trigrams(text: str, padded: bool = True) -> Set[str]:
+    """Trigramas do texto; com padded, inclui os de início e fim"""
+    if padded:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _word_prefixes(text: str) -> Set[str]:
+    prefixes = set()
+    for word in text.split():
+        prefixes.add(word[:1])
+        prefixes.add(word[:2])
+    return prefixes
+
+
+class SearchIndex:
+    """Índice invertido por trigramas, atualizado playlist a playlist"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Textos distintos: id -> texto normalizado (None se descartado), e o
+        # caminho inverso; os ids dos textos descartados são reaproveitados
+        self._texts: List[Optional[str]] = []
+        self._text_ids: Dict[str, int] = {}
+        self._free_ids: List[int] = []
+        self._trigram_postings: Dict[str, Set[int]] = {}
+        self._prefix_postings: Dict[str, Set[int]] = {}
+        # Documentos: id -> (tipo, playlist, sequência, texto original, id do texto)
+        self._docs: Dict[int, Tuple[str, str, Optional[int], str, int]] = {}
+        self._docs_by_text: Dict[int, Set[int]] = {}
+        self._docs_by_playlist: Dict[str, List[int]] = {}
+        self._next_doc = 0
+        # (texto, id) em ordem alfabética, para buscar pelo início do texto
+        self._sorted: Optional[List[Tuple[str, int]]] = None
+        # Textos novos ainda fora de _sorted
+        self._unsorted: List[Tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _text_id(self, text: str) -> int:
+        """Id do texto normalizado, indexando-o se for novo"""
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            if self._free_ids:
+                text_id = self._free_ids.pop()
+                self._texts[text_id] = text
+            else:
+                text_id = len(self._texts)
+                self._texts.append(text)
+            self._text_ids[text] = text_id
+            if self._sorted is not None:
+                self._unsorted.append((text, text_id))
+            for gram in _trigrams(text):
+                self._trigram_postings.setdefault(gram, set()).add(text_id)
+            for prefix in _word_prefixes(text):
+                self._prefix_postings.setdefault(prefix, set()).add(text_id)
+        return text_id
+
+    def _add_doc(self, kind: str, playlist: str, sequence: Optional[int], text: str) -> None:
+        normalized = normalize(text).strip()
+        if not normalized:
+            return
+        doc_id = self._next_doc
+        self._next_doc += 1
+        text_id = self._text_id(normalized)
+        self._docs[doc_id] = (kind, playlist, sequence, text, text_id)
+        self._docs_by_text.setdefault(text_id, set()).add(doc_id)
+        self._docs_by_playlist[playlist].append(doc_id)
+
+    def _remove_playlist(self, playlist: str) -> Set[int]:
+        """Remove os documentos da playlist; retorna os ids dos seus textos"""
+        text_ids = set()
+        for doc_id in self._docs_by_playlist.pop(playlist, ()):
+            text_id = self._docs.pop(doc_id)[4]
+            self._docs_by_text[text_id].discard(doc_id)
+            text_ids.add(text_id)
+        return text_ids
+
+    def _drop_unused(self, text_ids: Iterable[int]) -> None:
+        """Descarta os textos que não pertencem mais a nenhum documento"""
+        dropped: Dict[int, str] = {}
+        for text_id in text_ids:
+            if self._docs_by_text.get(text_id):
+                continue
+            text = self._texts[text_id]
+            for gram in _trigrams(text):
+                self._discard_posting(self._trigram_postings, gram, text_id)
+            for prefix in _word_prefixes(text):
+                self._discard_posting(self._prefix_postings, prefix, text_id)
+            del self._text_ids[text]
+            self._docs_by_text.pop(text_id, None)
+            self._texts[text_id] = None
+            self._free_ids.append(text_id)
+            dropped[text_id] = text
+
+        if self._sorted is None or not dropped:
+            return
+        if len(dropped) <= _INSORT_LIMIT:
+            for text_id, text in dropped.items():
+                del self._sorted[bisect.bisect_left(self._sorted, (text, text_id))]
+        else:
+            self._sorted = [entry for entry in self._sorted if entry[1] not in dropped]
+
+    @staticmethod
+    def _discard_posting(postings: Dict[str, Set[int]], key: str, text_id: int) -> None:
+        posting = postings[key]
+        posting.discard(text_id)
+        if not posting:
+            del postings[key]
+
+    def index_playlist(self, playlist: str,
+                       rows: Iterable[tuple]) -> None:
+        """
+        Indexa (ou reindexa) uma playlist e suas faixas
+
+        Args:
+            playlist (str): Nome da playlist
+            rows (Iterable[Tuple]): Faixas (sequência, evento, nome, caminho, ...)
+        """
+        with self._lock:
+            # Os textos que a playlist deixar de usar saem só no final, para
+            # não reindexar os que continuam nela
+            previous = self._remove_playlist(playlist)
+            self._docs_by_playlist[playlist] = []
+            self._add_doc(KIND_PLAYLIST, playlist, None, playlist)
+            for sequence, event, name, file_path, *_ in rows:
+                self._add_doc(KIND_EVENT, playlist, sequence, event)
+                self._add_doc(KIND_NAME, playlist, sequence, name)
+                self._add_doc(KIND_FILE, playlist, sequence, os.path.basename(file_path))
+            self._drop_unused(previous)
+            self._merge_sorted()
+
+    def _merge_sorted(self) -> None:
+        """Leva os textos novos para a lista em ordem alfabética"""
+        new, self._unsorted = self._unsorted, []
+        if self._sorted is None or not new:
+            return
+        if len(new) <= _INSORT_LIMIT:
+            for entry in new:
+                bisect.insort(self._sorted, entry)
+        else:
+            # O Timsort reconhece as duas sequências ordenadas e só as intercala
+            new.sort()
+            self._sorted.extend(new)
+            self._sorted.sort()
+
+    def remove_playlist(self, playlist: str) -> None:
+        """Remove a playlist do índice"""
+        with self._lock:
+            self._drop_unused(self._remove_playlist(playlist))
+
+    def _starting_with(self, query: str) -> Iterator[int]:
+        """Ids dos textos que começam com a consulta, em ordem alfabética"""
+        if self._sorted is None:
+            self._sorted = sorted((text, text_id) for text_id, text in enumerate(self._texts)
+                                  if text is not None)
+        entries = self._sorted
+        # islice teria de percorrer a lista até a posição: acessa por índice
+        for position in range(bisect.bisect_left(entries, (query, -1)), len(entries)):
+            text, text_id = entries[position]
+            if not text.startswith(query):
+                return
+            yield text_id
+
+    def _containing(self, query: str) -> Iterator[int]:
+        """Ids dos textos que contêm a consulta"""
+        if len(query) < 3:
+            # Uma ou duas letras: início de palavra
+            candidates = self._prefix_postings.get(query, ())
+        else:
+            # Sem espaços de borda: a consulta pode estar no meio do texto
+            grams = _trigrams(query, padded=False)
+            postings = sorted((self._trigram_postings.get(g, set()) for g in grams), key=len)
+            candidates = set.intersection(*postings) if postings[0] else ()
+        texts = self._texts
+        return (i for i in candidates if query in texts[i])
+
+    def _similar(self, query: str) -> List[Tuple[float, int]]:
+        """Textos com trigramas em comum, para erros de digitação"""
+        if len(query) < 4:
+            return []
+        grams = _trigrams(query)
+        postings = sorted((self._trigram_postings.get(g, set()) for g in grams), key=len)
+        needed = max(1, math.ceil(len(grams) * _FUZZY_THRESHOLD))
+        # Quem tem trigramas suficientes aparece em um dos menores conjuntos;
+        # a quantidade avaliada é limitada, começando pelos trigramas mais raros
+        candidates = set(itertools.islice(
+            itertools.chain.from_iterable(postings[:len(grams) - needed + 1]),
+            _FUZZY_MAX_CANDIDATES
+        ))
+        counts: Counter = Counter()
+        for posting in postings:
+            counts.update(candidates & posting)
+        scored = [(count / len(grams), text_id)
+                  for text_id, count in counts.items() if count >= needed]
+        scored.sort(key=lambda s: (-s[0], len(self._texts[s[1]])))
+        return scored
+
+    def search(self, query: str, limit: int = 50) -> List[SearchResult]:
+        """
+        Busca o texto em playlists, eventos, nomes e arquivos
+
+        Os textos que começam com a consulta vêm primeiro, depois os que a
+        contêm; sem nenhum dos dois, retorna os textos mais parecidos. A busca
+        para assim que atinge o limite, sem percorrer todos os candidatos.
+
+        Args:
+            query (str): Texto digitado
+            limit (int): Quantidade máxima de resultados
+
+        Returns:
+            List[SearchResult]: Resultados, os mais relevantes primeiro
+        """
+        query = normalize(query).strip()
+        if not query or limit <= 0:
+            return []
+
+        results: List[SearchResult] = []
+
+        def emit(text_id: int, score: float) -> bool:
+            for doc_id in self._docs_by_text.get(text_id, ()):
+                kind, playlist, sequence, text, _ = self._docs[doc_id]
+                results.append(SearchResult(kind, playlist, sequence, text, score))
+            return len(results) >= limit
+
+        with self._lock:
+            seen = set()
+            for text_id in self._starting_with(query):
+                seen.add(text_id)
+                if emit(text_id, 2.0):
+                    break
+            else:
+                for text_id in self._containing(query):
+                    if text_id not in seen and emit(text_id, 1.0):
+                        break
+                else:
+                    if not results:
+                        for score, text_id in self._similar(query):
+                            if emit(text_id, score):
+                                break
+
+        results = results[:limit]
+        results.sort(key=lambda r: (-r.score, _KIND_RANK[r.kind]))
+        return results
@@ -0,0 +1,318 @@
+# models/sqlite_storage.py
+"""
+Gerenciador de Playlist - Biblioteca SQLite
+Versão 1.0.0
+
+Backend de armazenamento em um banco SQLite (modo WAL), com tabelas de
+playlists, faixas e metadados de mídia. As faixas são indexadas por
+caminho do arquivo e por evento, e cada alteração é uma transação que
+toca apenas as linhas envolvidas, sem regravar arquivos inteiros.
+"""
+# models/sqlite_storage.py
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models.playlist_table import TRACK_FIELDS, PlaylistTable, Row
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tracks (
+    playlist_id INTEGER NOT NULL REFERENCES playlists(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    sequence INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    volume REAL NOT NULL,
+    start_offset REAL NOT NULL DEFAULT 0,
+    end_offset REAL NOT NULL DEFAULT 0,
+    fade_in REAL NOT NULL DEFAULT 0,
+    fade_out REAL NOT NULL DEFAULT 0,
+    duck_level REAL NOT NULL DEFAULT 1,
+    PRIMARY KEY (playlist_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_tracks_file_path ON tracks(file_path);
+CREATE INDEX IF NOT EXISTS idx_tracks_event ON tracks(event);
+CREATE INDEX IF NOT EXISTS idx_tracks_sequence ON tracks(playlist_id, sequence);
+CREATE TABLE IF NOT EXISTS media (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    info TEXT
+);
+"""
+
+# Colunas acrescentadas depois da primeira versão do banco
+_ADDED_COLUMNS = {
+    "start_offset": "REAL NOT NULL DEFAULT 0",
+    "end_offset": "REAL NOT NULL DEFAULT 0",
+    "fade_in": "REAL NOT NULL DEFAULT 0",
+    "fade_out": "REAL NOT NULL DEFAULT 0",
+    "duck_level": "REAL NOT NULL DEFAULT 1",
+}
+
+_TRACK_COLUMNS = ", ".join(TRACK_FIELDS)
+
+
+class SQLitePlaylistStorage:
+    """Armazena playlists, faixas e metadados de mídia em um banco SQLite"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        self._upgrade(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão própria da thread atual"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _upgrade(conn: sqlite3.Connection) -> None:
+        """Acrescenta às tabelas de bancos antigos as colunas que faltam"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(tracks)")}
+        for column, definition in _ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE tracks ADD COLUMN {column} {definition}")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Executa o bloco em uma transação, desfeita em caso de erro"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _playlist_id(self, conn: sqlite3.Connection, name: str) -> Optional[int]:
+        row = conn.execute("SELECT id FROM playlists WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def stamp(self, name: str) -> Optional[Tuple[int, int]]:
+        """Carimbo (id, revisão) da playlist, alterado a cada gravação"""
+        return self._connection().execute(
+            "SELECT id, revision FROM playlists WHERE name = ?", (name,)
+        ).fetchone()
+
+    def index_stamp(self) -> Optional[Tuple[int, int]]:
+        """Carimbo da lista de nomes: quantidade e maior id das playlists"""
+        return self._connection().execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM playlists"
+        ).fetchone()
+
+    def exists(self) -> bool:
+        """Indica se o banco já contém alguma playlist"""
+        return self.index_stamp()[0] > 0
+
+    def save(self, name: str, table: PlaylistTable) -> None:
+        """
+        Substitui as faixas da playlist em uma única transação
+
+        Args:
+            name (str): Nome da playlist
+            table (PlaylistTable): Faixas da playlist
+        """
+        with self._transaction() as conn:
+            self._save(conn, name, table)
+
+    def _save(self, conn: sqlite3.Connection, name: str, table: PlaylistTable) -> None:
+        conn.execute(
+            "INSERT INTO playlists (name) VALUES (?) "
+            "ON CONFLICT(name) DO UPDATE SET revision = revision + 1",
+            (name,)
+        )
+        playlist_id = self._playlist_id(conn, name)
+        conn.execute("DELETE FROM tracks WHERE playlist_id = ?", (playlist_id,))
+        conn.executemany(
+            f"INSERT INTO tracks (playlist_id, position, {_TRACK_COLUMNS}) "
+            f"VALUES ({', '.join('?' * (len(TRACK_FIELDS) + 2))})",
+            ((playlist_id, position) + row for position, row in enumerate(table.rows()))
+        )
+
+    def load(self, name: str) -> PlaylistTable:
+        """
+        Lê as faixas da playlist
+
+        Args:
+            name (str): Nome da playlist
+
+        Returns:
+            PlaylistTable: Faixas da playlist
+        """
+        table = PlaylistTable()
+        for row in self.iter_rows(name):
+            table.append(*row)
+        return table
+
+    def iter_rows(self, name: str) -> Iterator[Row]:
+        """
+        Percorre as faixas da playlist pelo cursor, uma a uma
+
+        Yields:
+            Tuple: Campos da faixa, na ordem de Track
+        """
+        conn = self._connection()
+        playlist_id = self._playlist_id(conn, name)
+        if playlist_id is None:
+            raise KeyError(name)
+        yield from conn.execute(
+            f"SELECT {_TRACK_COLUMNS} FROM tracks "
+            "WHERE playlist_id = ? ORDER BY position",
+            (playlist_id,)
+        )
+
+    def names(self) -> List[str]:
+        """Retorna os nomes das playlists, na ordem de criação"""
+        return [r[0] for r in self._connection().execute("SELECT name FROM playlists ORDER BY id")]
+
+    def update_track(self, name: str, sequence: int, **changes) -> bool:
+        """
+        Altera campos de uma única faixa, sem regravar a playlist
+
+        Args:
+            name (str): Nome da playlist
+            sequence (int): Sequência da faixa
+            **changes: Campos de Track a alterar
+
+        Returns:
+            bool: True se a faixa foi encontrada
+        """
+        return bool(self.update_tracks(name, {sequence: changes}))
+
+    def update_tracks(self, name: str, updates: Dict[int, Dict[str, Any]],
+                      expected: Optional[Dict[int, Dict[str, Any]]] = None) -> List[int]:
+        """
+        Altera campos de várias faixas em uma única transação
+
+        Args:
+            name (str): Nome da playlist
+            updates (Dict): Campos a alterar, por sequência da faixa
+            expected (Dict, opcional): Valores que a faixa ainda deve ter,
+                por sequência; a faixa que mudou fica como está
+
+        Returns:
+            List[int]: Sequências das faixas alteradas
+        """
+        expected = expected or {}
+        for values in list(updates.values()) + list(expected.values()):
+            invalid = set(values) - set(TRACK_FIELDS)
+            if invalid:
+                raise ValueError(f"Campos inválidos: {', '.join(sorted(invalid))}")
+
+        updated = []
+        with self._transaction() as conn:
+            playlist_id = self._playlist_id(conn, name)
+            if playlist_id is None:
+                raise KeyError(name)
+            for sequence, changes in updates.items():
+                if not changes:
+                    continue
+                conditions = expected.get(sequence, {})
+                columns = ", ".join(f"{field} = ?" for field in changes)
+                where = "".join(f" AND {field} = ?" for field in conditions)
+                if conn.execute(
+                    f"UPDATE tracks SET {columns} WHERE playlist_id = ? AND sequence = ?{where}",
+                    tuple(changes.values()) + (playlist_id, sequence) + tuple(conditions.values())
+                ).rowcount:
+                    updated.append(sequence)
+            if updated:
+                conn.execute("UPDATE playlists SET revision = revision + 1 WHERE id = ?",
+                             (playlist_id,))
+        return updated
+
+    def find_playlists_using(self, file_path: str) -> List[str]:
+        """Nomes das playlists que usam o arquivo"""
+        return [r[0] for r in self._connection().execute(
+            "SELECT DISTINCT p.name FROM tracks t JOIN playlists p ON p.id = t.playlist_id "
+            "WHERE t.file_path = ? ORDER BY p.id",
+            (file_path,)
+        )]
+
+    def find_tracks_by_event(self, event: str) -> List[Tuple[str, Row]]:
+        """Faixas com o evento informado, como (playlist, faixa)"""
+        return [(r[0], tuple(r[1:])) for r in self._connection().execute(
+            "SELECT p.name, " + ", ".join(f"t.{c}" for c in TRACK_FIELDS) + " "
+            "FROM tracks t JOIN playlists p ON p.id = t.playlist_id "
+            "WHERE t.event = ? ORDER BY p.id, t.position",
+            (event,)
+        )]
+
+    def import_file(self, path: str) -> int:
+        """
+        Importa playlists do formato antigo (um único playlists.json)
+
+        Args:
+            path (str): Caminho do arquivo no formato antigo
+
+        Returns:
+            int: Quantidade de playlists importadas
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            playlists = json.load(f)
+
+        with self._transaction() as conn:
+            for name, records in playlists.items():
+                self._save(conn, name, PlaylistTable.from_records(records))
+        return len(playlists)
+
+    def import_storage(self, source) -> int:
+        """
+        Copia todas as playlists de outro backend em uma única transação
+
+        Args:
+            source: Backend de origem (ex.: ShardedPlaylistStorage)
+
+        Returns:
+            int: Quantidade de playlists importadas
+        """
+        names = source.names()
+        with self._transaction() as conn:
+            for name in names:
+                self._save(conn, name, source.load(name))
+        return len(names)
+
+    def get_media(self, path: str) -> Optional[Dict]:
+        """
+        Metadados de mídia guardados para o arquivo
+
+        Returns:
+            Optional[Dict]: size, mtime_ns e info, ou None se não houver registro
+        """
+        row = self._connection().execute(
+            "SELECT size, mtime_ns, info FROM media WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"size": row[0], "mtime_ns": row[1], "info": json.loads(row[2])}
+
+    def put_media(self, path: str, size: int, mtime_ns: int, info: Optional[Dict]) -> None:
+        """Grava os metadados de mídia do arquivo"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO media (path, size, mtime_ns, info) VALUES (?, ?, ?, ?)",
+                (path, size, mtime_ns, json.dumps(info))
+            )
+
+    def close(self) -> None:
+        """Fecha a conexão da thread atual"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
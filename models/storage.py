@@ -0,0 +1,337 @@
+# models/storage.py
+"""
+Gerenciador de Playlist - Armazenamento de Playlists
+Versão 1.0.0
+
+Backend de armazenamento em que cada playlist fica em um arquivo próprio,
+acompanhado de um pequeno índice de nomes. Os arquivos podem ser gravados
+em JSON ou no formato binário compacto; a leitura detecta o formato pelos
+bytes iniciais.
+
+Migração: python -m models.storage --to binary|json
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models import binary_format
+from models.playlist_table import TRACK_FIELDS, PlaylistTable
+from utils.atomic_io import atomic_write, atomic_write_json
+from utils.metrics import get_metrics
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+
+_EXTENSIONS = {FORMAT_JSON: ".json", FORMAT_BINARY: ".plb"}
+
+
+class ShardedPlaylistStorage:
+    """Armazena cada playlist em um arquivo separado com um índice de nomes"""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory: str, storage_format: str = FORMAT_JSON):
+        if storage_format not in _EXTENSIONS:
+            raise ValueError(f"Formato de armazenamento inválido: {storage_format}")
+        self.directory = directory
+        self.storage_format = storage_format
+        self.index_file = os.path.join(directory, self.INDEX_FILE)
+        os.makedirs(directory, exist_ok=True)
+
+    def _read_index(self) -> Dict[str, str]:
+        """Lê o índice nome -> arquivo da playlist"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_index(self, index: Dict[str, str]) -> None:
+        """Grava o índice nome -> arquivo da playlist"""
+        atomic_write_json(self.index_file, index, indent=4, ensure_ascii=False)
+
+    @staticmethod
+    def _shard_name(name: str, storage_format: str = FORMAT_JSON) -> str:
+        """Gera um nome de arquivo estável e seguro para a playlist"""
+        slug = re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_')[:40] or "playlist"
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]
+        return f"{slug}-{digest}{_EXTENSIONS[storage_format]}"
+
+    def shard_path(self, name: str) -> str:
+        """Retorna o caminho do arquivo de uma playlist no formato configurado"""
+        return os.path.join(self.directory, self._shard_name(name, self.storage_format))
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        """Retorna (mtime, tamanho) do arquivo ou None se não existir"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def stamp(self, name: str) -> Optional[Tuple[int, int]]:
+        """Carimbo de modificação do arquivo de uma playlist"""
+        stamp = self._stamp(self.shard_path(name))
+        if stamp is None:
+            # Playlist ainda gravada no outro formato
+            for storage_format in _EXTENSIONS:
+                if storage_format != self.storage_format:
+                    stamp = self._stamp(os.path.join(
+                        self.directory, self._shard_name(name, storage_format)))
+                    if stamp is not None:
+                        break
+        return stamp
+
+    def index_stamp(self) -> Optional[Tuple[int, int]]:
+        """Carimbo de modificação do índice de nomes"""
+        return self._stamp(self.index_file)
+
+    def exists(self) -> bool:
+        """Indica se o índice já foi criado"""
+        return os.path.exists(self.index_file)
+
+    def save(self, name: str, table: PlaylistTable) -> None:
+        """
+        Grava apenas o arquivo da playlist informada, em colunas
+
+        Args:
+            name (str): Nome da playlist
+            table (PlaylistTable): Faixas da playlist
+        """
+        shard = self._shard_name(name, self.storage_format)
+        self._write_shard(os.path.join(self.directory, shard), name, table)
+
+        # O índice só é regravado quando surge um nome novo ou muda o formato
+        index = self._read_index()
+        previous = index.get(name)
+        if previous != shard:
+            index[name] = shard
+            self._write_index(index)
+            if previous is not None:
+                try:
+                    os.remove(os.path.join(self.directory, previous))
+                except FileNotFoundError:
+                    pass
+
+    def _write_shard(self, path: str, name: str, table: PlaylistTable) -> None:
+        """Grava o arquivo da playlist no formato configurado"""
+        if self.storage_format == FORMAT_BINARY:
+            with atomic_write(path, 'wb') as f:
+                binary_format.write_table(f, name, table)
+        else:
+            atomic_write_json(path, {"name": name, "columns": table.to_columns()},
+                              ensure_ascii=False)
+
+    def _shard_file(self, name: str) -> str:
+        """Caminho do arquivo da playlist registrado no índice"""
+        shard = self._read_index().get(name)
+        if shard is None:
+            raise KeyError(name)
+        return os.path.join(self.directory, shard)
+
+    def load(self, name: str) -> PlaylistTable:
+        """
+        Lê apenas o arquivo da playlist informada
+
+        Args:
+            name (str): Nome da playlist
+
+        Returns:
+            PlaylistTable: Faixas da playlist
+        """
+        path = self._shard_file(name)
+        if binary_format.is_binary(path):
+            with get_metrics().time("io.binary_read"), open(path, 'rb') as f:
+                return binary_format.read_table(f)
+
+        with get_metrics().time("io.json_read"), open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        # Arquivos gravados antes do formato colunar têm um registro por faixa
+        if "columns" in data:
+            return PlaylistTable.from_columns(data["columns"])
+        return PlaylistTable.from_records(data["tracks"])
+
+    def iter_rows(self, name: str) -> Iterator[binary_format.Row]:
+        """
+        Percorre as faixas da playlist uma a uma
+
+        No formato binário lê um registro por vez; arquivos JSON precisam
+        ser decodificados inteiros antes da primeira faixa.
+
+        Args:
+            name (str): Nome da playlist
+
+        Yields:
+            Tuple: Campos da faixa, na ordem de Track
+        """
+        path = self._shard_file(name)
+        if binary_format.is_binary(path):
+            yield from binary_format.iter_rows(path)
+        else:
+            yield from self.load(name).rows()
+
+    def names(self) -> List[str]:
+        """Retorna os nomes das playlists a partir do índice"""
+        return list(self._read_index().keys())
+
+    def update_track(self, name: str, sequence: int, **changes) -> bool:
+        """
+        Altera campos de uma faixa, regravando o arquivo da playlist
+
+        Args:
+            name (str): Nome da playlist
+            sequence (int): Sequência da faixa
+            **changes: Campos de Track a alterar
+
+        Returns:
+            bool: True se a faixa foi encontrada
+        """
+        return bool(self.update_tracks(name, {sequence: changes}))
+
+    def update_tracks(self, name: str, updates: Dict[int, Dict[str, Any]],
+                      expected: Optional[Dict[int, Dict[str, Any]]] = None) -> List[int]:
+        """
+        Altera campos de várias faixas, regravando o arquivo uma única vez
+
+        Args:
+            name (str): Nome da playlist
+            updates (Dict): Campos a alterar, por sequência da faixa
+            expected (Dict, opcional): Valores que a faixa ainda deve ter,
+                por sequência; a faixa que mudou fica como está
+
+        Returns:
+            List[int]: Sequências das faixas alteradas
+        """
+        fields = TRACK_FIELDS
+        expected = expected or {}
+        for values in list(updates.values()) + list(expected.values()):
+            invalid = set(values) - set(fields)
+            if invalid:
+                raise ValueError(f"Campos inválidos: {', '.join(sorted(invalid))}")
+
+        table = PlaylistTable()
+        updated = []
+        for row in self.load(name).rows():
+            changes = updates.get(row[0])
+            if changes:
+                values = dict(zip(fields, row))
+                if all(values[f] == v for f, v in expected.get(row[0], {}).items()):
+                    values.update(changes)
+                    row = tuple(values[f] for f in fields)
+                    updated.append(row[0])
+            table.append(*row)
+
+        if updated:
+            self.save(name, table)
+        return list(dict.fromkeys(updated))
+
+    def find_playlists_using(self, file_path: str) -> List[str]:
+        """Nomes das playlists que usam o arquivo (lê todas as playlists)"""
+        return [name for name in self.names() if file_path in self.load(name).file_paths()]
+
+    def find_tracks_by_event(self, event: str) -> List[Tuple[str, binary_format.Row]]:
+        """Faixas com o evento informado, como (playlist, faixa) (lê todas as playlists)"""
+        return [(name, row) for name in self.names()
+                for row in self.load(name).rows() if row[1] == event]
+
+    def import_file(self, path: str) -> int:
+        """
+        Importa playlists do formato antigo (um único playlists.json)
+
+        Args:
+            path (str): Caminho do arquivo no formato antigo
+
+        Returns:
+            int: Quantidade de playlists importadas
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            playlists = json.load(f)
+
+        index = self._read_index()
+        for name, records in playlists.items():
+            shard = self._shard_name(name, self.storage_format)
+            self._write_shard(os.path.join(self.directory, shard), name,
+                              PlaylistTable.from_records(records))
+            index[name] = shard
+
+        self._write_index(index)
+        return len(playlists)
+
+    def rebuild_index(self) -> int:
+        """
+        Reconstrói o índice a partir dos arquivos do diretório
+
+        Nos arquivos binários apenas o cabeçalho é lido.
+
+        Returns:
+            int: Quantidade de playlists encontradas
+        """
+        index = {}
+        for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            # Ignora o índice e os temporários de gravações interrompidas
+            if not entry.is_file() or entry.name == self.INDEX_FILE or entry.name.startswith('.'):
+                continue
+            try:
+                if binary_format.is_binary(entry.path):
+                    name = binary_format.read_name(entry.path)
+                elif entry.name.endswith(_EXTENSIONS[FORMAT_JSON]):
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        name = json.load(f)["name"]
+                else:
+                    continue
+            except Exception as e:
+                print(f"Erro ao ler {entry.name}: {str(e)}")
+                continue
+            index[name] = entry.name
+
+        self._write_index(index)
+        return len(index)
+
+    def migrate(self, storage_format: str) -> int:
+        """
+        Regrava todas as playlists no formato informado
+
+        Args:
+            storage_format (str): "json" ou "binary"
+
+        Returns:
+            int: Quantidade de playlists convertidas
+        """
+        target = ShardedPlaylistStorage(self.directory, storage_format)
+        converted = 0
+        for name in self.names():
+            target.save(name, self.load(name))
+            converted += 1
+        self.storage_format = storage_format
+        return converted
+
+
+def main():
+    """Converte as playlists do diretório configurado entre JSON e binário"""
+    from utils.config_manager import get_config_manager
+
+    parser = argparse.ArgumentParser(description="Migra o formato dos arquivos de playlist")
+    parser.add_argument("--to", choices=sorted(_EXTENSIONS), required=True,
+                        help="Formato de destino")
+    parser.add_argument("--directory", help="Diretório das playlists (padrão: o configurado)")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="Reconstrói o índice a partir dos arquivos antes de migrar")
+    args = parser.parse_args()
+
+    config_manager = get_config_manager()
+    storage = ShardedPlaylistStorage(args.directory or config_manager.get_storage_directory())
+    if args.rebuild_index:
+        print(f"{storage.rebuild_index()} playlists encontradas")
+    print(f"{storage.migrate(args.to)} playlists convertidas para {args.to}")
+
+    if not args.directory and config_manager.config.get("storage_format") != args.to:
+        config_manager.config["storage_format"] = args.to
+        config_manager.save_config(config_manager.config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# tests/conftest.py
+"""
+Fixtures compartilhadas: configuração e modelo de playlists em um
+diretório temporário
+"""
+import pytest
+
+from models.playlist import PlaylistModel
+from utils.config_manager import ConfigManager
+
+
+@pytest.fixture
+def config_manager(tmp_path, monkeypatch):
+    # O setup.json é gravado no diretório atual
+    monkeypatch.chdir(tmp_path)
+    manager = ConfigManager()
+    manager.config = dict(manager.default_config,
+                          playlist_directory=str(tmp_path / "library"),
+                          autosave_delay_ms=60000)
+    return manager
+
+
+@pytest.fixture
+def playlist_model(config_manager):
+    model = PlaylistModel(config_manager)
+    yield model
+    model.write_queue.close()
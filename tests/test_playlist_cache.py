@@ -0,0 +1,88 @@
+# tests/test_playlist_cache.py
+"""
+Testes do cache LRU de playlists, validado pelo carimbo (mtime, tamanho)
+dos arquivos
+"""
+import os
+
+from models.playlist import PlaylistModel, Track
+from models.playlist_table import PlaylistTable
+from models.storage import ShardedPlaylistStorage
+
+SHOW = [Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8),
+        Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0)]
+
+
+def touch(path, ns):
+    os.utime(path, ns=(ns, ns))
+
+
+def test_repeated_loads_hit_the_cache(playlist_model):
+    playlist_model.save_playlist("Show", SHOW)
+    playlist_model.clear_cache()
+
+    assert playlist_model.load_playlist("Show") == SHOW
+    assert playlist_model.load_playlist("Show") == SHOW
+    stats = playlist_model.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_file_changed_outside_invalidates_entry(playlist_model, config_manager):
+    playlist_model.save_playlist("Show", SHOW)
+    playlist_model.load_playlist("Show")
+
+    # Outra instância (ou outro processo) grava a mesma playlist
+    other = ShardedPlaylistStorage(config_manager.get_storage_directory())
+    other.save("Show", PlaylistTable.from_tracks(SHOW[:1]))
+    touch(other.shard_path("Show"), 10**9)
+
+    assert playlist_model.load_playlist("Show") == SHOW[:1]
+    assert playlist_model.cache_stats()["misses"] == 1
+
+
+def test_same_size_rewrite_is_detected_by_mtime(playlist_model, config_manager):
+    playlist_model.save_playlist("Show", SHOW)
+    path = ShardedPlaylistStorage(config_manager.get_storage_directory()).shard_path("Show")
+    touch(path, 10**9)
+    playlist_model.clear_cache()
+    playlist_model.load_playlist("Show")
+
+    quieter = [SHOW[0], Track(2, "Entrada", "Tema", "/audio/tema.mp3", 0.5)]
+    other = ShardedPlaylistStorage(config_manager.get_storage_directory())
+    other.save("Show", PlaylistTable.from_tracks(quieter))
+    touch(path, 2 * 10**9)
+
+    assert os.path.getsize(path) == playlist_model._playlist_cache["Show"][0][1]
+    assert playlist_model.load_playlist("Show") == quieter
+
+
+def test_least_recently_used_is_evicted(config_manager):
+    config_manager.config["playlist_cache_size"] = 2
+    model = PlaylistModel(config_manager)
+    try:
+        for name in ("A", "B", "C"):
+            model.save_playlist(name, SHOW)
+        assert list(model._playlist_cache) == ["B", "C"]
+
+        model.load_playlist("B")
+        model.load_playlist("A")
+        assert list(model._playlist_cache) == ["B", "A"]
+    finally:
+        model.write_queue.close()
+
+
+def test_names_cache_follows_the_index(playlist_model, config_manager):
+    playlist_model.save_playlist("Show", SHOW)
+    assert playlist_model.get_playlist_names() == ["Show"]
+    hits = playlist_model.cache_stats()["hits"]
+    assert playlist_model.get_playlist_names() == ["Show"]
+    assert playlist_model.cache_stats()["hits"] == hits + 1
+
+    other = ShardedPlaylistStorage(config_manager.get_storage_directory())
+    other.save("Ensaio", PlaylistTable.from_tracks(SHOW))
+    touch(other.index_file, 10**9)
+    assert playlist_model.get_playlist_names() == ["Show", "Ensaio"]
+
+    # Playlists ainda na fila de gravação já aparecem
+    playlist_model.save_playlist_deferred("Nova", SHOW)
+    assert playlist_model.get_playlist_names() == ["Show", "Ensaio", "Nova"]
@@ -0,0 +1,88 @@
+# tests/test_playlist_table.py
+"""
+Testes da tabela colunar de faixas e da leitura do layout antigo, com um
+dicionário por faixa
+"""
+import dataclasses
+import json
+import sys
+
+import pytest
+
+from models.playlist import Track, track_from_record, track_to_record
+from models.playlist_table import TRACK_FIELDS, PlaylistTable
+from models.storage import ShardedPlaylistStorage
+
+TRACKS = [
+    Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8,
+          start_offset=0.25, end_offset=12.5, fade_in=1.5, fade_out=2.0, duck_level=0.3),
+    Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0),
+    Track(3, "Entrada", "Tema", "/audio/tema.mp3", 0.5, fade_out=4.0),
+]
+
+
+def test_track_is_frozen_and_slotted():
+    track = TRACKS[1]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        track.volume = 0.5
+    if sys.version_info >= (3, 10):
+        assert not hasattr(track, "__dict__")
+    assert tuple(f.name for f in dataclasses.fields(Track)) == TRACK_FIELDS
+
+
+def test_rows_follow_track_order():
+    table = PlaylistTable.from_tracks(TRACKS)
+    assert len(table) == 3
+    assert [Track(*row) for row in table.rows()] == TRACKS
+    assert Track(*table.row(0)) == TRACKS[0]
+    assert table.file_paths() == ["/audio/vinheta.wav", "/audio/tema.mp3", "/audio/tema.mp3"]
+
+
+def test_repeated_strings_are_stored_once():
+    table = PlaylistTable.from_tracks(TRACKS)
+    assert table.strings == ["Abertura", "Vinheta", "/audio/vinheta.wav", "Entrada", "Tema",
+                             "/audio/tema.mp3"]
+    assert table.name[1] == table.name[2]
+
+
+def test_columns_round_trip_through_json():
+    columns = json.loads(json.dumps(PlaylistTable.from_tracks(TRACKS).to_columns()))
+    assert [Track(*row) for row in PlaylistTable.from_columns(columns).rows()] == TRACKS
+
+
+def test_columns_without_new_fields_use_defaults():
+    columns = PlaylistTable.from_tracks(TRACKS).to_columns()
+    for column in ("start_offset", "end_offset", "fade_in", "fade_out", "duck_level"):
+        del columns[column]
+    assert [Track(*row) for row in PlaylistTable.from_columns(columns).rows()] == [
+        Track(t.sequence, t.event, t.name, t.file_path, t.volume) for t in TRACKS
+    ]
+
+
+def test_columns_with_different_lengths_are_rejected():
+    columns = PlaylistTable.from_tracks(TRACKS).to_columns()
+    columns["volume"].pop()
+    with pytest.raises(ValueError):
+        PlaylistTable.from_columns(columns)
+
+
+def test_records_round_trip():
+    records = [track_to_record(t) for t in TRACKS]
+    assert [track_from_record(r) for r in records] == TRACKS
+    assert [Track(*row) for row in PlaylistTable.from_records(records).rows()] == TRACKS
+
+
+def test_legacy_record_layout_is_read(tmp_path):
+    storage = ShardedPlaylistStorage(str(tmp_path))
+    storage.save("Show", PlaylistTable.from_tracks(TRACKS))
+
+    # Arquivo gravado antes do formato colunar: um registro por faixa, sem
+    # pontos de corte nem envelopes
+    records = [{"sequence": t.sequence, "event": t.event, "name": t.name,
+                "file_path": t.file_path, "volume": t.volume} for t in TRACKS]
+    with open(storage.shard_path("Show"), "w", encoding="utf-8") as f:
+        json.dump({"name": "Show", "tracks": records}, f)
+
+    assert [Track(*row) for row in storage.load("Show").rows()] == [
+        Track(t.sequence, t.event, t.name, t.file_path, t.volume) for t in TRACKS
+    ]
@@ -0,0 +1,198 @@
+# tests/test_remote_control.py
+"""
+Testes do servidor de controle remoto com um cliente TCP local
+"""
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from controllers.remote_control import RemoteControlServer, parse_command
+
+
+class StubController:
+    """Controlador mínimo: registra os comandos recebidos"""
+
+    def __init__(self):
+        self.listeners = []
+        self.calls = []
+        self.cue = None
+        self.level = 1.0
+        self.slow = threading.Event()
+        self.release = threading.Event()
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+
+    def emit(self, event):
+        for callback in list(self.listeners):
+            callback(event)
+
+    def playback_state(self):
+        return {"playlist": "Show", "playing": self.cue is not None,
+                "cue": self.cue, "level": self.level, "voices": []}
+
+    def go_next(self):
+        self.calls.append(("next",))
+        if self.slow.is_set():
+            self.release.wait(5)
+        self.cue = (self.cue or 0) + 1
+
+    def go_to_cue(self, sequence):
+        self.calls.append(("play", sequence))
+        self.cue = sequence
+
+    def stop_cues(self, fade_ms=None):
+        self.calls.append(("stop", fade_ms))
+        self.cue = None
+
+    def set_cue_level(self, level):
+        self.level = min(1.0, max(0.0, level))
+        return self.level
+
+    def load_cues(self, name):
+        if name != "Show":
+            raise Exception(f"Playlist '{name}' não encontrada")
+        return 3
+
+    def get_playlist_names(self):
+        return ["Show", "Ensaio"]
+
+
+class Client:
+    """Cliente de linhas JSON sobre um socket local"""
+
+    def __init__(self, address):
+        self.sock = socket.create_connection(address, timeout=5)
+        self.file = self.sock.makefile("rwb")
+
+    def send(self, line: str):
+        self.file.write(line.encode("utf-8") + b"\n")
+        self.file.flush()
+
+    def receive(self):
+        return json.loads(self.file.readline())
+
+    def request(self, line: str):
+        self.send(line)
+        return self.receive()
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+@pytest.fixture
+def controller():
+    return StubController()
+
+
+@pytest.fixture
+def server(controller):
+    server = RemoteControlServer(controller, "127.0.0.1", 0)
+    server.start()
+    yield server
+    controller.release.set()
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    client = Client(server.address)
+    yield client
+    client.close()
+
+
+def test_start_binds_requested_port_zero(server):
+    host, port = server.address
+    assert host == "127.0.0.1"
+    assert port > 0
+
+
+def test_text_commands(client, controller):
+    assert client.request("ping") == {"ok": True, "result": "pong"}
+    assert client.request("play 3")["result"]["cue"] == 3
+    assert client.request("next")["result"]["cue"] == 4
+    assert client.request("VOLUME 0.5") == {"ok": True, "result": 0.5}
+    assert client.request("stop 250")["result"]["playing"] is False
+    assert controller.calls == [("play", 3), ("next",), ("stop", 250)]
+
+
+def test_json_commands_echo_id(client, controller):
+    response = client.request(json.dumps({"cmd": "play", "sequence": 2, "id": 7}))
+    assert response["ok"] is True
+    assert response["id"] == 7
+    assert response["result"]["cue"] == 2
+
+    response = client.request(json.dumps({"cmd": "load", "name": "Show", "id": "a"}))
+    assert response == {"ok": True, "result": 3, "id": "a"}
+    assert client.request('{"cmd": "playlists"}')["result"] == ["Ensaio", "Show"]
+
+
+def test_errors_keep_connection_open(client):
+    assert client.request("rewind") == {"ok": False, "error": "Comando desconhecido: rewind"}
+    assert client.request("ping now")["ok"] is False
+    assert client.request('{"sequence": 1}')["ok"] is False
+    assert client.request("{not json")["ok"] is False
+    response = client.request(json.dumps({"cmd": "load", "name": "Outra", "id": 1}))
+    assert response["ok"] is False and response["id"] == 1
+    assert "não encontrada" in response["error"]
+    assert client.request("ping")["ok"] is True
+
+
+def test_token_authentication(controller):
+    server = RemoteControlServer(controller, "127.0.0.1", 0, token="segredo")
+    server.start()
+    client = Client(server.address)
+    try:
+        assert client.request("next") == {"ok": False, "error": "Autenticação necessária"}
+        assert client.request("auth errado") == {"ok": False, "error": "Token inválido"}
+        assert client.request("auth segredo") == {"ok": True, "result": True}
+        assert client.request("next")["ok"] is True
+        assert controller.calls == [("next",)]
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_subscribe_receives_events(server, client, controller):
+    response = client.request("subscribe")
+    assert response["ok"] is True
+    assert response["result"]["playlist"] == "Show"
+
+    controller.emit({"event": "cue", "cue": {"sequence": 1}})
+    assert client.receive() == {"event": "cue", "cue": {"sequence": 1}}
+
+    assert client.request("unsubscribe") == {"ok": True, "result": True}
+    controller.emit({"event": "stopped"})
+    # Sem inscrição, a próxima linha recebida é a resposta, não o evento
+    assert client.request("ping") == {"ok": True, "result": "pong"}
+
+
+def test_slow_command_does_not_block_other_clients(server, client, controller):
+    controller.slow.set()
+    client.send("next")
+
+    other = Client(server.address)
+    try:
+        started = time.perf_counter()
+        assert other.request("ping") == {"ok": True, "result": "pong"}
+        assert other.request("volume 0.3")["result"] == 0.3
+        assert time.perf_counter() - started < 1.0
+    finally:
+        controller.release.set()
+        other.close()
+    assert client.receive()["result"]["cue"] == 1
+
+
+def test_parse_command_forms():
+    assert parse_command("play 3") == {"cmd": "play", "sequence": "3"}
+    assert parse_command("load Show de Sábado") == {"cmd": "load", "name": "Show de Sábado"}
+    assert parse_command('{"cmd": "NEXT", "id": 1}') == {"cmd": "next", "id": 1}
+    with pytest.raises(Exception):
+        parse_command("next 2")
@@ -0,0 +1,107 @@
+# tests/test_search_index.py
+"""
+Testes do índice de busca: início do texto, trecho, busca aproximada e
+reindexação das playlists
+"""
+from models.search_index import (KIND_EVENT, KIND_FILE, KIND_NAME, KIND_PLAYLIST,
+                                 SearchIndex, normalize)
+
+SHOW = [
+    (1, "Abertura", "Vinheta de Abertura", "/audio/vinheta.wav"),
+    (2, "Entrada", "Tema Principal", "/audio/tema.mp3"),
+    (3, "Encerramento", "Música Final", "/audio/final.ogg"),
+]
+
+ENSAIO = [
+    (1, "Aquecimento", "Tema Principal", "/audio/tema.mp3"),
+]
+
+
+def build():
+    index = SearchIndex()
+    index.index_playlist("Show", SHOW)
+    index.index_playlist("Ensaio", ENSAIO)
+    return index
+
+
+def found(results):
+    return {(r.kind, r.playlist, r.sequence, r.text) for r in results}
+
+
+def test_normalize_ignores_case_and_accents():
+    assert normalize("Música FINAL") == "musica final"
+
+
+def test_prefix_matches_come_first():
+    results = build().search("tema")
+    assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+    assert found(results) == {
+        (KIND_NAME, "Show", 2, "Tema Principal"),
+        (KIND_NAME, "Ensaio", 1, "Tema Principal"),
+        (KIND_FILE, "Show", 2, "tema.mp3"),
+        (KIND_FILE, "Ensaio", 1, "tema.mp3"),
+    }
+    assert all(r.score == 2.0 for r in results)
+
+
+def test_short_query_uses_word_prefixes():
+    results = build().search("fi")
+    assert found(results) == {(KIND_NAME, "Show", 3, "Música Final"),
+                              (KIND_FILE, "Show", 3, "final.ogg")}
+
+
+def test_substring_and_accents():
+    results = build().search("SICA")
+    assert found(results) == {(KIND_NAME, "Show", 3, "Música Final")}
+    assert results[0].score == 1.0
+
+
+def test_fuzzy_when_nothing_matches():
+    results = build().search("encerramneto")
+    assert (KIND_EVENT, "Show", 3, "Encerramento") in found(results)
+    assert all(0 < r.score < 1.0 for r in results)
+
+
+def test_playlist_names_and_limit():
+    index = build()
+    assert found(index.search("ensaio")) == {(KIND_PLAYLIST, "Ensaio", None, "Ensaio")}
+    assert len(index.search("a", limit=2)) == 2
+    assert index.search("   ") == []
+
+
+def test_reindex_replaces_playlist():
+    index = build()
+    index.index_playlist("Show", [(1, "Abertura", "Vinheta Nova", "/audio/nova.wav")])
+    assert index.search("final") == []
+    assert found(index.search("vinheta nova")) == {(KIND_NAME, "Show", 1, "Vinheta Nova")}
+    # O texto compartilhado com a outra playlist continua indexado
+    assert found(index.search("tema principal")) == {(KIND_NAME, "Ensaio", 1, "Tema Principal")}
+
+
+def test_remove_playlist():
+    index = build()
+    index.remove_playlist("Ensaio")
+    assert index.search("aquecimento") == []
+    assert index.search("aquecimentu") == []
+    assert {r.playlist for r in index.search("tema")} == {"Show"}
+
+
+def test_unused_texts_are_dropped():
+    index = build()
+    index.search("a")
+    texts = sum(text is not None for text in index._texts)
+    postings = len(index._trigram_postings)
+
+    # Cada salvamento automático reindexa a playlist com um nome diferente
+    for edit in range(200):
+        rows = [(1, "Abertura", f"Vinheta {edit}", "/audio/vinheta.wav")] + SHOW[1:]
+        index.index_playlist("Show", rows)
+        assert found(index.search("vinheta")) == {(KIND_NAME, "Show", 1, f"Vinheta {edit}"),
+                                                  (KIND_FILE, "Show", 1, "vinheta.wav")}
+    index.index_playlist("Show", SHOW)
+
+    assert sum(text is not None for text in index._texts) == texts
+    assert len(index._texts) <= texts + 1
+    assert len(index._trigram_postings) == postings
+    assert len(index._sorted) == texts
+    assert found(build().search("a")) == found(index.search("a"))
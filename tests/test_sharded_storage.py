@@ -0,0 +1,116 @@
+# tests/test_sharded_storage.py
+"""
+Testes do armazenamento com um arquivo por playlist e da importação do
+arquivo único do formato antigo
+"""
+import json
+import os
+
+import pytest
+
+from models.playlist import PlaylistModel, Track
+from models.playlist_table import PlaylistTable
+from models.storage import FORMAT_BINARY, FORMAT_JSON, ShardedPlaylistStorage
+
+SHOW = [Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8),
+        Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0)]
+ENSAIO = [Track(1, "Aquecimento", "Tema", "/audio/tema.mp3", 0.5)]
+
+
+def tracks(table):
+    return [Track(*row) for row in table.rows()]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return ShardedPlaylistStorage(str(tmp_path / "playlists"))
+
+
+def test_round_trip_and_names(storage):
+    storage.save("Show", PlaylistTable.from_tracks(SHOW))
+    storage.save("Ensaio", PlaylistTable.from_tracks(ENSAIO))
+    assert storage.names() == ["Show", "Ensaio"]
+    assert tracks(storage.load("Show")) == SHOW
+    assert list(Track(*row) for row in storage.iter_rows("Ensaio")) == ENSAIO
+    with pytest.raises(KeyError):
+        storage.load("Outra")
+
+
+def test_save_writes_only_its_own_file(storage):
+    storage.save("Show", PlaylistTable.from_tracks(SHOW))
+    storage.save("Ensaio", PlaylistTable.from_tracks(ENSAIO))
+    show_stamp = storage.stamp("Show")
+    index_stamp = storage.index_stamp()
+
+    os.utime(storage.shard_path("Show"), ns=(1, 1))
+    os.utime(storage.index_file, ns=(1, 1))
+    storage.save("Ensaio", PlaylistTable.from_tracks(SHOW))
+
+    # Nem o arquivo da outra playlist nem o índice (nome já conhecido) mudam
+    assert storage.stamp("Show") == (1, show_stamp[1])
+    assert storage.index_stamp() == (1, index_stamp[1])
+    assert tracks(storage.load("Ensaio")) == SHOW
+
+
+def test_shard_names_are_safe_and_distinct(storage):
+    names = ["a/b", "a?b", "../fora", "Show de Sábado", ""]
+    for name in names:
+        storage.save(name, PlaylistTable.from_tracks(ENSAIO))
+    files = {entry.name for entry in os.scandir(storage.directory)}
+    assert len(files) == len(names) + 1
+    assert all(os.sep not in f and not f.startswith(".") for f in files)
+    assert sorted(storage.names()) == sorted(names)
+    assert not os.path.exists(os.path.join(os.path.dirname(storage.directory), "fora"))
+
+
+def test_rebuild_index_skips_temporaries(storage):
+    storage.save("Show", PlaylistTable.from_tracks(SHOW))
+    storage.save("Ensaio", PlaylistTable.from_tracks(ENSAIO))
+    with open(os.path.join(storage.directory, ".Show.tmp"), "w") as f:
+        f.write("{truncado")
+    os.remove(storage.index_file)
+
+    assert storage.rebuild_index() == 2
+    assert sorted(storage.names()) == ["Ensaio", "Show"]
+    assert tracks(storage.load("Show")) == SHOW
+
+
+def test_migrate_between_formats(storage):
+    storage.save("Show", PlaylistTable.from_tracks(SHOW))
+    json_path = storage.shard_path("Show")
+
+    assert storage.migrate(FORMAT_BINARY) == 1
+    assert not os.path.exists(json_path)
+    assert storage.shard_path("Show").endswith(".plb")
+    assert tracks(storage.load("Show")) == SHOW
+
+    assert storage.migrate(FORMAT_JSON) == 1
+    assert tracks(storage.load("Show")) == SHOW
+
+
+def test_legacy_file_is_imported_on_first_use(config_manager):
+    records = {
+        "Show": [{"sequence": t.sequence, "event": t.event, "name": t.name,
+                  "file_path": t.file_path, "volume": t.volume} for t in SHOW],
+        "Ensaio": [{"sequence": 1, "event": "Aquecimento", "name": "Tema",
+                    "file_path": "/audio/tema.mp3", "volume": 0.5}],
+    }
+    with open(config_manager.get_playlist_path(), "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+    model = PlaylistModel(config_manager)
+    try:
+        assert sorted(model.get_playlist_names()) == ["Ensaio", "Show"]
+        assert model.load_playlist("Show") == SHOW
+        assert model.load_playlist("Ensaio") == ENSAIO
+    finally:
+        model.write_queue.close()
+
+    # A importação não se repete: o índice já existe
+    with open(config_manager.get_playlist_path(), "w", encoding="utf-8") as f:
+        json.dump({"Outra": []}, f)
+    model = PlaylistModel(config_manager)
+    try:
+        assert "Outra" not in model.get_playlist_names()
+    finally:
+        model.write_queue.close()
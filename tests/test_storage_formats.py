@@ -0,0 +1,140 @@
+# tests/test_storage_formats.py
+"""
+Testes de compatibilidade dos formatos gravados em disco: formato binário
+(versões 1 a 3) e atualização do esquema do banco SQLite
+"""
+import io
+import sqlite3
+import struct
+
+import pytest
+
+from models import binary_format
+from models.playlist import Track
+from models.playlist_table import PlaylistTable
+from models.sqlite_storage import SQLitePlaylistStorage
+
+TRACKS = [
+    Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8,
+          start_offset=0.25, end_offset=12.5, fade_in=1.5, fade_out=2.0, duck_level=0.3),
+    Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0),
+    Track(3, "Entrada", "Tema", "/audio/tema.mp3", 0.5, fade_out=4.0),
+]
+
+
+def write_old_binary(version: int, name: str, rows) -> bytes:
+    """Monta um arquivo binário de versão anterior, como gravado por ela"""
+    record = binary_format._RECORDS[version]
+    strings = []
+    for row in rows:
+        for value in row[1:4]:
+            if value not in strings:
+                strings.append(value)
+
+    out = io.BytesIO()
+    out.write(binary_format._HEADER.pack(binary_format.MAGIC, version, 0, len(rows), len(strings)))
+    for value in [name] + strings:
+        data = value.encode("utf-8")
+        out.write(struct.pack("<I", len(data)) + data)
+    for sequence, event, track_name, file_path, volume, *offsets in rows:
+        out.write(record.pack(sequence, volume, strings.index(event), strings.index(track_name),
+                              strings.index(file_path), *offsets))
+    return out.getvalue()
+
+
+def test_binary_round_trip_keeps_envelopes(tmp_path):
+    path = tmp_path / "show.plb"
+    with open(path, "wb") as f:
+        binary_format.write_table(f, "Show", PlaylistTable.from_tracks(TRACKS))
+
+    assert binary_format.read_name(str(path)) == "Show"
+    with open(path, "rb") as f:
+        table = binary_format.read_table(f)
+    assert [Track(*row) for row in table.rows()] == TRACKS
+    assert [Track(*row) for row in binary_format.iter_rows(str(path))] == TRACKS
+
+
+@pytest.mark.parametrize("version, offsets", [(1, ()), (2, (0.5, 30.0))])
+def test_binary_old_versions_read_with_defaults(tmp_path, version, offsets):
+    rows = [(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8, *offsets),
+            (2, "Entrada", "Tema", "/audio/tema.mp3", 1.0, *offsets)]
+    path = tmp_path / f"v{version}.plb"
+    path.write_bytes(write_old_binary(version, "Antiga", rows))
+
+    start, end = offsets or (0.0, 0.0)
+    expected = [Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8, start, end),
+                Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0, start, end)]
+    with open(path, "rb") as f:
+        assert [Track(*row) for row in binary_format.read_table(f).rows()] == expected
+    assert [Track(*row) for row in binary_format.iter_rows(str(path))] == expected
+    assert all(track.duck_level == 1.0 for track in expected)
+
+    # Regravado, passa para a versão atual sem perder nada
+    upgraded = tmp_path / "upgraded.plb"
+    with open(path, "rb") as f, open(upgraded, "wb") as out:
+        binary_format.write_table(out, "Antiga", binary_format.read_table(f))
+    assert upgraded.read_bytes()[4:6] == struct.pack("<H", binary_format.VERSION)
+    assert [Track(*row) for row in binary_format.iter_rows(str(upgraded))] == expected
+
+
+# Esquema do banco como criado pela primeira versão do backend SQLite
+_FIRST_SCHEMA = """
+CREATE TABLE playlists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE tracks (
+    playlist_id INTEGER NOT NULL REFERENCES playlists(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    sequence INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    volume REAL NOT NULL,
+    PRIMARY KEY (playlist_id, position)
+);
+CREATE TABLE media (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    info TEXT
+);
+"""
+
+
+def test_sqlite_upgrades_first_schema(tmp_path):
+    db_path = str(tmp_path / "library.sqlite3")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_FIRST_SCHEMA)
+    conn.execute("INSERT INTO playlists (id, name) VALUES (1, 'Antiga')")
+    conn.executemany(
+        "INSERT INTO tracks VALUES (1, ?, ?, ?, ?, ?, ?)",
+        [(0, 1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8),
+         (1, 2, "Entrada", "Tema", "/audio/tema.mp3", 1.0)]
+    )
+    conn.commit()
+    conn.close()
+
+    storage = SQLitePlaylistStorage(db_path)
+    assert storage.names() == ["Antiga"]
+    assert [Track(*row) for row in storage.load("Antiga").rows()] == [
+        Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8),
+        Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0),
+    ]
+
+    assert storage.update_track("Antiga", 2, fade_in=0.5, duck_level=0.4)
+    assert Track(*storage.load("Antiga").row(1)) == Track(
+        2, "Entrada", "Tema", "/audio/tema.mp3", 1.0, fade_in=0.5, duck_level=0.4
+    )
+
+    # Reabrir um banco já atualizado não altera nada
+    reopened = SQLitePlaylistStorage(db_path)
+    assert Track(*reopened.load("Antiga").row(1)).duck_level == 0.4
+
+
+def test_sqlite_round_trip_keeps_envelopes(tmp_path):
+    storage = SQLitePlaylistStorage(str(tmp_path / "library.sqlite3"))
+    storage.save("Show", PlaylistTable.from_tracks(TRACKS))
+    assert [Track(*row) for row in storage.load("Show").rows()] == TRACKS
+    assert [Track(*row) for row in storage.iter_rows("Show")] == TRACKS
@@ -0,0 +1,102 @@
+# tests/test_track_updates.py
+"""
+Testes da alteração de faixas em lote, usada pela análise de silêncio
+"""
+import pytest
+
+from models.playlist import PlaylistModel, Track
+from models.playlist_table import PlaylistTable
+from models.sqlite_storage import SQLitePlaylistStorage
+from models.storage import ShardedPlaylistStorage
+
+TRACKS = [
+    Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8),
+    Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0),
+    Track(3, "Saída", "Final", "/audio/final.ogg", 0.6),
+]
+
+TRIMS = {
+    1: {"start_offset": 0.25, "end_offset": 10.0},
+    2: {"start_offset": 0.5, "end_offset": 0.0},
+    3: {"start_offset": 1.0, "end_offset": 20.0},
+}
+
+
+def untrimmed(tracks):
+    """Condição da análise: mesmo arquivo e ainda sem corte"""
+    return {t.sequence: {"file_path": t.file_path, "start_offset": 0.0, "end_offset": 0.0}
+            for t in tracks}
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLitePlaylistStorage(str(tmp_path / "library.sqlite3"))
+    return ShardedPlaylistStorage(str(tmp_path / "playlists"))
+
+
+def test_update_tracks_applies_all_changes(storage):
+    storage.save("Show", PlaylistTable.from_tracks(TRACKS))
+    assert storage.update_tracks("Show", TRIMS, untrimmed(TRACKS)) == [1, 2, 3]
+    assert [Track(*row) for row in storage.load("Show").rows()] == [
+        Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8, 0.25, 10.0),
+        Track(2, "Entrada", "Tema", "/audio/tema.mp3", 1.0, 0.5, 0.0),
+        Track(3, "Saída", "Final", "/audio/final.ogg", 0.6, 1.0, 20.0),
+    ]
+
+
+def test_update_tracks_skips_changed_rows(storage):
+    storage.save("Show", PlaylistTable.from_tracks(TRACKS))
+    expected = untrimmed(TRACKS)
+    expected[2]["file_path"] = "/audio/outro.mp3"
+    assert storage.update_tracks("Show", TRIMS, expected) == [1, 3]
+    assert Track(*storage.load("Show").row(1)) == TRACKS[1]
+
+
+def test_update_tracks_rejects_unknown_fields(storage):
+    storage.save("Show", PlaylistTable.from_tracks(TRACKS))
+    with pytest.raises(ValueError):
+        storage.update_tracks("Show", {1: {"tempo": 120}})
+    with pytest.raises(ValueError):
+        storage.update_tracks("Show", {1: {"volume": 0.5}}, {1: {"tempo": 120}})
+
+
+def test_files_backend_rewrites_playlist_once(tmp_path, monkeypatch):
+    storage = ShardedPlaylistStorage(str(tmp_path / "playlists"))
+    storage.save("Show", PlaylistTable.from_tracks(TRACKS))
+    saves = []
+    original = storage.save
+    monkeypatch.setattr(storage, "save", lambda name, table: (saves.append(name), original(name, table)))
+
+    storage.update_tracks("Show", TRIMS, untrimmed(TRACKS))
+    assert saves == ["Show"]
+    assert storage.update_tracks("Show", TRIMS, untrimmed(TRACKS)) == []
+    assert saves == ["Show"]
+
+
+def test_offset_updates_keep_autosaved_edits(playlist_model, config_manager):
+    playlist_model.save_playlist("Show", TRACKS)
+
+    # Edições feitas durante a análise, ainda na fila de gravação adiada
+    edited = [TRACKS[0], Track(2, "Entrada", "Tema (ao vivo)", "/audio/tema.mp3", 0.4),
+              Track(3, "Saída", "Final", "/audio/bis.ogg", 0.6)]
+    playlist_model.save_playlist_deferred("Show", edited)
+    assert playlist_model.write_queue.pending_keys() == ["Show"]
+
+    updated = playlist_model.update_tracks("Show", TRIMS, untrimmed(TRACKS))
+    assert updated == [1, 2]
+
+    expected = [
+        Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8, 0.25, 10.0),
+        Track(2, "Entrada", "Tema (ao vivo)", "/audio/tema.mp3", 0.4, 0.5, 0.0),
+        Track(3, "Saída", "Final", "/audio/bis.ogg", 0.6),
+    ]
+    assert playlist_model.load_playlist("Show") == expected
+
+    # A gravação adiada já foi feita e não desfaz os cortes
+    playlist_model.flush()
+    reopened = PlaylistModel(config_manager)
+    try:
+        assert reopened.load_playlist("Show") == expected
+    finally:
+        reopened.write_queue.close()
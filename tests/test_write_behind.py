@@ -0,0 +1,148 @@
+# tests/test_write_behind.py
+"""
+Testes da gravação atômica e da fila de gravação adiada
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from models.playlist import PlaylistModel, Track
+from utils.atomic_io import atomic_write, atomic_write_json
+from utils.write_behind import WriteBehindQueue
+
+SHOW = [Track(1, "Abertura", "Vinheta", "/audio/vinheta.wav", 0.8)]
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "dados.json"
+    atomic_write_json(str(path), {"versao": 1})
+    atomic_write_json(str(path), {"versao": 2})
+    assert json.loads(path.read_text()) == {"versao": 2}
+    assert os.listdir(tmp_path) == ["dados.json"]
+
+
+def test_atomic_write_keeps_original_on_error(tmp_path):
+    path = tmp_path / "dados.bin"
+    path.write_bytes(b"original")
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path), "wb") as f:
+            f.write(b"pela metade")
+            raise RuntimeError("queda no meio da gravação")
+    assert path.read_bytes() == b"original"
+    assert os.listdir(tmp_path) == ["dados.bin"]
+
+
+def test_submissions_of_same_key_are_coalesced():
+    queue = WriteBehindQueue(window_ms=50)
+    written = []
+    try:
+        for version in range(5):
+            queue.submit("Show", lambda v=version: written.append(("Show", v)))
+        queue.submit("Ensaio", lambda: written.append(("Ensaio", 0)))
+        assert queue.pending_keys() == ["Show", "Ensaio"]
+        assert wait_for(lambda: len(written) == 2)
+        assert sorted(written) == [("Ensaio", 0), ("Show", 4)]
+        assert queue.stats()["coalesced"] == 4
+    finally:
+        queue.close()
+
+
+def test_max_delay_bounds_continuous_edits():
+    queue = WriteBehindQueue(window_ms=100, max_delay_ms=150)
+    written = threading.Event()
+    try:
+        started = time.monotonic()
+        # Edições a cada 20 ms nunca deixam a janela de 100 ms fechar
+        while not written.is_set() and time.monotonic() - started < 2.0:
+            queue.submit("Show", written.set)
+            time.sleep(0.02)
+        assert written.is_set()
+        assert time.monotonic() - started < 1.0
+    finally:
+        queue.close()
+
+
+def test_flush_cancel_and_close():
+    queue = WriteBehindQueue(window_ms=60000)
+    written = []
+    queue.submit("Show", lambda: written.append("Show"))
+    queue.submit("Ensaio", lambda: written.append("Ensaio"))
+    assert queue.cancel("Ensaio")
+    assert queue.flush() == 1
+    assert written == ["Show"]
+
+    queue.submit("Show", lambda: written.append("fechamento"))
+    queue.close()
+    assert written == ["Show", "fechamento"]
+    with pytest.raises(Exception):
+        queue.submit("Show", lambda: None)
+
+
+def test_failed_write_does_not_stop_the_queue(capsys):
+    queue = WriteBehindQueue(window_ms=60000)
+    written = []
+    try:
+        queue.submit("Show", lambda: 1 / 0)
+        queue.submit("Ensaio", lambda: written.append("Ensaio"))
+        assert queue.flush() == 2
+        assert written == ["Ensaio"]
+        assert "Erro na gravação adiada" in capsys.readouterr().out
+    finally:
+        queue.close()
+
+
+def test_deferred_save_is_visible_before_it_is_written(playlist_model):
+    playlist_model.save_playlist_deferred("Show", SHOW)
+    assert playlist_model.load_playlist("Show") == SHOW
+    assert not os.path.exists(playlist_model.storage.shard_path("Show"))
+    assert playlist_model.flush() == 1
+    assert playlist_model.storage.names() == ["Show"]
+
+
+def test_failed_autosave_is_kept_and_retried(playlist_model, monkeypatch):
+    save = playlist_model.storage.save
+    failures = []
+
+    def failing_save(name, table):
+        failures.append(name)
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(playlist_model.storage, "save", failing_save)
+    playlist_model.save_playlist_deferred("Show", SHOW)
+    playlist_model.write_queue.flush()
+    assert failures == ["Show"]
+    # A versão continua pendente e voltou para a fila
+    assert playlist_model.load_playlist("Show") == SHOW
+    assert playlist_model.write_queue.pending_keys() == ["Show"]
+
+    with pytest.raises(Exception, match="disco cheio"):
+        playlist_model.flush()
+
+    monkeypatch.setattr(playlist_model.storage, "save", save)
+    assert playlist_model.flush() == 1
+    assert playlist_model.storage.names() == ["Show"]
+
+
+def test_close_writes_pending_playlists(playlist_model, config_manager):
+    playlist_model.save_playlist_deferred("Show", SHOW)
+    playlist_model.close()
+    with pytest.raises(Exception):
+        playlist_model.write_queue.submit("Show", lambda: None)
+
+    reopened = PlaylistModel(config_manager)
+    try:
+        assert reopened.load_playlist("Show") == SHOW
+    finally:
+        reopened.write_queue.close()
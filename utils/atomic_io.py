@@ -0,0 +1,75 @@
+# utils/atomic_io.py
+"""
+Gerenciador de Playlist - Gravação Atômica
+Versão 1.0.0
+
+Grava arquivos em um temporário no mesmo diretório, sincroniza com o
+disco (fsync) e só então o renomeia sobre o destino. Uma queda no meio
+da gravação deixa o arquivo anterior intacto, nunca um arquivo truncado.
+"""
+# utils/atomic_io.py
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Iterator
+from utils.metrics import get_metrics
+
+
+def _fsync_directory(directory: str) -> None:
+    """Sincroniza a entrada do diretório após o rename (apenas POSIX)"""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: str = 'utf-8') -> Iterator[IO]:
+    """
+    Abre um temporário que substitui o arquivo ao final do bloco 'with'
+
+    Se o bloco lançar uma exceção, o temporário é descartado e o arquivo
+    original permanece como estava.
+
+    Args:
+        path (str): Arquivo de destino
+        mode (str): 'w' para texto ou 'wb' para binário
+        encoding (str): Codificação usada no modo texto
+
+    Yields:
+        IO: Arquivo temporário aberto para escrita
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp",
+                                    dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def atomic_write_json(path: str, data: Any, **kwargs) -> None:
+    """
+    Grava um documento JSON de forma atômica
+
+    Args:
+        path (str): Arquivo de destino
+        data (Any): Documento a gravar
+        **kwargs: Repassados a json.dump (ex.: indent, ensure_ascii)
+    """
+    with get_metrics().time("io.json_write"):
+        with atomic_write(path, 'w') as f:
+            json.dump(data, f, **kwargs)
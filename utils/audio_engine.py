@@ -0,0 +1,340 @@
+# utils/audio_engine.py
+"""
+Gerenciador de Playlist - Motor de Áudio
+Versão 1.0.0
+
+Thread dedicada, dona do pygame.mixer, das vozes e do agendador de
+deixas. A interface e o controle remoto enviam comandos por uma fila
+limitada; a thread os executa em ordem, acompanha a reprodução, publica
+um retrato imutável do estado e avisa o fim das deixas e das vozes. Assim
+o disparo e a emenda das deixas não esperam por pinturas da interface
+nem por gravações em disco.
+"""
+# utils/audio_engine.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from utils.metrics import get_metrics
+
+# Intervalo de acompanhamento da reprodução enquanto há algo tocando
+POLL_INTERVAL = 0.005
+
+EventCallback = Callable[[str, Dict], None]
+
+
+@dataclass(frozen=True)
+class EngineState:
+    """Retrato do motor, substituído por inteiro a cada mudança"""
+    cue: Any = None
+    cue_level: float = 1.0
+    cue_triggers: int = 0
+    voices: Tuple = ()
+
+
+class AudioEngine:
+    """Executa os comandos de áudio em uma thread própria"""
+
+    def __init__(self, config: Dict, on_event: Optional[EventCallback] = None,
+                 queue_size: int = 256):
+        self.config = config
+        self.on_event = on_event or (lambda event, data: None)
+        self.state = EngineState()
+        self.audio_utils = None
+        self.cue_scheduler = None
+        self.metrics = get_metrics()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[Exception] = None
+        # Volumes pedidos pelo controle deslizante, aplicados só o mais recente de cada voz
+        self._pending_volumes: Dict[Hashable, float] = {}
+        self._volume_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Inicia a thread e aguarda a inicialização do mixer"""
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="AudioEngine", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread = None
+            raise Exception(f"Erro ao iniciar o motor de áudio: {str(self._error)}")
+
+    def stop(self) -> None:
+        """Executa os comandos já enviados e encerra a thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def post(self, fn: Callable, *args) -> Future:
+        """
+        Envia um comando à fila sem aguardar a execução
+
+        Args:
+            fn (Callable): Função executada na thread do motor
+
+        Returns:
+            Future: Resultado do comando
+        """
+        if self._thread is None:
+            raise Exception("Motor de áudio parado")
+        future = Future()
+        try:
+            self._queue.put((fn, args, future, time.perf_counter()), timeout=1.0)
+        except queue.Full:
+            raise Exception("Fila do motor de áudio cheia")
+        return future
+
+    def call(self, fn: Callable, *args, timeout: float = 5.0):
+        """
+        Executa um comando na thread do motor e aguarda o resultado
+
+        Args:
+            fn (Callable): Função executada na thread do motor
+            timeout (float): Espera máxima, em segundos
+
+        Returns:
+            Resultado da função (exceções são repassadas a quem chamou)
+        """
+        if threading.current_thread() is self._thread:
+            return fn(*args)
+        return self.post(fn, *args).result(timeout)
+
+    def send(self, fn: Callable, *args) -> None:
+        """Envia um comando sem aguardar; erros são apenas registrados"""
+        self.post(fn, *args).add_done_callback(self._report)
+
+    @staticmethod
+    def _report(future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            print(f"Erro no motor de áudio: {str(error)}")
+
+    # Comandos (executados na thread do motor)
+
+    def play_audio(self, file_path: str, volume: float) -> Optional[Future]:
+        """
+        Toca o arquivo interrompendo as deixas e as demais vozes
+
+        Veja play_voice: só o som já decodificado é aguardado.
+        """
+        def command():
+            self.cue_scheduler.stop()
+            self.audio_utils.play_audio(file_path, volume)
+        return self._play(None, file_path, command)
+
+    def play_voice(self, key: Hashable, file_path: str, volume: float,
+                   fade_in: float = 0.0, fade_out: float = 0.0) -> Optional[Future]:
+        """
+        Toca o arquivo em uma voz própria, com o envelope informado
+
+        Com o som no banco, o disparo tem custo limitado e é aguardado. Sem
+        ele, o streaming abre o arquivo na thread do motor, o que pode
+        demorar (disco lento, rede): o comando só é enfileirado e uma falha
+        chega aos ouvintes como o evento "voice_error".
+
+        Returns:
+            Optional[Future]: Conclusão do disparo por streaming, ou None
+            se o disparo já foi feito
+        """
+        return self._play(key, file_path, self.audio_utils.play_voice,
+                          key, file_path, volume, fade_in, fade_out)
+
+    def _play(self, key: Hashable, file_path: str, fn: Callable, *args) -> Optional[Future]:
+        if self.audio_utils.sound_bank.get(file_path) is not None:
+            self.call(fn, *args)
+            return None
+        future = self.post(fn, *args)
+        future.add_done_callback(lambda f: self._report_play(key, f))
+        return future
+
+    def _report_play(self, key: Hashable, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            self._emit("voice_error", {"key": key, "error": str(error)})
+
+    def stop_voice(self, key: Hashable, fade_ms: int = 0) -> None:
+        """Para a voz informada"""
+        self.call(self.audio_utils.stop_voice, key, fade_ms)
+
+    def set_voice_volume(self, key: Hashable, volume: float) -> None:
+        """
+        Ajusta o volume de uma voz, sem aguardar
+
+        Ajustes seguidos (um por passo do controle deslizante) são agrupados:
+        há no máximo um comando de volume na fila, que aplica o valor mais
+        recente de cada voz por uma rampa curta.
+        """
+        with self._volume_lock:
+            queued = bool(self._pending_volumes)
+            self._pending_volumes[key] = volume
+        if not queued:
+            try:
+                self.send(self._apply_volumes)
+            except Exception:
+                # Sem o comando na fila, os próximos ajustes precisam enviar outro
+                with self._volume_lock:
+                    self._pending_volumes.clear()
+                raise
+
+    def _apply_volumes(self) -> None:
+        with self._volume_lock:
+            pending, self._pending_volumes = self._pending_volumes, {}
+        for key, volume in pending.items():
+            self.audio_utils.set_volume(volume, key)
+
+    def stop_all(self, fade_ms: int = 0) -> None:
+        """Para as deixas e todas as vozes"""
+        def command():
+            self.cue_scheduler.stop(fade_ms)
+            self.audio_utils.stop_audio(fade_ms)
+        self.call(command)
+
+    def set_cues(self, tracks) -> None:
+        """Define as deixas do agendador"""
+        self.call(self.cue_scheduler.set_cues, tracks)
+
+    def go_next(self):
+        """Dispara a próxima deixa e retorna a faixa"""
+        def command():
+            self.cue_scheduler.go_next()
+            return self.cue_scheduler.current_cue
+        return self.call(command)
+
+    def go_to(self, sequence: int):
+        """Dispara a deixa de número informado e retorna a faixa"""
+        def command():
+            self.cue_scheduler.go_to(sequence)
+            return self.cue_scheduler.current_cue
+        return self.call(command)
+
+    def stop_cues(self, fade_ms: int = 0) -> None:
+        """Interrompe as deixas, mantendo as demais vozes"""
+        self.call(self.cue_scheduler.stop, fade_ms)
+
+    def set_cue_level(self, level: float) -> float:
+        """Ajusta o nível geral das deixas e retorna o nível aplicado"""
+        def command():
+            self.cue_scheduler.set_level(level)
+            return self.cue_scheduler.level
+        return self.call(command)
+
+    # Laço da thread
+
+    def _setup(self) -> None:
+        """Cria o mixer e o agendador na própria thread do motor"""
+        from utils.audio_handler import AudioUtils
+        from utils.cue_scheduler import CueScheduler
+
+        config = self.config
+        audio_utils = AudioUtils(
+            config.get("sound_bank_mb", 256),
+            config.get("mixer_voices", 8),
+            config.get("voice_steal_policy", "oldest"),
+            config.get("loudness_normalization", True),
+            config.get("prerender", True),
+            config.get("volume_ramp_ms", 30)
+        )
+        self.cue_scheduler = CueScheduler(
+            audio_utils.sound_bank,
+            crossfade_ms=config.get("cue_crossfade_ms", 0),
+            auto_follow=config.get("cue_auto_follow", True),
+            volume_for=audio_utils.effective_volume,
+            ramps=audio_utils.mixer.ramps,
+            volume_ramp_ms=config.get("volume_ramp_ms", 30),
+            duck_ramp_ms=config.get("duck_ramp_ms", 200)
+        )
+        self.audio_utils = audio_utils
+
+    def _run(self) -> None:
+        try:
+            self._setup()
+        except Exception as e:
+            self._error = e
+            return
+        finally:
+            self._ready.set()
+
+        while True:
+            # Parado, espera o próximo comando; tocando, acorda para acompanhar
+            try:
+                playing = (self.state.cue is not None or bool(self.state.voices)
+                           or self.audio_utils.mixer.ramps.active)
+            except Exception as e:
+                print(f"Erro no motor de áudio: {str(e)}")
+                playing = True
+            try:
+                item = self._queue.get(timeout=POLL_INTERVAL if playing else None)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item:
+                self._execute(*item)
+            else:
+                self._poll()
+
+    def _execute(self, fn: Callable, args: tuple, future: Future, queued_at: float) -> None:
+        """Executa um comando da fila, publica o novo estado e entrega o resultado"""
+        self.metrics.record("engine.queue_wait", (time.perf_counter() - queued_at) * 1000)
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, e
+        # Quem aguarda o comando já deve ler o estado resultante dele
+        self._poll()
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def _poll(self) -> None:
+        """Acompanha a reprodução; um erro é registrado sem derrubar a thread"""
+        try:
+            self._advance()
+        except Exception as e:
+            print(f"Erro ao acompanhar a reprodução: {str(e)}")
+
+    def _advance(self) -> None:
+        """Avança deixas, rampas e envelopes, recolhe as vozes encerradas e publica o estado"""
+        scheduler = self.cue_scheduler
+        mixer = self.audio_utils.mixer
+        if scheduler.is_playing:
+            try:
+                scheduler.poll()
+            except Exception as e:
+                print(f"Erro ao avançar deixas: {str(e)}")
+
+        previous = self.state
+        voices = tuple(mixer.active_keys())
+        # A deixa abaixa enquanto houver vozes tocando por cima
+        scheduler.set_ducked(bool(voices))
+        mixer.tick()
+        state = EngineState(scheduler.current_cue, scheduler.level, scheduler.trigger_count, voices)
+        if state == previous:
+            return
+        self.state = state
+
+        if state.cue_triggers != previous.cue_triggers and state.cue is not None:
+            self._emit("cue", {"cue": state.cue})
+        elif previous.cue is not None and state.cue is None:
+            self._emit("stopped", {})
+        if state.cue_level != previous.cue_level:
+            self._emit("level", {"level": state.cue_level})
+        for key in previous.voices:
+            if key not in voices:
+                self._emit("voice_ended", {"key": key})
+
+    def _emit(self, event: str, data: Dict) -> None:
+        try:
+            self.on_event(event, data)
+        except Exception as e:
+            print(f"Erro ao notificar evento {event}: {str(e)}")
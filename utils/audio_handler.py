@@ -7,54 +7,157 @@ Data: 04/12/2023
 Utilitário para manipulação de arquivos de áudio.
 """
 # utils/audio_handler.py
-import ffmpeg
-import json
-from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Callable, List, Optional
 import pygame.mixer
-import threading
-import time
+from utils.sound_bank import SoundBank
+from utils.mixer_engine import MixerEngine, STEAL_OLDEST
+from utils.media_probe import get_media_probe
+from utils.loudness import get_loudness_analyzer
+from utils.transcoder import get_transcoder
 
 class AudioUtils:
     """Classe utilitária para manipulação de áudio"""
 
-    def __init__(self):
+    def __init__(self, sound_bank_mb: int = 256, num_voices: int = 8,
+                 steal_policy: str = STEAL_OLDEST, normalize: bool = True,
+                 prerender: bool = True, volume_ramp_ms: int = 30):
         pygame.mixer.init()
         self.current_playing = None
-        self.is_playing = False
+        frequency, _, channels = pygame.mixer.get_init()
+        self.transcoder = get_transcoder(frequency, channels)
+        self.prerender = prerender
+        self.sound_bank = SoundBank(sound_bank_mb, self.transcoder.resolve)
+        self.mixer = MixerEngine(num_voices, steal_policy, volume_ramp_ms)
+        self.normalize = normalize
+        self.loudness = get_loudness_analyzer()
+
+    def effective_volume(self, file_path: str, volume: float) -> float:
+        """
+        Aplica o ganho de normalização de loudness ao volume da faixa
+
+        Args:
+            file_path (str): Caminho do arquivo
+            volume (float): Volume escolhido pelo operador
+
+        Returns:
+            float: Volume a enviar ao mixer (0.0 a 1.0)
+        """
+        if not self.normalize:
+            return volume
+        return max(0.0, min(1.0, volume * self.loudness.gain_for(file_path)))
+
+    def analyze_loudness(self, file_paths: List[str]) -> None:
+        """
+        Mede em segundo plano a loudness das faixas para normalização
+
+        Args:
+            file_paths (List[str]): Caminhos dos arquivos
+        """
+        if self.normalize:
+            self.loudness.analyze_in_background(file_paths)
+
+    def set_trims(self, tracks) -> None:
+        """
+        Aplica os pontos de corte das faixas aos sons do banco
+
+        Args:
+            tracks (Iterable[Track]): Faixas com start_offset e end_offset
+        """
+        for track in tracks:
+            if track.file_path:
+                self.sound_bank.set_trim(track.file_path, track.start_offset, track.end_offset)
+
+    @property
+    def is_playing(self) -> bool:
+        """Indica se alguma voz está soando"""
+        return bool(self.mixer.active_keys())
+
+    def preload(self, file_paths: List[str]) -> None:
+        """
+        Decodifica em segundo plano as faixas que poderão ser disparadas
+
+        Args:
+            file_paths (List[str]): Caminhos dos arquivos
+        """
+        self.sound_bank.preload(file_paths)
+
+        # Deixa pronta a versão no formato do mixer para os próximos carregamentos
+        if self.prerender:
+            self.transcoder.render_in_background(file_paths)
 
     def play_audio(self, file_path: str, volume: float) -> None:
         """
-        Reproduz um arquivo de áudio
+        Reproduz um arquivo de áudio, interrompendo as demais vozes
 
         Args:
             file_path (str): Caminho do arquivo
             volume (float): Volume da reprodução
         """
         try:
-            if self.current_playing:
-                pygame.mixer.music.stop()
-                self.is_playing = False
-
-            pygame.mixer.music.load(file_path)
-            pygame.mixer.music.set_volume(volume)
-            pygame.mixer.music.play()
+            self.mixer.stop_all()
+            self.play_voice(None, file_path, volume)
             self.current_playing = file_path
-            self.is_playing = True
+        except Exception as e:
+            raise Exception(f"Erro ao reproduzir áudio: {str(e)}")
+
+    def play_voice(self, key, file_path: str, volume: float,
+                   fade_in: float = 0.0, fade_out: float = 0.0) -> None:
+        """
+        Reproduz um arquivo em uma voz própria, junto com as demais
 
+        Args:
+            key: Identificador da voz (ex.: linha da playlist)
+            file_path (str): Caminho do arquivo
+            volume (float): Volume da reprodução
+            fade_in (float): Entrada gradual, em segundos
+            fade_out (float): Saída gradual antes do fim, em segundos
+        """
+        try:
+            # Som já decodificado toca direto da memória; o restante vai por streaming
+            self.mixer.play(
+                key,
+                file_path,
+                self.effective_volume(file_path, volume),
+                self.sound_bank.get(file_path),
+                self.transcoder.resolve(file_path),
+                self.sound_bank.trim_for(file_path)[0],
+                fade_in,
+                fade_out
+            )
         except Exception as e:
             raise Exception(f"Erro ao reproduzir áudio: {str(e)}")
 
-    def stop_audio(self) -> None:
-        """Para a reprodução do áudio atual"""
+    def stop_voice(self, key, fade_ms: int = 0) -> None:
+        """Para a voz informada, opcionalmente com saída gradual"""
         try:
-            if self.is_playing:
-                pygame.mixer.music.stop()
-                self.is_playing = False
-                self.current_playing = None
+            self.mixer.stop(key, fade_ms)
         except Exception as e:
             raise Exception(f"Erro ao parar áudio: {str(e)}")
 
+    def is_voice_playing(self, key) -> bool:
+        """Indica se a voz informada está soando"""
+        return self.mixer.is_playing(key)
+
+    def stop_audio(self, fade_ms: int = 0) -> None:
+        """Para a reprodução de todas as vozes, opcionalmente com saída gradual"""
+        try:
+            self.mixer.stop_all(fade_ms)
+            self.current_playing = None
+        except Exception as e:
+            raise Exception(f"Erro ao parar áudio: {str(e)}")
+
+    def set_volume(self, volume: float, key=None) -> None:
+        """
+        Ajusta o volume de uma voz em reprodução
+
+        Args:
+            volume (float): Volume (0.0 a 1.0)
+            key: Identificador da voz (padrão: a voz de play_audio)
+        """
+        voice = self.mixer.get_voice(key)
+        if voice is not None:
+            self.mixer.set_volume(key, self.effective_volume(voice.file_path, volume))
+
     @staticmethod
     def validate_audio_file(file_path: str) -> bool:
         """
@@ -66,26 +169,41 @@ class AudioUtils:
         Returns:
             bool: True se válido, False caso contrário
         """
-        try:
-            probe = ffmpeg.probe(file_path)
-            return 'audio' in probe['streams'][0]['codec_type']
-        except Exception:
-            return False
+        return AudioUtils.validate_audio_files([file_path])[file_path]
+
+    @staticmethod
+    def validate_audio_files(file_paths: List[str],
+                             should_cancel: Optional[Callable[[], bool]] = None) -> Dict[str, bool]:
+        """
+        Valida vários arquivos de áudio em paralelo, usando o cache de sondagem
+
+        Args:
+            file_paths (List[str]): Caminhos dos arquivos
+            should_cancel (Callable, opcional): Interrompe a validação quando
+                retornar True
+
+        Returns:
+            Dict[str, bool]: Resultado da validação por caminho
+        """
+        results = get_media_probe().probe_many(file_paths, should_cancel)
+        return {path: info is not None for path, info in results.items()}
 
     @staticmethod
-    def adjust_volume(file_path: str, volume: float) -> None:
+    def adjust_volume(file_path: str, volume: float) -> str:
         """
-        Ajusta o volume do arquivo de áudio
+        Gera uma cópia do arquivo com o volume ajustado
+
+        A cópia fica no cache de renderização e é reaproveitada enquanto o
+        arquivo de origem e o volume não mudarem.
 
         Args:
             file_path (str): Caminho do arquivo
             volume (float): Valor do volume (0.0 a 2.0)
+
+        Returns:
+            str: Caminho do arquivo renderizado
         """
         try:
-            stream = ffmpeg.input(file_path)
-            stream = ffmpeg.filter(stream, 'volume', volume=volume)
-            stream = ffmpeg.output(stream, f"temp_{Path(file_path).name}")
-            ffmpeg.run(stream, overwrite_output=True)
+            return get_transcoder().render(file_path, volume)
         except Exception as e:
             raise Exception(f"Erro ao ajustar volume: {str(e)}")
-
@@ -5,7 +5,9 @@ Versão 1.0.0
 """
 import json
 import os
+import threading
 from pathlib import Path
+from utils.atomic_io import atomic_write_json
 
 class ConfigManager:
     """Gerencia as configurações do sistema"""
@@ -14,7 +16,42 @@ class ConfigManager:
         self.config_file = "setup.json"
         self.default_config = {
             "playlist_directory": str(Path.home() / "Documents" / "PlaylistManager"),
-            "playlist_file": "playlists.json"
+            "playlist_file": "playlists.json",
+            "playlist_storage_dir": "playlists",
+            "playlist_cache_size": 64,
+            "storage_format": "json",
+            "storage_backend": "files",
+            "autosave": True,
+            "autosave_delay_ms": 1000,
+            "library_directories": [],
+            "library_extensions": [".mp3", ".wav", ".ogg", ".flac", ".m4a", ".aac"],
+            "library_workers": 4,
+            "waveforms": True,
+            "peak_workers": 0,
+            "sound_bank_mb": 256,
+            "probe_workers": 4,
+            "cue_crossfade_ms": 0,
+            "cue_auto_follow": True,
+            "mixer_voices": 8,
+            "voice_steal_policy": "oldest",
+            "engine_queue_size": 256,
+            "volume_ramp_ms": 30,
+            "duck_ramp_ms": 200,
+            "stop_fade_ms": 0,
+            "loudness_normalization": True,
+            "loudness_target_lufs": -16.0,
+            "analysis_workers": 0,
+            "silence_trim": True,
+            "silence_threshold_db": -50.0,
+            "silence_padding_ms": 10,
+            "metrics_enabled": False,
+            "remote_control": False,
+            "remote_host": "127.0.0.1",
+            "remote_port": 7890,
+            "remote_token": "",
+            "prerender": True,
+            "render_cache_mb": 2048,
+            "render_workers": 0
         }
         self.config = self.load_config()
 
@@ -34,8 +71,7 @@ class ConfigManager:
     def save_config(self, config):
         """Salva as configurações no arquivo setup.json"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+            atomic_write_json(self.config_file, config, indent=4)
         except Exception as e:
             print(f"Erro ao salvar configurações: {str(e)}")
 
@@ -47,4 +83,43 @@ class ConfigManager:
         # Cria o diretório se não existir
         os.makedirs(directory, exist_ok=True)
 
-        return os.path.join(directory, filename)
\ No newline at end of file
+        return os.path.join(directory, filename)
+
+    def get_storage_directory(self):
+        """Retorna o diretório onde cada playlist é gravada em um arquivo próprio"""
+        directory = self.config.get("playlist_directory", self.default_config["playlist_directory"])
+        storage_dir = self.config.get("playlist_storage_dir", self.default_config["playlist_storage_dir"])
+
+        path = os.path.join(directory, storage_dir)
+        os.makedirs(path, exist_ok=True)
+
+        return path
+
+    def get_library_path(self):
+        """Retorna o caminho do banco SQLite da biblioteca"""
+        directory = self.config.get("playlist_directory", self.default_config["playlist_directory"])
+        os.makedirs(directory, exist_ok=True)
+
+        return os.path.join(directory, "library.sqlite3")
+
+    def get_cache_directory(self):
+        """Retorna o diretório dos caches de metadados de mídia"""
+        directory = self.config.get("playlist_directory", self.default_config["playlist_directory"])
+
+        path = os.path.join(directory, "cache")
+        os.makedirs(path, exist_ok=True)
+
+        return path
+
+
+_shared_config = None
+_shared_lock = threading.Lock()
+
+
+def get_config_manager():
+    """Retorna a instância de ConfigManager compartilhada pelo aplicativo"""
+    global _shared_config
+    with _shared_lock:
+        if _shared_config is None:
+            _shared_config = ConfigManager()
+        return _shared_config
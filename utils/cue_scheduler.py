@@ -0,0 +1,367 @@
+# utils/cue_scheduler.py
+"""
+Gerenciador de Playlist - Agendador de Deixas
+Versão 1.0.0
+
+Encadeia as faixas da playlist pela sequência, deixando a próxima deixa
+armada enquanto a atual toca, para emendar sem intervalo ou com crossfade.
+Aplica o envelope de cada faixa: entrada e saída graduais e abaixamento
+enquanto outra voz toca por cima.
+"""
+# utils/cue_scheduler.py
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+import pygame.mixer
+from utils.metrics import get_metrics
+from utils.mixer_engine import RESERVED_CHANNELS, VolumeRamps, music_stream, play_stream
+
+
+class CueScheduler:
+    """Dispara as deixas em ordem, com a seguinte pré-carregada"""
+
+    def __init__(self, sound_bank, crossfade_ms: int = 0, auto_follow: bool = True,
+                 volume_for: Optional[Callable[[str, float], float]] = None,
+                 ramps: Optional[VolumeRamps] = None, volume_ramp_ms: int = 30,
+                 duck_ramp_ms: int = 200):
+        self.sound_bank = sound_bank
+        self.volume_for = volume_for or (lambda file_path, volume: volume)
+        self.crossfade_ms = max(0, int(crossfade_ms))
+        self.auto_follow = auto_follow
+        # Nível geral das deixas, aplicado no canal sobre o volume de cada faixa
+        self.level = 1.0
+        self.ramps = ramps or VolumeRamps()
+        self.volume_ramp_ms = max(0, int(volume_ramp_ms))
+        self.duck_ramp_ms = max(0, int(duck_ramp_ms))
+        self._ducked = False
+        self._fading = False
+        self.cues: List = []
+        self.current_index: Optional[int] = None
+        # Incrementado a cada deixa iniciada, inclusive quando a mesma é redisparada
+        self.trigger_count = 0
+        self.trigger_latencies = deque(maxlen=200)
+        self.gap_latencies = deque(maxlen=200)
+        # Atraso do poll em perceber a emenda feita pelo mixer (não é silêncio)
+        self.handoff_latencies = deque(maxlen=200)
+        self._channels = None
+        self._active = 0
+        self._streaming = False
+        self._armed: Optional[tuple] = None
+        self._queued = False
+        self._started_at = 0.0
+        self._length = 0.0
+        self._lock = threading.Lock()
+
+    def _channel_pair(self):
+        """Usa os dois canais reservados do mixer, alternados no crossfade"""
+        if self._channels is None:
+            pygame.mixer.set_reserved(RESERVED_CHANNELS)
+            self._channels = (pygame.mixer.Channel(0), pygame.mixer.Channel(1))
+        return self._channels
+
+    @property
+    def is_playing(self) -> bool:
+        """Indica se há uma deixa em reprodução"""
+        return self.current_index is not None
+
+    @property
+    def current_cue(self):
+        """Faixa da deixa atual, ou None"""
+        if self.current_index is None:
+            return None
+        return self.cues[self.current_index]
+
+    def set_cues(self, tracks: List) -> None:
+        """
+        Define as deixas a partir das faixas da playlist
+
+        Args:
+            tracks (List[Track]): Faixas, ordenadas aqui por sequência
+        """
+        self.stop()
+        self.cues = sorted(tracks, key=lambda t: t.sequence)
+
+    def go_next(self) -> None:
+        """Dispara a deixa seguinte à atual (ou a primeira)"""
+        index = 0 if self.current_index is None else self.current_index + 1
+        if index >= len(self.cues):
+            raise Exception("Não há próxima deixa")
+        self._start(index, self.crossfade_ms if self.is_playing else 0)
+
+    def go_to(self, sequence: int) -> None:
+        """
+        Dispara a deixa de número informado
+
+        Args:
+            sequence (int): Sequência da faixa na playlist
+        """
+        for index, cue in enumerate(self.cues):
+            if cue.sequence == sequence:
+                self._start(index, 0)
+                return
+        raise Exception(f"Deixa {sequence} não encontrada")
+
+    def set_level(self, level: float) -> None:
+        """
+        Ajusta o nível geral das deixas, inclusive da que está tocando
+
+        Args:
+            level (float): Nível (0.0 a 1.0)
+        """
+        self.level = min(1.0, max(0.0, float(level)))
+        self._apply_level(self.volume_ramp_ms)
+
+    def set_ducked(self, ducked: bool) -> None:
+        """
+        Abaixa a deixa atual ao seu duck_level enquanto outra voz toca
+
+        Args:
+            ducked (bool): True enquanto houver vozes tocando por cima
+        """
+        if ducked != self._ducked:
+            self._ducked = ducked
+            self._apply_level(self.duck_ramp_ms)
+
+    def _channel_level(self, cue) -> float:
+        """Volume do canal da deixa: nível geral e, se abaixada, o duck_level da faixa"""
+        return self.level * (cue.duck_level if self._ducked else 1.0)
+
+    def _apply_level(self, ramp_ms: int) -> None:
+        """Leva o volume da deixa em reprodução ao nível atual por uma rampa"""
+        if self.current_index is None:
+            return
+        cue = self.cues[self.current_index]
+        if self._streaming:
+            target = pygame.mixer.music
+            end = self.volume_for(cue.file_path, cue.volume) * self._channel_level(cue)
+        else:
+            target = self._channel_pair()[self._active]
+            end = self._channel_level(cue)
+        self.ramps.start(target, target.set_volume, target.get_volume(), end, ramp_ms)
+
+    def stop(self, fade_ms: int = 0) -> None:
+        """
+        Interrompe a deixa atual e descarta a próxima armada
+
+        Args:
+            fade_ms (int): Saída gradual, em milissegundos (0 corta na hora)
+        """
+        if self._channels is not None:
+            for channel in self._channels:
+                self.ramps.cancel(channel)
+                if fade_ms > 0:
+                    channel.fadeout(fade_ms)
+                else:
+                    channel.stop()
+        if self._streaming and music_stream.release(self):
+            self.ramps.cancel(pygame.mixer.music)
+            if fade_ms > 0:
+                pygame.mixer.music.fadeout(fade_ms)
+            else:
+                pygame.mixer.music.stop()
+        self._streaming = False
+        self._queued = False
+        self.current_index = None
+        with self._lock:
+            self._armed = None
+
+    def _sound_for(self, index: int):
+        """Obtém o som decodificado da deixa, carregando se necessário"""
+        path = self.cues[index].file_path
+        sound = self.sound_bank.get(path)
+        if sound is None and not self.sound_bank.is_streaming(path):
+            sound = self.sound_bank.load(path)
+        return sound
+
+    def _start(self, index: int, fade_ms: int, expected_start: Optional[float] = None) -> None:
+        """Inicia a deixa, cortando ou fazendo crossfade com a atual"""
+        t0 = time.perf_counter()
+        cue = self.cues[index]
+
+        with self._lock:
+            armed = self._armed
+            self._armed = None
+        # Sem decodificar na hora do disparo: o que não estiver pronto vai por streaming
+        sound = armed[1] if armed and armed[0] == index else self.sound_bank.get(cue.file_path)
+
+        channels = self._channel_pair()
+        outgoing = channels[self._active]
+        for channel in channels:
+            self.ramps.cancel(channel)
+        self.ramps.cancel(pygame.mixer.music)
+        if fade_ms and not self._streaming:
+            outgoing.fadeout(fade_ms)
+            self._active = 1 - self._active
+        else:
+            for channel in channels:
+                channel.stop()
+        if self._streaming and music_stream.release(self):
+            pygame.mixer.music.stop()
+        self._streaming = False
+        self._queued = False
+        self._fading = False
+        # A entrada da faixa pode ser mais longa que o crossfade
+        fade_in_ms = max(fade_ms, int(cue.fade_in * 1000))
+
+        if sound is not None:
+            sound.set_volume(self.volume_for(cue.file_path, cue.volume))
+            channel = channels[self._active]
+            channel.set_volume(self._channel_level(cue))
+            channel.play(sound, fade_ms=fade_in_ms)
+            self._streaming = False
+            self._length = sound.get_length()
+        else:
+            # Arquivo grande demais para o banco: usa o streaming do mixer,
+            # interrompendo a voz que o estivesse usando
+            music_stream.acquire(self, self._stream_stolen)
+            pygame.mixer.music.load(self.sound_bank.resolver(cue.file_path))
+            pygame.mixer.music.set_volume(
+                self.volume_for(cue.file_path, cue.volume) * self._channel_level(cue)
+            )
+            play_stream(self.sound_bank.trim_for(cue.file_path)[0], fade_in_ms)
+            self._streaming = True
+            self._length = 0.0
+
+        now = time.perf_counter()
+        self.trigger_latencies.append((now - t0) * 1000)
+        get_metrics().record("cue.trigger", self.trigger_latencies[-1])
+        if expected_start is not None:
+            self.gap_latencies.append(max(0.0, now - expected_start) * 1000)
+            get_metrics().record("cue.gap", self.gap_latencies[-1])
+
+        self.current_index = index
+        self.trigger_count += 1
+        self._started_at = now
+        self._arm(index + 1)
+
+    def _stream_stolen(self) -> None:
+        """Uma voz tomou o streaming: a deixa que o usava está encerrada"""
+        if self._streaming:
+            self.ramps.cancel(pygame.mixer.music)
+            self._streaming = False
+            self.stop()
+
+    def _arm(self, index: int) -> None:
+        """Prepara a próxima deixa em segundo plano"""
+        if index >= len(self.cues):
+            return
+
+        def worker():
+            try:
+                sound = self._sound_for(index)
+            except Exception as e:
+                print(f"Erro ao armar deixa: {str(e)}")
+                return
+            with self._lock:
+                if self.current_index == index - 1:
+                    self._armed = (index, sound)
+
+        threading.Thread(target=worker, name="CueArm", daemon=True).start()
+
+    def _queue_armed(self) -> None:
+        """Enfileira a próxima deixa no canal atual para emenda sem intervalo"""
+        with self._lock:
+            armed = self._armed
+        if self._streaming or self._queued or armed is None or armed[1] is None:
+            return
+        index, sound = armed
+        # A fila do canal não faz fades: faixas com envelope são disparadas no poll
+        if self.cues[self.current_index].fade_out or self.cues[index].fade_in:
+            return
+        channel = self._channel_pair()[self._active]
+        if channel.get_busy():
+            cue = self.cues[index]
+            sound.set_volume(self.volume_for(cue.file_path, cue.volume))
+            channel.queue(sound)
+            self._queued = True
+
+    def poll(self) -> bool:
+        """
+        Acompanha a reprodução; deve ser chamado periodicamente
+
+        Returns:
+            bool: True se a deixa atual mudou
+        """
+        if self.current_index is None:
+            return False
+
+        now = time.perf_counter()
+        expected_end = self._started_at + self._length
+        channel = self._channel_pair()[self._active]
+
+        # A deixa enfileirada assumiu o canal: a emenda foi feita pelo mixer
+        if self._queued and channel.get_queue() is None:
+            self._queued = False
+            # A fila do canal emenda na amostra seguinte: não há intervalo
+            # audível. O que se mede aqui é o atraso do poll em perceber a troca
+            self.gap_latencies.append(0.0)
+            get_metrics().record("cue.gap", 0.0)
+            self.handoff_latencies.append(max(0.0, now - expected_end) * 1000)
+            get_metrics().record("cue.handoff_detect", self.handoff_latencies[-1])
+            with self._lock:
+                armed = self._armed
+                self._armed = None
+            self.current_index += 1
+            self.trigger_count += 1
+            self._started_at = expected_end
+            self._length = armed[1].get_length() if armed else 0.0
+            self._fading = False
+            self._apply_level(self.volume_ramp_ms)
+            self._arm(self.current_index + 1)
+            return True
+
+        has_next = self.current_index + 1 < len(self.cues)
+
+        if self.auto_follow and has_next and not self.crossfade_ms:
+            self._queue_armed()
+
+        if self.auto_follow and has_next and self.crossfade_ms and not self._streaming:
+            if expected_end - now <= self.crossfade_ms / 1000:
+                self._start(self.current_index + 1, self.crossfade_ms, expected_end)
+                return True
+
+        # Saída gradual da faixa: começa fade_out segundos antes do fim do som
+        fade_out = self.cues[self.current_index].fade_out
+        if fade_out and not self._fading and not self._streaming and self._length:
+            remaining = expected_end - now
+            if remaining <= fade_out:
+                channel.fadeout(max(1, int(remaining * 1000)))
+                self._fading = True
+
+        busy = pygame.mixer.music.get_busy() if self._streaming else channel.get_busy()
+        if busy:
+            return False
+
+        if self.auto_follow and has_next:
+            self._start(self.current_index + 1, 0, expected_end if not self._streaming else now)
+        else:
+            self.stop()
+        return True
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna estatísticas de latência das deixas em milissegundos
+
+        Returns:
+            Dict: trigger_ms (chamada até o início da reprodução), gap_ms
+            (fim da deixa anterior até o início da seguinte; 0 na emenda pela
+            fila do canal) e handoff_detect_ms (fim previsto da deixa até o
+            poll perceber a emenda feita pelo mixer)
+        """
+        def summary(values):
+            values = list(values)
+            if not values:
+                return {"count": 0, "last": 0.0, "mean": 0.0, "max": 0.0}
+            return {
+                "count": len(values),
+                "last": values[-1],
+                "mean": sum(values) / len(values),
+                "max": max(values)
+            }
+
+        return {
+            "trigger_ms": summary(self.trigger_latencies),
+            "gap_ms": summary(self.gap_latencies),
+            "handoff_detect_ms": summary(self.handoff_latencies)
+        }
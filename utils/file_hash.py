@@ -0,0 +1,48 @@
+# utils/file_hash.py
+"""
+Gerenciador de Playlist - Hash de Arquivos
+Versão 1.0.0
+
+Calcula o hash do conteúdo dos arquivos de áudio, usado como chave dos
+caches de análise. O resultado é memorizado por caminho, tamanho e data
+de modificação para não reler arquivos inalterados.
+"""
+# utils/file_hash.py
+import hashlib
+import os
+import threading
+from typing import Dict, Tuple
+
+_CHUNK_SIZE = 1024 * 1024
+
+_memo: Dict[str, Tuple[int, int, str]] = {}
+_memo_lock = threading.Lock()
+
+
+def content_hash(file_path: str) -> str:
+    """
+    Retorna o SHA-1 do conteúdo do arquivo
+
+    Args:
+        file_path (str): Caminho do arquivo
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+
+    with _memo_lock:
+        entry = _memo.get(path)
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    result = digest.hexdigest()
+
+    with _memo_lock:
+        _memo[path] = (st.st_size, st.st_mtime_ns, result)
+    return result
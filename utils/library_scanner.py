@@ -0,0 +1,217 @@
+# utils/library_scanner.py
+"""
+Gerenciador de Playlist - Biblioteca de Mídia
+Versão 1.0.0
+
+Percorre os diretórios configurados, sonda os arquivos de áudio novos ou
+alterados com o MediaProbe e mantém um manifesto em disco, indexado por
+caminho, tamanho e data de modificação. Uma nova varredura só sonda os
+arquivos que mudaram desde a anterior.
+"""
+# utils/library_scanner.py
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from utils.atomic_io import atomic_write_json
+from utils.config_manager import get_config_manager
+from utils.media_probe import MediaProbe, get_media_probe
+
+DEFAULT_EXTENSIONS = (".mp3", ".wav", ".ogg", ".flac", ".m4a", ".aac")
+
+ProgressCallback = Callable[[int, int], None]
+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class LibraryEntry:
+    """Um arquivo da biblioteca"""
+    path: str
+    size: int
+    mtime_ns: int
+    info: Optional[Dict]
+
+    @property
+    def valid(self) -> bool:
+        """Indica se o arquivo contém áudio reconhecido pelo ffprobe"""
+        return self.info is not None
+
+    @property
+    def name(self) -> str:
+        """Nome do arquivo sem a extensão"""
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duração em segundos, se conhecida"""
+        return self.info.get("duration") if self.info else None
+
+
+class LibraryScanner:
+    """Varre diretórios de mídia e mantém o manifesto da biblioteca"""
+
+    def __init__(self, manifest_file: str, probe: MediaProbe,
+                 extensions: Iterable[str] = DEFAULT_EXTENSIONS, max_workers: int = 4):
+        self.manifest_file = manifest_file
+        self.probe = probe
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.max_workers = max(1, int(max_workers))
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, LibraryEntry]] = None
+
+    def _load_manifest(self) -> Dict[str, LibraryEntry]:
+        """Lê o manifesto do disco na primeira utilização"""
+        if self._entries is None:
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    files = json.load(f).get("files", {})
+                self._entries = {
+                    path: LibraryEntry(path, e["size"], e["mtime_ns"], e["info"])
+                    for path, e in files.items()
+                }
+            except (FileNotFoundError, ValueError, KeyError):
+                self._entries = {}
+        return self._entries
+
+    def save_manifest(self) -> None:
+        """Grava o manifesto no disco"""
+        with self._lock:
+            files = {
+                path: {"size": e.size, "mtime_ns": e.mtime_ns, "info": e.info}
+                for path, e in self._load_manifest().items()
+            }
+        try:
+            atomic_write_json(self.manifest_file, {"version": 1, "files": files},
+                              ensure_ascii=False)
+        except Exception as e:
+            print(f"Erro ao salvar manifesto da biblioteca: {str(e)}")
+
+    def entries(self) -> List[LibraryEntry]:
+        """Arquivos da biblioteca, ordenados pelo caminho"""
+        with self._lock:
+            return sorted(self._load_manifest().values(), key=lambda e: e.path)
+
+    def get(self, path: str) -> Optional[LibraryEntry]:
+        """Registro do arquivo na biblioteca, se houver"""
+        with self._lock:
+            return self._load_manifest().get(os.path.abspath(path))
+
+    def _walk(self, directory: str) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+        """
+        Lista os arquivos de áudio e os subdiretórios de um diretório
+
+        Returns:
+            Tuple: caminho -> (tamanho, mtime) e a lista de diretórios percorridos
+        """
+        files: Dict[str, Tuple[int, int]] = {}
+        directories: List[str] = []
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            directories.append(current)
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.name.lower().endswith(self.extensions):
+                                st = entry.stat()
+                                files[entry.path] = (st.st_size, st.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Erro ao ler diretório {current}: {str(e)}")
+        return files, directories
+
+    def scan(self, directories: Iterable[str],
+             should_cancel: Optional[Callable[[], bool]] = None,
+             progress: Optional[ProgressCallback] = None) -> Dict:
+        """
+        Varre os diretórios e sonda apenas os arquivos novos ou alterados
+
+        Args:
+            directories (Iterable[str]): Diretórios da biblioteca
+            should_cancel (Callable, opcional): Interrompe a varredura
+                quando retornar True
+            progress (Callable, opcional): Recebe (sondados, total a sondar)
+
+        Returns:
+            Dict: Quantidades added, changed, removed, unchanged e invalid, e
+            a lista directories com todos os diretórios percorridos
+        """
+        roots = [os.path.abspath(d) for d in dict.fromkeys(directories) if os.path.isdir(d)]
+        seen: Dict[str, Tuple[int, int]] = {}
+        walked: List[str] = []
+        if roots:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(roots))) as executor:
+                for files, dirs in executor.map(self._walk, roots):
+                    seen.update(files)
+                    walked.extend(dirs)
+
+        with self._lock:
+            manifest = self._load_manifest()
+            added = [p for p in seen if p not in manifest]
+            changed = [p for p in seen if p in manifest and
+                       (manifest[p].size, manifest[p].mtime_ns) != seen[p]]
+            prefixes = tuple(os.path.join(r, "") for r in roots)
+            removed = [p for p in manifest if p.startswith(prefixes) and p not in seen]
+            for path in removed:
+                del manifest[path]
+
+        to_probe = added + changed
+        done = 0
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self.probe.probe, p): p for p in to_probe}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    size, mtime_ns = seen[path]
+                    entry = LibraryEntry(path, size, mtime_ns, future.result())
+                    with self._lock:
+                        self._load_manifest()[path] = entry
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(to_probe))
+                    if should_cancel is not None and should_cancel():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+            self.probe.save_cache()
+
+        if to_probe or removed:
+            self.save_manifest()
+
+        with self._lock:
+            invalid = sum(1 for p in to_probe if p in self._entries and not self._entries[p].valid)
+        return {
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+            "unchanged": len(seen) - len(to_probe),
+            "invalid": invalid,
+            "directories": walked
+        }
+
+
+_default_scanner: Optional[LibraryScanner] = None
+_default_lock = threading.Lock()
+
+
+def get_library_scanner() -> LibraryScanner:
+    """Retorna a instância compartilhada de LibraryScanner"""
+    global _default_scanner
+    with _default_lock:
+        if _default_scanner is None:
+            config_manager = get_config_manager()
+            _default_scanner = LibraryScanner(
+                os.path.join(config_manager.get_cache_directory(), "library.json"),
+                get_media_probe(),
+                config_manager.config.get("library_extensions", DEFAULT_EXTENSIONS),
+                config_manager.config.get("library_workers", 4)
+            )
+        return _default_scanner
@@ -0,0 +1,175 @@
+# utils/loudness.py
+"""
+Gerenciador de Playlist - Análise de Loudness
+Versão 1.0.0
+
+Mede a loudness integrada (EBU R128) de cada arquivo com o filtro ebur128
+do ffmpeg e guarda o resultado em cache, indexado pelo hash do conteúdo.
+O ganho de normalização é aplicado no volume de reprodução, sem recodificar
+o arquivo.
+"""
+# utils/loudness.py
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Optional
+import ffmpeg
+from utils.atomic_io import atomic_write_json
+from utils.config_manager import get_config_manager
+from utils.file_hash import content_hash
+
+_INTEGRATED_RE = re.compile(r"I:\s+(-?\d+(?:\.\d+)?)\s+LUFS")
+
+
+class LoudnessAnalyzer:
+    """Mede a loudness dos arquivos e calcula o ganho de normalização"""
+
+    def __init__(self, cache_file: str, target_lufs: float = -16.0, max_workers: int = 0):
+        self.cache_file = cache_file
+        self.target_lufs = float(target_lufs)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, float]] = None
+        self._gains: Dict[str, float] = {}
+
+    def _load_cache(self) -> Dict[str, float]:
+        """Lê o cache hash -> LUFS na primeira utilização"""
+        if self._entries is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def save_cache(self) -> None:
+        """Grava o cache de loudness no disco"""
+        with self._lock:
+            entries = dict(self._load_cache())
+        try:
+            atomic_write_json(self.cache_file, entries)
+        except Exception as e:
+            print(f"Erro ao salvar cache de loudness: {str(e)}")
+
+    @staticmethod
+    def measure(file_path: str) -> Optional[float]:
+        """
+        Executa o ffmpeg com o filtro ebur128 e retorna a loudness integrada
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Optional[float]: Loudness integrada em LUFS
+        """
+        stream = ffmpeg.input(file_path).filter('ebur128').output('-', format='null')
+        _, err = ffmpeg.run(stream, capture_stdout=True, capture_stderr=True, quiet=True)
+        # O resumo final do filtro é a última ocorrência
+        matches = _INTEGRATED_RE.findall(err.decode('utf-8', errors='replace'))
+        return float(matches[-1]) if matches else None
+
+    def analyze(self, file_path: str) -> Optional[float]:
+        """
+        Retorna a loudness integrada do arquivo, usando o cache
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Optional[float]: Loudness em LUFS ou None se não puder ser medida
+        """
+        try:
+            key = content_hash(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            lufs = self._load_cache().get(key)
+        if lufs is None:
+            try:
+                lufs = self.measure(file_path)
+            except Exception as e:
+                print(f"Erro ao analisar loudness de {file_path}: {str(e)}")
+                return None
+            if lufs is None:
+                return None
+            with self._lock:
+                self._load_cache()[key] = lufs
+
+        with self._lock:
+            self._gains[file_path] = self._gain_from_lufs(lufs)
+        return lufs
+
+    def analyze_many(self, file_paths: Iterable[str],
+                     progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Optional[float]]:
+        """
+        Analisa vários arquivos em paralelo, um processo ffmpeg por núcleo
+
+        Args:
+            file_paths (Iterable[str]): Caminhos dos arquivos
+            progress (Callable, opcional): Recebe (analisados, total)
+
+        Returns:
+            Dict[str, Optional[float]]: Loudness por caminho
+        """
+        paths = [p for p in dict.fromkeys(file_paths) if p]
+        if not paths:
+            return {}
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+            futures = {executor.submit(self.analyze, p): p for p in paths}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if progress is not None:
+                    progress(len(results), len(paths))
+        self.save_cache()
+        return results
+
+    def analyze_in_background(self, file_paths: Iterable[str]) -> threading.Thread:
+        """Analisa os arquivos em uma thread separada"""
+        worker = threading.Thread(
+            target=self.analyze_many,
+            args=(list(file_paths),),
+            name="LoudnessAnalyzer",
+            daemon=True
+        )
+        worker.start()
+        return worker
+
+    def _gain_from_lufs(self, lufs: float) -> float:
+        """Converte a diferença para o alvo em ganho linear"""
+        return 10 ** ((self.target_lufs - lufs) / 20)
+
+    def gain_for(self, file_path: str) -> float:
+        """
+        Ganho linear de normalização do arquivo já analisado
+
+        Não acessa o disco: arquivos ainda não analisados retornam 1.0.
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            float: Ganho a multiplicar pelo volume
+        """
+        return self._gains.get(file_path, 1.0)
+
+
+_default_analyzer: Optional[LoudnessAnalyzer] = None
+_default_lock = threading.Lock()
+
+
+def get_loudness_analyzer() -> LoudnessAnalyzer:
+    """Retorna a instância compartilhada de LoudnessAnalyzer"""
+    global _default_analyzer
+    with _default_lock:
+        if _default_analyzer is None:
+            config_manager = get_config_manager()
+            _default_analyzer = LoudnessAnalyzer(
+                os.path.join(config_manager.get_cache_directory(), "loudness.json"),
+                config_manager.config.get("loudness_target_lufs", -16.0),
+                config_manager.config.get("analysis_workers", 0)
+            )
+        return _default_analyzer
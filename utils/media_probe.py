@@ -0,0 +1,178 @@
+# utils/media_probe.py
+"""
+Gerenciador de Playlist - Sondagem de Mídia
+Versão 1.0.0
+
+Executa o ffprobe em paralelo e guarda os metadados obtidos em um cache
+em disco, indexado por caminho, tamanho e data de modificação do arquivo.
+Com o backend SQLite, o cache fica na tabela de mídia da biblioteca.
+"""
+# utils/media_probe.py
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Optional
+import ffmpeg
+from utils.atomic_io import atomic_write_json
+from utils.config_manager import get_config_manager
+from utils.metrics import get_metrics
+
+
+class MediaProbe:
+    """Sonda arquivos de mídia com cache persistente dos resultados"""
+
+    def __init__(self, cache_file: str, max_workers: int = 4, store=None):
+        self.cache_file = cache_file
+        self.store = store
+        self.max_workers = max(1, int(max_workers))
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+        self.probe_count = 0
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """Lê o cache do disco na primeira utilização"""
+        if self._entries is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def save_cache(self) -> None:
+        """Grava o cache no disco se houver resultados novos"""
+        with self._lock:
+            if self.store is not None or not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+
+        try:
+            atomic_write_json(self.cache_file, entries, ensure_ascii=False)
+        except Exception as e:
+            print(f"Erro ao salvar cache de mídia: {str(e)}")
+
+    @staticmethod
+    def _run_ffprobe(file_path: str) -> Optional[Dict]:
+        """Executa o ffprobe e extrai os dados do primeiro fluxo de áudio"""
+        probe = ffmpeg.probe(file_path)
+        for stream in probe.get('streams', []):
+            if stream.get('codec_type') == 'audio':
+                duration = stream.get('duration') or probe.get('format', {}).get('duration')
+                return {
+                    "codec": stream.get('codec_name'),
+                    "duration": float(duration) if duration else None,
+                    "sample_rate": int(stream['sample_rate']) if stream.get('sample_rate') else None,
+                    "channels": stream.get('channels')
+                }
+        return None
+
+    def probe(self, file_path: str) -> Optional[Dict]:
+        """
+        Retorna os metadados de áudio do arquivo
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Optional[Dict]: codec, duration, sample_rate e channels, ou None
+            se o arquivo não existir ou não contiver áudio
+        """
+        key = os.path.abspath(file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+
+        if self.store is not None:
+            entry = self.store.get_media(key)
+        else:
+            with self._lock:
+                entry = self._load_cache().get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["info"]
+
+        try:
+            with get_metrics().time("probe.ffprobe"):
+                info = self._run_ffprobe(key)
+        except ffmpeg.Error:
+            info = None
+        except Exception:
+            # Falha do próprio ffprobe (ex.: não instalado): não guarda no cache
+            return None
+
+        with self._lock:
+            self.probe_count += 1
+            if self.store is None:
+                self._load_cache()[key] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "info": info
+                }
+                self._dirty = True
+        if self.store is not None:
+            self.store.put_media(key, st.st_size, st.st_mtime_ns, info)
+        return info
+
+    def probe_many(self, file_paths: Iterable[str],
+                   should_cancel: Optional[Callable[[], bool]] = None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Optional[Dict]]:
+        """
+        Sonda vários arquivos em paralelo
+
+        Args:
+            file_paths (Iterable[str]): Caminhos dos arquivos
+            should_cancel (Callable, opcional): Interrompe as sondagens
+                pendentes quando retornar True
+            progress (Callable, opcional): Recebe (sondados, total)
+
+        Returns:
+            Dict[str, Optional[Dict]]: Metadados por caminho (incompleto se
+            a operação for cancelada)
+        """
+        paths = list(dict.fromkeys(file_paths))
+        results = {}
+        if len(paths) <= 1:
+            for path in paths:
+                results[path] = self.probe(path)
+                if progress is not None:
+                    progress(len(results), len(paths))
+        else:
+            workers = min(self.max_workers, len(paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self.probe, p): p for p in paths}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    if progress is not None:
+                        progress(len(results), len(paths))
+                    if should_cancel is not None and should_cancel():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+
+        self.save_cache()
+        return results
+
+
+_default_probe: Optional[MediaProbe] = None
+_default_lock = threading.Lock()
+
+
+def get_media_probe() -> MediaProbe:
+    """Retorna a instância compartilhada de MediaProbe"""
+    global _default_probe
+    with _default_lock:
+        if _default_probe is None:
+            config_manager = get_config_manager()
+            store = None
+            if config_manager.config.get("storage_backend", "files") == "sqlite":
+                from models.sqlite_storage import SQLitePlaylistStorage
+                store = SQLitePlaylistStorage(config_manager.get_library_path())
+            _default_probe = MediaProbe(
+                os.path.join(config_manager.get_cache_directory(), "media_probe.json"),
+                config_manager.config.get("probe_workers", 4),
+                store
+            )
+        return _default_probe
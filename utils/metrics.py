@@ -0,0 +1,191 @@
+# utils/metrics.py
+"""
+Gerenciador de Playlist - Métricas de Desempenho
+Versão 1.0.0
+
+Registro em memória dos tempos medidos nos pontos críticos (carga,
+volume, reprodução e parada no mixer, sondagem de arquivos, leitura e
+gravação de JSON). Cada métrica é um histograma com faixas logarítmicas,
+de onde saem os percentis p50/p95/p99 sem guardar as amostras.
+
+Desligado, medir custa uma verificação de flag: time() devolve um
+cronômetro vazio compartilhado, sem ler o relógio.
+"""
+# utils/metrics.py
+import math
+import threading
+import time
+from typing import Dict
+
+# Faixas do histograma: 8 por oitava (cerca de 9% de resolução) a partir de 1 µs
+_MIN_MS = 0.001
+_BUCKETS_PER_OCTAVE = 8
+
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """Distribuição dos tempos de uma métrica, em milissegundos"""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms: float) -> None:
+        """Acrescenta uma medida"""
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        index = 0 if ms <= _MIN_MS else int(math.log2(ms / _MIN_MS) * _BUCKETS_PER_OCTAVE) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Valor abaixo do qual estão q% das medidas
+
+        Retorna o meio (geométrico) da faixa, limitado ao maior valor medido.
+
+        Args:
+            q (float): Percentil (0 a 100)
+
+        Returns:
+            float: Milissegundos
+        """
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        running = 0
+        for index in sorted(self.buckets):
+            running += self.buckets[index]
+            if running >= target:
+                return min(self.max, _MIN_MS * 2 ** (max(0, index - 0.5) / _BUCKETS_PER_OCTAVE))
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Contagem, média, percentis e máximo"""
+        result = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+        }
+        for q in PERCENTILES:
+            result[f"p{q}"] = self.percentile(q)
+        result["max"] = self.max
+        return result
+
+
+class _Timer:
+    """Mede o bloco 'with' e registra a duração na métrica"""
+
+    __slots__ = ("registry", "name", "t0")
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.registry.record(self.name, (time.perf_counter() - self.t0) * 1000)
+
+
+class _NullTimer:
+    """Cronômetro usado com as métricas desligadas: não faz nada"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Histogramas de tempo por nome de métrica"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._started_at = time.time()
+
+    def time(self, name: str):
+        """
+        Cronômetro para um bloco 'with'
+
+        Args:
+            name (str): Nome da métrica (ex.: "mixer.play")
+
+        Returns:
+            Context manager que registra a duração do bloco
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name: str, ms: float) -> None:
+        """
+        Registra uma duração já medida
+
+        Args:
+            name (str): Nome da métrica
+            ms (float): Duração em milissegundos
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.record(ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Resumo de todas as métricas
+
+        Returns:
+            Dict: Por métrica, count, mean, p50, p95, p99 e max em milissegundos
+        """
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self._histograms.items())}
+
+    def reset(self) -> None:
+        """Descarta todas as medidas"""
+        with self._lock:
+            self._histograms.clear()
+            self._started_at = time.time()
+
+    def dump(self, path: str) -> None:
+        """
+        Grava o resumo das métricas em JSON
+
+        Args:
+            path (str): Arquivo de destino
+        """
+        # Importado aqui: atomic_io também mede suas gravações neste registro
+        from utils.atomic_io import atomic_write_json
+        atomic_write_json(path, {
+            "enabled": self.enabled,
+            "started_at": self._started_at,
+            "dumped_at": time.time(),
+            "unit": "ms",
+            "metrics": self.snapshot()
+        }, indent=2)
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Retorna o registro de métricas compartilhado"""
+    return _default_registry
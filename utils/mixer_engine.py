@@ -0,0 +1,339 @@
+# utils/mixer_engine.py
+"""
+Gerenciador de Playlist - Motor de Mixagem
+Versão 1.0.0
+
+Toca várias faixas ao mesmo tempo sobre um conjunto de canais do
+pygame.mixer, com volume por voz e política de roubo de voz.
+
+As entradas e saídas de faixa usam os fades do próprio SDL_mixer, feitos
+amostra a amostra. Mudanças de volume durante a reprodução (controle
+deslizante, abaixamento sob outra voz) viram rampas em degraus, avançadas
+pelo laço do motor de áudio, em vez de saltos que produzem estalos.
+"""
+# utils/mixer_engine.py
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+import pygame.mixer
+from utils.metrics import get_metrics
+
+_metrics = get_metrics()
+
+# Canais 0 e 1 ficam reservados para o agendador de deixas
+RESERVED_CHANNELS = 2
+
+STEAL_OLDEST = "oldest"
+STEAL_QUIETEST = "quietest"
+STEAL_NONE = "none"
+
+
+def play_stream(start: float = 0.0, fade_ms: int = 0) -> None:
+    """
+    Inicia o streaming do pygame.mixer.music já carregado
+
+    Args:
+        start (float): Posição inicial em segundos
+        fade_ms (int): Duração da entrada gradual, em milissegundos
+    """
+    if start > 0:
+        try:
+            pygame.mixer.music.play(start=start, fade_ms=fade_ms)
+            return
+        except pygame.error:
+            # Nem todo formato aceita posicionamento: toca desde o início
+            pass
+    pygame.mixer.music.play(fade_ms=fade_ms)
+
+
+class MusicStream:
+    """
+    Dono único do pygame.mixer.music
+
+    Há um só fluxo de streaming, disputado pelas vozes e pelo agendador de
+    deixas. Quem vai carregar um arquivo nele toma o fluxo; o dono anterior
+    é avisado para dar a sua reprodução por encerrada.
+    """
+
+    def __init__(self):
+        self._owner = None
+        self._on_stolen: Optional[Callable[[], None]] = None
+
+    def acquire(self, owner, on_stolen: Callable[[], None]) -> None:
+        """
+        Toma o fluxo, avisando o dono anterior
+
+        Args:
+            owner: Novo dono
+            on_stolen (Callable): Chamado se outro dono tomar o fluxo depois
+        """
+        previous, notify = self._owner, self._on_stolen
+        self._owner, self._on_stolen = owner, on_stolen
+        if previous is not None and previous is not owner and notify is not None:
+            notify()
+
+    def release(self, owner) -> bool:
+        """Libera o fluxo; retorna False se ele já pertence a outro dono"""
+        if self._owner is not owner:
+            return False
+        self._owner, self._on_stolen = None, None
+        return True
+
+    def owns(self, owner) -> bool:
+        """Indica se o fluxo pertence ao dono informado"""
+        return self._owner is owner
+
+
+# pygame.mixer.music é único no processo, assim como o seu dono
+music_stream = MusicStream()
+
+
+class VolumeRamps:
+    """Rampas lineares de volume, aplicadas em degraus a cada passo do motor"""
+
+    def __init__(self):
+        self._ramps: Dict[int, tuple] = {}
+
+    def start(self, target, setter: Callable[[float], None], start: float, end: float,
+              duration_ms: int) -> None:
+        """
+        Inicia (ou substitui) a rampa de um alvo
+
+        Args:
+            target: Canal ou pygame.mixer.music; uma rampa nova do mesmo alvo
+                substitui a anterior, partindo do volume atual
+            setter (Callable): Aplica o volume ao alvo
+            start (float): Volume inicial
+            end (float): Volume final
+            duration_ms (int): Duração; 0 aplica o volume final na hora
+        """
+        if duration_ms <= 0 or start == end:
+            self._ramps.pop(id(target), None)
+            setter(end)
+            return
+        self._ramps[id(target)] = (setter, start, end, time.perf_counter(), duration_ms / 1000)
+        setter(start)
+
+    def cancel(self, target) -> None:
+        """Interrompe a rampa do alvo, mantendo o volume em que ele está"""
+        self._ramps.pop(id(target), None)
+
+    @property
+    def active(self) -> bool:
+        """Indica se há rampas em andamento"""
+        return bool(self._ramps)
+
+    def step(self) -> None:
+        """Avança todas as rampas até o instante atual"""
+        now = time.perf_counter()
+        for key, (setter, start, end, t0, duration) in list(self._ramps.items()):
+            progress = min(1.0, (now - t0) / duration)
+            setter(start + (end - start) * progress)
+            if progress >= 1.0:
+                del self._ramps[key]
+
+
+class Voice:
+    """Uma faixa tocando em um canal do mixer"""
+    __slots__ = ("key", "channel", "sound", "file_path", "volume", "started_at",
+                 "fade_out", "fading")
+
+    def __init__(self, key, channel, sound, file_path: str, volume: float,
+                 fade_out: float = 0.0):
+        self.key = key
+        self.channel = channel
+        self.sound = sound
+        self.file_path = file_path
+        self.volume = volume
+        self.started_at = time.perf_counter()
+        # Saída gradual ao se aproximar do fim do som, em segundos
+        self.fade_out = fade_out
+        self.fading = False
+
+    @property
+    def is_stream(self) -> bool:
+        """Indica se a voz usa o streaming do pygame.mixer.music"""
+        return self.channel is None
+
+    def is_active(self) -> bool:
+        """Indica se a voz ainda está soando"""
+        if self.is_stream:
+            return music_stream.owns(self) and pygame.mixer.music.get_busy()
+        return self.channel.get_busy() and self.channel.get_sound() is self.sound
+
+
+class MixerEngine:
+    """Gerencia N vozes simultâneas sobre canais do pygame.mixer"""
+
+    def __init__(self, num_voices: int = 8, steal_policy: str = STEAL_OLDEST,
+                 volume_ramp_ms: int = 30):
+        if steal_policy not in (STEAL_OLDEST, STEAL_QUIETEST, STEAL_NONE):
+            raise ValueError(f"Política de roubo de voz inválida: {steal_policy}")
+        self.num_voices = max(1, int(num_voices))
+        self.steal_policy = steal_policy
+        pygame.mixer.set_num_channels(RESERVED_CHANNELS + self.num_voices)
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        self._channels = [
+            pygame.mixer.Channel(RESERVED_CHANNELS + i) for i in range(self.num_voices)
+        ]
+        self._voices: Dict[Hashable, Voice] = {}
+        self.ramps = VolumeRamps()
+        self.volume_ramp_ms = max(0, int(volume_ramp_ms))
+
+    def play(self, key: Hashable, file_path: str, volume: float, sound=None,
+             stream_path: Optional[str] = None, start: float = 0.0,
+             fade_in: float = 0.0, fade_out: float = 0.0) -> Voice:
+        """
+        Inicia uma voz, substituindo a voz anterior com a mesma chave
+
+        Args:
+            key (Hashable): Identificador da voz (ex.: linha da playlist)
+            file_path (str): Caminho do arquivo
+            volume (float): Volume da voz (0.0 a 1.0)
+            sound (pygame.mixer.Sound, opcional): Som já decodificado; sem
+                ele a voz usa o streaming, que comporta uma voz por vez
+            stream_path (str, opcional): Arquivo a usar no streaming, se
+                diferente de file_path (ex.: versão pré-renderizada)
+            start (float): Posição inicial do streaming, em segundos; o som
+                decodificado já vem cortado do banco de sons
+            fade_in (float): Entrada gradual, em segundos
+            fade_out (float): Saída gradual antes do fim do som decodificado,
+                em segundos (o streaming não tem duração conhecida)
+
+        Returns:
+            Voice: Voz iniciada
+        """
+        self.stop(key)
+        fade_ms = int(fade_in * 1000)
+
+        if sound is None:
+            # Há um único fluxo de streaming: a voz que o usava é substituída
+            for other in list(self._voices.values()):
+                if other.is_stream:
+                    self.stop(other.key)
+            voice = Voice(key, None, None, file_path, volume)
+            # Uma deixa em streaming é interrompida; a voz sai se outra tomar o fluxo
+            music_stream.acquire(voice, lambda: self._stream_stolen(voice))
+            with _metrics.time("mixer.music.load"):
+                pygame.mixer.music.load(stream_path or file_path)
+            self.ramps.cancel(pygame.mixer.music)
+            pygame.mixer.music.set_volume(volume)
+            with _metrics.time("mixer.music.play"):
+                play_stream(start, fade_ms)
+        else:
+            channel = self._free_channel()
+            self.ramps.cancel(channel)
+            sound.set_volume(1.0)
+            channel.set_volume(volume)
+            with _metrics.time("mixer.channel.play"):
+                channel.play(sound, fade_ms=fade_ms)
+            voice = Voice(key, channel, sound, file_path, volume, fade_out)
+
+        self._voices[key] = voice
+        return voice
+
+    def _stream_stolen(self, voice: Voice) -> None:
+        """Descarta a voz de streaming cujo fluxo foi tomado por outro dono"""
+        if self._voices.get(voice.key) is voice:
+            del self._voices[voice.key]
+
+    def _free_channel(self):
+        """Retorna um canal livre, roubando uma voz se necessário"""
+        self.reap()
+        used = {id(v.channel) for v in self._voices.values() if not v.is_stream}
+        for channel in self._channels:
+            if id(channel) not in used and not channel.get_busy():
+                return channel
+
+        candidates = [v for v in self._voices.values() if not v.is_stream]
+        if self.steal_policy == STEAL_NONE or not candidates:
+            raise Exception("Não há vozes livres no mixer")
+        if self.steal_policy == STEAL_QUIETEST:
+            victim = min(candidates, key=lambda v: (v.volume, v.started_at))
+        else:
+            victim = min(candidates, key=lambda v: v.started_at)
+
+        channel = victim.channel
+        self.stop(victim.key)
+        return channel
+
+    def stop(self, key: Hashable, fade_ms: int = 0) -> None:
+        """
+        Interrompe a voz, se estiver tocando
+
+        Args:
+            key (Hashable): Identificador da voz
+            fade_ms (int): Saída gradual, em milissegundos (0 corta na hora)
+        """
+        voice = self._voices.pop(key, None)
+        if voice is None:
+            return
+        with _metrics.time("mixer.stop"):
+            if voice.is_stream:
+                if not music_stream.release(voice):
+                    return
+                self.ramps.cancel(pygame.mixer.music)
+                if fade_ms > 0:
+                    pygame.mixer.music.fadeout(fade_ms)
+                else:
+                    pygame.mixer.music.stop()
+            elif voice.channel.get_sound() is voice.sound:
+                self.ramps.cancel(voice.channel)
+                if fade_ms > 0:
+                    voice.channel.fadeout(fade_ms)
+                else:
+                    voice.channel.stop()
+
+    def stop_all(self, fade_ms: int = 0) -> None:
+        """Interrompe todas as vozes"""
+        for key in list(self._voices):
+            self.stop(key, fade_ms)
+
+    def set_volume(self, key: Hashable, volume: float) -> None:
+        """Ajusta o volume de uma voz em reprodução, por uma rampa curta"""
+        voice = self._voices.get(key)
+        if voice is None:
+            return
+        voice.volume = volume
+        with _metrics.time("mixer.set_volume"):
+            if voice.is_stream:
+                target, current = pygame.mixer.music, pygame.mixer.music.get_volume()
+            else:
+                target, current = voice.channel, voice.channel.get_volume()
+            self.ramps.start(target, target.set_volume, current, volume, self.volume_ramp_ms)
+
+    def tick(self) -> None:
+        """Avança as rampas e inicia a saída gradual das vozes perto do fim"""
+        self.ramps.step()
+        now = time.perf_counter()
+        for voice in self._voices.values():
+            if voice.fade_out and not voice.fading and not voice.is_stream:
+                remaining = voice.started_at + voice.sound.get_length() - now
+                if remaining <= voice.fade_out:
+                    voice.channel.fadeout(max(1, int(remaining * 1000)))
+                    voice.fading = True
+
+    def is_playing(self, key: Hashable) -> bool:
+        """Indica se a voz ainda está soando"""
+        voice = self._voices.get(key)
+        return voice is not None and voice.is_active()
+
+    def reap(self) -> List[Hashable]:
+        """
+        Remove as vozes que terminaram
+
+        Returns:
+            List[Hashable]: Chaves das vozes encerradas
+        """
+        finished = [key for key, voice in self._voices.items() if not voice.is_active()]
+        for key in finished:
+            del self._voices[key]
+        return finished
+
+    def active_keys(self) -> List[Hashable]:
+        """Chaves das vozes que estão soando"""
+        self.reap()
+        return list(self._voices)
+
+    def get_voice(self, key: Hashable) -> Optional[Voice]:
+        """Retorna a voz com a chave informada"""
+        return self._voices.get(key)
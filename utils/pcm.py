@@ -0,0 +1,32 @@
+# utils/pcm.py
+"""
+Gerenciador de Playlist - Decodificação PCM
+Versão 1.0.0
+
+Decodifica arquivos de áudio com o ffmpeg para amostras PCM em ponto
+flutuante, usadas nas análises feitas com NumPy (formas de onda,
+detecção de silêncio).
+"""
+# utils/pcm.py
+import ffmpeg
+import numpy as np
+
+# Taxa usada nas análises: suficiente para picos e limiares de silêncio
+ANALYSIS_SAMPLE_RATE = 22050
+
+
+def decode_pcm(file_path: str, sample_rate: int = ANALYSIS_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decodifica o arquivo para amostras mono em float32
+
+    Args:
+        file_path (str): Caminho do arquivo
+        sample_rate (int): Taxa de amostragem de saída
+
+    Returns:
+        np.ndarray: Amostras no intervalo [-1.0, 1.0]
+    """
+    stream = ffmpeg.input(file_path).output('pipe:', format='f32le', acodec='pcm_f32le',
+                                            ac=1, ar=sample_rate)
+    out, _ = ffmpeg.run(stream, capture_stdout=True, capture_stderr=True, quiet=True)
+    return np.frombuffer(out, dtype=np.float32)
@@ -0,0 +1,296 @@
+# utils/peaks.py
+"""
+Gerenciador de Playlist - Picos da Forma de Onda
+Versão 1.0.0
+
+Decodifica cada faixa uma única vez e guarda os picos (mínimo e máximo
+por bloco de amostras) em vários níveis de zoom, em um arquivo por
+faixa. O arquivo é lido por mmap, então desenhar a forma de onda não
+decodifica o áudio de novo.
+
+Formato do arquivo (little-endian):
+
+    cabeçalho  "PKS1", versão (u16), níveis (u16), taxa de amostragem (u32),
+               amostras por bloco no nível 0 (u32), total de amostras (u64)
+    níveis     para cada nível: amostras por bloco, blocos, deslocamento (3 x u32)
+    dados      para cada nível: pares (mínimo, máximo) em int16
+"""
+# utils/peaks.py
+import hashlib
+import multiprocessing
+import os
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from utils.atomic_io import atomic_write
+from utils.config_manager import get_config_manager
+from utils.pcm import ANALYSIS_SAMPLE_RATE, decode_pcm
+
+MAGIC = b"PKS1"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIQ")
+_LEVEL = struct.Struct("<III")
+
+# Nível 0 com 256 amostras por bloco; cada nível seguinte agrupa 4 blocos
+BASE_BUCKET = 256
+LEVEL_FACTOR = 4
+LEVEL_COUNT = 5
+
+
+def _reduce(mins: np.ndarray, maxs: np.ndarray, factor: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Agrupa os blocos de factor em factor, mantendo mínimo e máximo"""
+    remainder = (-len(mins)) % factor
+    if remainder:
+        mins = np.pad(mins, (0, remainder), mode='edge')
+        maxs = np.pad(maxs, (0, remainder), mode='edge')
+    return mins.reshape(-1, factor).min(axis=1), maxs.reshape(-1, factor).max(axis=1)
+
+
+def compute_levels(samples: np.ndarray, base_bucket: int = BASE_BUCKET,
+                   factor: int = LEVEL_FACTOR,
+                   levels: int = LEVEL_COUNT) -> List[Tuple[int, np.ndarray]]:
+    """
+    Calcula os picos em cada nível de zoom
+
+    Args:
+        samples (np.ndarray): Amostras mono em float32
+        base_bucket (int): Amostras por bloco no nível 0
+        factor (int): Blocos agrupados de um nível para o seguinte
+        levels (int): Quantidade de níveis
+
+    Returns:
+        List[Tuple[int, np.ndarray]]: (amostras por bloco, pares mínimo/máximo em int16)
+    """
+    if len(samples) == 0:
+        return [(base_bucket * factor ** i, np.zeros((0, 2), dtype='<i2')) for i in range(levels)]
+
+    mins, maxs = _reduce(samples, samples, base_bucket)
+    result = []
+    bucket = base_bucket
+    for level in range(levels):
+        if level:
+            mins, maxs = _reduce(mins, maxs, factor)
+            bucket *= factor
+        pairs = np.empty((len(mins), 2), dtype='<i2')
+        pairs[:, 0] = np.round(np.clip(mins, -1.0, 1.0) * 32767)
+        pairs[:, 1] = np.round(np.clip(maxs, -1.0, 1.0) * 32767)
+        result.append((bucket, pairs))
+    return result
+
+
+def write_peak_file(path: str, samples: np.ndarray, sample_rate: int) -> None:
+    """Grava o arquivo de picos de forma atômica"""
+    levels = compute_levels(samples)
+    offset = _HEADER.size + _LEVEL.size * len(levels)
+    table = []
+    for bucket, pairs in levels:
+        table.append(_LEVEL.pack(bucket, len(pairs), offset))
+        offset += pairs.nbytes
+
+    with atomic_write(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(levels), sample_rate, BASE_BUCKET, len(samples)))
+        f.write(b"".join(table))
+        for _, pairs in levels:
+            f.write(pairs.tobytes())
+
+
+def build_peak_file(source: str, dest: str, sample_rate: int) -> str:
+    """Decodifica a faixa e grava seus picos; executado no pool de processos"""
+    write_peak_file(dest, decode_pcm(source, sample_rate), sample_rate)
+    return dest
+
+
+class PeakFile:
+    """Arquivo de picos aberto por mmap"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, version, level_count, self.sample_rate, _, self.total_samples = \
+            _HEADER.unpack(self._data[:_HEADER.size].tobytes())
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Arquivo de picos inválido: {path}")
+
+        self.levels: List[Tuple[int, np.ndarray]] = []
+        for i in range(level_count):
+            start = _HEADER.size + i * _LEVEL.size
+            bucket, count, offset = _LEVEL.unpack(self._data[start:start + _LEVEL.size].tobytes())
+            pairs = self._data[offset:offset + count * 4].view('<i2').reshape(-1, 2)
+            self.levels.append((bucket, pairs))
+
+    @property
+    def duration(self) -> float:
+        """Duração da faixa em segundos"""
+        return self.total_samples / self.sample_rate if self.sample_rate else 0.0
+
+    def level_for(self, width: int) -> Tuple[int, np.ndarray]:
+        """Nível mais grosso que ainda tem ao menos width blocos"""
+        chosen = self.levels[0]
+        for level in self.levels:
+            if len(level[1]) >= width:
+                chosen = level
+        return chosen
+
+    def overview(self, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Picos reduzidos para width colunas
+
+        Args:
+            width (int): Largura em pixels
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Mínimos e máximos em [-1.0, 1.0]
+        """
+        _, pairs = self.level_for(width)
+        if width <= 0 or len(pairs) == 0:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+        edges = np.linspace(0, len(pairs), width + 1).astype(np.intp)[:-1]
+        edges = np.minimum(edges, len(pairs) - 1)
+        mins = np.minimum.reduceat(pairs[:, 0], edges)
+        maxs = np.maximum.reduceat(pairs[:, 1], edges)
+        return mins / 32767.0, maxs / 32767.0
+
+
+class PeakGenerator:
+    """Gera os arquivos de picos em um pool de processos e os mantém abertos"""
+
+    def __init__(self, directory: str, sample_rate: int = ANALYSIS_SAMPLE_RATE,
+                 max_workers: int = 0, max_open: int = 256):
+        self.directory = directory
+        self.sample_rate = int(sample_rate)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        os.makedirs(directory, exist_ok=True)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Arquivos abertos por mmap, os menos usados fechados além de max_open
+        self.max_open = max(1, int(max_open))
+        self._open: "OrderedDict[str, Tuple[Tuple[int, int], PeakFile]]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+
+    def path_for(self, source: str, stamp: Tuple[int, int]) -> str:
+        """Arquivo de picos da faixa, identificado por caminho, tamanho e mtime"""
+        key = f"{os.path.abspath(source)}|{stamp[0]}|{stamp[1]}|{self.sample_rate}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".peaks")
+
+    @staticmethod
+    def _stamp(source: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def get(self, source: str) -> Optional[PeakFile]:
+        """
+        Picos da faixa, se já gerados; não decodifica nada
+
+        Args:
+            source (str): Arquivo de áudio
+
+        Returns:
+            Optional[PeakFile]: Picos abertos por mmap ou None
+        """
+        stamp = self._stamp(source)
+        if stamp is None:
+            return None
+        with self._lock:
+            cached = self._open.get(source)
+            if cached is not None and cached[0] == stamp:
+                self._open.move_to_end(source)
+                return cached[1]
+
+        path = self.path_for(source, stamp)
+        if not os.path.exists(path):
+            return None
+        try:
+            peaks = PeakFile(path)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao abrir picos de {source}: {str(e)}")
+            return None
+        with self._lock:
+            self._open[source] = (stamp, peaks)
+            self._open.move_to_end(source)
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+        return peaks
+
+    def request(self, source: str,
+                callback: Optional[Callable[[str, bool], None]] = None) -> Optional[Future]:
+        """
+        Agenda a geração dos picos da faixa, se ainda não existirem
+
+        Args:
+            source (str): Arquivo de áudio
+            callback (Callable, opcional): Chamado em outra thread com o
+                caminho da faixa e se os picos foram gerados, ao fim da
+                geração (não é chamado se ela for cancelada)
+
+        Returns:
+            Optional[Future]: Geração em andamento ou None se não for necessária
+        """
+        stamp = self._stamp(source)
+        if stamp is None:
+            return None
+        dest = self.path_for(source, stamp)
+        if os.path.exists(dest):
+            return None
+
+        with self._lock:
+            future = self._pending.get(source)
+            if future is None:
+                if self._executor is None:
+                    # spawn: o processo filho não herda as threads do Qt e do mixer
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                future = self._executor.submit(build_peak_file, source, dest, self.sample_rate)
+                self._pending[source] = future
+                future.add_done_callback(lambda f: self._finished(source, f))
+
+        if callback is not None:
+            future.add_done_callback(
+                lambda f: f.cancelled() or callback(source, f.exception() is None)
+            )
+        return future
+
+    def _finished(self, source: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(source, None)
+        # Gerações canceladas no encerramento não têm exceção a consultar
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Erro ao gerar picos de {source}: {str(future.exception())}")
+
+    def generate_many(self, sources) -> None:
+        """Agenda a geração dos picos de várias faixas"""
+        for source in dict.fromkeys(sources):
+            if source:
+                self.request(source)
+
+    def shutdown(self) -> None:
+        """Encerra o pool de processos sem aguardar as gerações pendentes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_default_generator: Optional[PeakGenerator] = None
+_default_lock = threading.Lock()
+
+
+def get_peak_generator() -> PeakGenerator:
+    """Retorna a instância compartilhada de PeakGenerator"""
+    global _default_generator
+    with _default_lock:
+        if _default_generator is None:
+            config_manager = get_config_manager()
+            _default_generator = PeakGenerator(
+                os.path.join(config_manager.get_cache_directory(), "peaks"),
+                max_workers=config_manager.config.get("peak_workers", 0)
+            )
+        return _default_generator
@@ -0,0 +1,180 @@
+# utils/silence.py
+"""
+Gerenciador de Playlist - Detecção de Silêncio
+Versão 1.0.0
+
+Encontra o silêncio no início e no fim de cada arquivo, a partir das
+amostras decodificadas, para que a reprodução comece no primeiro trecho
+audível. O resultado é guardado em cache, indexado pelo hash do conteúdo
+e invalidado quando o limiar configurado muda.
+"""
+# utils/silence.py
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from utils.atomic_io import atomic_write_json
+from utils.config_manager import get_config_manager
+from utils.file_hash import content_hash
+from utils.pcm import ANALYSIS_SAMPLE_RATE, decode_pcm
+
+# Trecho tocado: (início, fim) em segundos; fim 0.0 toca até o final do arquivo
+Offsets = Tuple[float, float]
+
+# Duração dos blocos comparados com o limiar
+WINDOW_MS = 10
+
+
+def find_offsets(samples: np.ndarray, sample_rate: int, threshold_db: float = -50.0,
+                 padding_ms: int = 10) -> Offsets:
+    """
+    Calcula o trecho audível das amostras
+
+    As amostras são agrupadas em blocos de WINDOW_MS e o pico de cada bloco
+    é comparado com o limiar, sem laços em Python.
+
+    Args:
+        samples (np.ndarray): Amostras mono em float32
+        sample_rate (int): Taxa de amostragem
+        threshold_db (float): Nível, em dBFS, abaixo do qual o bloco é silêncio
+        padding_ms (int): Margem mantida antes e depois do trecho audível
+
+    Returns:
+        Offsets: (início, fim) em segundos; (0.0, 0.0) quando não há corte
+    """
+    window = max(1, sample_rate * WINDOW_MS // 1000)
+    count = -(-len(samples) // window)
+    if count == 0:
+        return 0.0, 0.0
+
+    padded = np.zeros(count * window, dtype=np.float32)
+    padded[:len(samples)] = samples
+    peaks = np.abs(padded.reshape(count, window)).max(axis=1)
+    audible = np.flatnonzero(peaks >= 10 ** (threshold_db / 20))
+    if len(audible) == 0:
+        # Arquivo inteiro em silêncio: melhor tocar do que não tocar nada
+        return 0.0, 0.0
+
+    duration = len(samples) / sample_rate
+    padding = padding_ms / 1000
+    start = max(0.0, int(audible[0]) * window / sample_rate - padding)
+    end = (int(audible[-1]) + 1) * window / sample_rate + padding
+    return round(start, 3), (0.0 if end >= duration else round(end, 3))
+
+
+class SilenceAnalyzer:
+    """Detecta o silêncio no início e no fim dos arquivos"""
+
+    def __init__(self, cache_file: str, threshold_db: float = -50.0, padding_ms: int = 10,
+                 max_workers: int = 0):
+        self.cache_file = cache_file
+        self.threshold_db = float(threshold_db)
+        self.padding_ms = int(padding_ms)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, list]] = None
+
+    def _settings(self) -> Dict[str, float]:
+        return {"threshold_db": self.threshold_db, "padding_ms": self.padding_ms}
+
+    def _load_cache(self) -> Dict[str, list]:
+        """Lê o cache hash -> [início, fim]; é descartado se o limiar mudou"""
+        if self._entries is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._entries = data["entries"] if data.get("settings") == self._settings() else {}
+            except (FileNotFoundError, ValueError, KeyError):
+                self._entries = {}
+        return self._entries
+
+    def save_cache(self) -> None:
+        """Grava o cache de silêncio no disco"""
+        with self._lock:
+            entries = dict(self._load_cache())
+        try:
+            atomic_write_json(self.cache_file, {"settings": self._settings(), "entries": entries})
+        except Exception as e:
+            print(f"Erro ao salvar cache de silêncio: {str(e)}")
+
+    def measure(self, file_path: str) -> Offsets:
+        """
+        Decodifica o arquivo e calcula o trecho audível
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Offsets: (início, fim) em segundos
+        """
+        samples = decode_pcm(file_path, ANALYSIS_SAMPLE_RATE)
+        return find_offsets(samples, ANALYSIS_SAMPLE_RATE, self.threshold_db, self.padding_ms)
+
+    def analyze(self, file_path: str) -> Optional[Offsets]:
+        """
+        Retorna o trecho audível do arquivo, usando o cache
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Optional[Offsets]: (início, fim) ou None se não puder ser analisado
+        """
+        try:
+            key = content_hash(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._load_cache().get(key)
+        if cached is not None:
+            return tuple(cached)
+
+        try:
+            offsets = self.measure(file_path)
+        except Exception as e:
+            print(f"Erro ao detectar silêncio de {file_path}: {str(e)}")
+            return None
+        with self._lock:
+            self._load_cache()[key] = list(offsets)
+        return offsets
+
+    def analyze_many(self, file_paths: Iterable[str]) -> Dict[str, Optional[Offsets]]:
+        """
+        Analisa vários arquivos em paralelo, um processo ffmpeg por núcleo
+
+        Args:
+            file_paths (Iterable[str]): Caminhos dos arquivos
+
+        Returns:
+            Dict[str, Optional[Offsets]]: Trecho audível por caminho
+        """
+        paths = [p for p in dict.fromkeys(file_paths) if p]
+        if not paths:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+            results = dict(zip(paths, executor.map(self.analyze, paths)))
+        self.save_cache()
+        return results
+
+
+_default_analyzer: Optional[SilenceAnalyzer] = None
+_default_lock = threading.Lock()
+
+
+def get_silence_analyzer() -> SilenceAnalyzer:
+    """Retorna a instância compartilhada de SilenceAnalyzer"""
+    global _default_analyzer
+    with _default_lock:
+        if _default_analyzer is None:
+            config_manager = get_config_manager()
+            config = config_manager.config
+            _default_analyzer = SilenceAnalyzer(
+                os.path.join(config_manager.get_cache_directory(), "silence.json"),
+                config.get("silence_threshold_db", -50.0),
+                config.get("silence_padding_ms", 10),
+                config.get("analysis_workers", 0)
+            )
+        return _default_analyzer
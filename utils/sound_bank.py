@@ -0,0 +1,211 @@
+# utils/sound_bank.py
+"""
+Gerenciador de Playlist - Banco de Sons
+Versão 1.0.0
+
+Mantém em memória as faixas da playlist já decodificadas, para que o
+disparo de uma faixa não dependa de leitura de disco nem do decodificador.
+Faixas com silêncio no início ou no fim são guardadas já cortadas.
+"""
+# utils/sound_bank.py
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+import pygame.mixer
+from utils.metrics import get_metrics
+
+# Trecho tocado: (início, fim) em segundos; fim 0.0 toca até o final do arquivo
+Trim = Tuple[float, float]
+NO_TRIM: Trim = (0.0, 0.0)
+
+
+class SoundBank:
+    """Cache LRU de sons decodificados limitado por um orçamento de memória"""
+
+    def __init__(self, budget_mb: int = 256, resolver: Optional[Callable[[str], str]] = None):
+        self.budget_bytes = int(budget_mb) * 1024 * 1024
+        # Traduz o arquivo de origem para o arquivo a decodificar (ex.: versão pré-renderizada)
+        self.resolver = resolver or (lambda file_path: file_path)
+        self.used_bytes = 0
+        # Caminho -> (som, bytes, corte aplicado)
+        self._sounds: "OrderedDict[str, tuple]" = OrderedDict()
+        self._trims: Dict[str, Trim] = {}
+        self._streaming: Set[str] = set()
+        self._pinned: Set[str] = set()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, file_path: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Retorna o som decodificado, se já estiver no banco
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Optional[pygame.mixer.Sound]: Som pronto ou None
+        """
+        with self._lock:
+            entry = self._sounds.get(file_path)
+            if entry is None:
+                return None
+            self._sounds.move_to_end(file_path)
+            return entry[0]
+
+    def trim_for(self, file_path: str) -> Trim:
+        """Trecho tocado do arquivo, (0.0, 0.0) se não houver corte"""
+        return self._trims.get(file_path, NO_TRIM)
+
+    def set_trim(self, file_path: str, start: float, end: float) -> None:
+        """
+        Define o trecho tocado do arquivo
+
+        Um som já carregado sem corte é cortado na memória; com outro corte,
+        é descartado e decodificado de novo no próximo carregamento.
+
+        Args:
+            file_path (str): Caminho do arquivo
+            start (float): Início, em segundos
+            end (float): Fim, em segundos (0.0 toca até o final)
+        """
+        trim = (float(start), float(end))
+        with self._lock:
+            if self._trims.get(file_path, NO_TRIM) == trim:
+                return
+            if trim == NO_TRIM:
+                self._trims.pop(file_path, None)
+            else:
+                self._trims[file_path] = trim
+            entry = self._sounds.pop(file_path, None)
+            if entry is None:
+                return
+            self.used_bytes -= entry[1]
+            if entry[2] != NO_TRIM:
+                return
+            sound = self._trim(entry[0], trim)
+            size = self._sound_size(sound)
+            if self._make_room(size):
+                self._sounds[file_path] = (sound, size, trim)
+                self.used_bytes += size
+
+    def is_streaming(self, file_path: str) -> bool:
+        """Indica se o arquivo é grande demais e deve tocar via streaming"""
+        with self._lock:
+            return file_path in self._streaming
+
+    def preload(self, file_paths: Iterable[str]) -> None:
+        """
+        Decodifica as faixas em segundo plano, na ordem recebida
+
+        Uma nova chamada interrompe o carregamento anterior.
+
+        Args:
+            file_paths (Iterable[str]): Arquivos da playlist
+        """
+        paths = [p for p in dict.fromkeys(file_paths) if p]
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pinned = set(paths)
+
+        worker = threading.Thread(
+            target=self._preload_worker,
+            args=(paths, generation),
+            name="SoundBankPreload",
+            daemon=True
+        )
+        worker.start()
+
+    def _preload_worker(self, paths, generation: int) -> None:
+        """Decodifica os arquivos até terminar ou ser substituído"""
+        for path in paths:
+            if generation != self._generation:
+                return
+            with self._lock:
+                known = path in self._sounds or path in self._streaming
+            if known:
+                continue
+            try:
+                self.load(path)
+            except Exception as e:
+                print(f"Erro ao pré-carregar áudio {path}: {str(e)}")
+
+    def load(self, file_path: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Decodifica um arquivo e o guarda no banco
+
+        Args:
+            file_path (str): Caminho do arquivo
+
+        Returns:
+            Optional[pygame.mixer.Sound]: Som decodificado ou None se o
+            arquivo não couber no orçamento
+        """
+        decode_path = self.resolver(file_path)
+
+        # O arquivo compactado já excede o orçamento: não há como decodificá-lo
+        if os.path.getsize(decode_path) > self.budget_bytes:
+            with self._lock:
+                self._streaming.add(file_path)
+            return None
+
+        trim = self.trim_for(file_path)
+        with get_metrics().time("sound_bank.decode"):
+            sound = pygame.mixer.Sound(decode_path)
+        sound = self._trim(sound, trim)
+        size = self._sound_size(sound)
+        if size > self.budget_bytes:
+            with self._lock:
+                self._streaming.add(file_path)
+            return None
+
+        with self._lock:
+            # O corte mudou durante a decodificação: o som não serve mais
+            if self._trims.get(file_path, NO_TRIM) != trim or not self._make_room(size):
+                return None
+            self._sounds[file_path] = (sound, size, trim)
+            self.used_bytes += size
+        return sound
+
+    @staticmethod
+    def _trim(sound: pygame.mixer.Sound, trim: Trim) -> pygame.mixer.Sound:
+        """Copia apenas o trecho tocado do som decodificado"""
+        start, end = trim
+        if trim == NO_TRIM:
+            return sound
+        frequency, fmt, channels = pygame.mixer.get_init()
+        frame = channels * (abs(fmt) // 8)
+        raw = sound.get_raw()
+        first = int(start * frequency) * frame
+        last = min(len(raw), int(end * frequency) * frame) if end else len(raw)
+        if first >= last:
+            return sound
+        return pygame.mixer.Sound(buffer=memoryview(raw)[first:last])
+
+    def _make_room(self, size: int) -> bool:
+        """Descarta os sons menos usados até caber o novo som"""
+        for path in list(self._sounds):
+            if self.used_bytes + size <= self.budget_bytes:
+                break
+            # Faixas da playlist atual não abrem espaço umas para as outras
+            if path in self._pinned:
+                continue
+            evicted = self._sounds.pop(path)[1]
+            self.used_bytes -= evicted
+        return self.used_bytes + size <= self.budget_bytes
+
+    @staticmethod
+    def _sound_size(sound: pygame.mixer.Sound) -> int:
+        """Estima os bytes de PCM ocupados pelo som"""
+        frequency, fmt, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * frequency * channels * (abs(fmt) // 8))
+
+    def clear(self) -> None:
+        """Remove todos os sons do banco"""
+        with self._lock:
+            self._generation += 1
+            self._sounds.clear()
+            self._streaming.clear()
+            self._pinned.clear()
+            self.used_bytes = 0
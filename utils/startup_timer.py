@@ -0,0 +1,61 @@
+# utils/startup_timer.py
+"""
+Gerenciador de Playlist - Cronômetro de Inicialização
+Versão 1.0.0
+
+Registra os marcos da inicialização (importações, controlador, janela,
+primeira pintura, áudio) para o relatório exibido com --startup-report.
+"""
+# utils/startup_timer.py
+import threading
+import time
+from typing import Dict, List, Tuple
+
+
+class StartupTimer:
+    """Marca o tempo decorrido desde o início do processo em cada etapa"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.t0 = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def mark(self, name: str) -> None:
+        """
+        Registra um marco da inicialização
+
+        Args:
+            name (str): Nome da etapa concluída
+        """
+        elapsed = (time.perf_counter() - self.t0) * 1000
+        with self._lock:
+            self.marks.append((name, elapsed))
+        if self.enabled:
+            print(f"[startup] {name}: {elapsed:.1f} ms")
+
+    def report(self) -> Dict[str, float]:
+        """
+        Retorna os marcos registrados
+
+        Returns:
+            Dict[str, float]: Milissegundos desde o início, por etapa
+        """
+        with self._lock:
+            return dict(self.marks)
+
+    def watch_first_paint(self, widget) -> None:
+        """Registra o marco 'first_paint' na primeira pintura do widget"""
+        from PyQt6.QtCore import QEvent, QObject
+
+        timer = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    obj.removeEventFilter(self)
+                    timer.mark("first_paint")
+                return False
+
+        self._paint_filter = FirstPaintFilter(widget)
+        widget.installEventFilter(self._paint_filter)
@@ -0,0 +1,264 @@
+# utils/transcoder.py
+"""
+Gerenciador de Playlist - Pipeline de Renderização
+Versão 1.0.0
+
+Converte os arquivos de áudio para um formato nativo do mixer (WAV na
+taxa de amostragem do pygame.mixer) e aplica ajustes de volume, guardando
+o resultado em um diretório de cache gerenciado com limite de tamanho.
+"""
+# utils/transcoder.py
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import ffmpeg
+from utils.config_manager import get_config_manager
+from utils.file_hash import content_hash
+from utils.media_probe import get_media_probe
+
+ProgressCallback = Callable[[str, float], None]
+
+
+class RenderCache:
+    """Diretório de arquivos renderizados com limite de tamanho e descarte LRU"""
+
+    def __init__(self, directory: str, max_mb: int = 2048):
+        self.directory = directory
+        self.max_bytes = int(max_mb) * 1024 * 1024
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str, ext: str) -> str:
+        """Caminho do arquivo renderizado para a chave"""
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def get(self, key: str, ext: str) -> Optional[str]:
+        """
+        Retorna o arquivo em cache, marcando-o como usado recentemente
+
+        Args:
+            key (str): Chave da renderização
+            ext (str): Extensão do arquivo
+
+        Returns:
+            Optional[str]: Caminho do arquivo ou None
+        """
+        path = self.path_for(key, ext)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, tmp_path: str, key: str, ext: str) -> str:
+        """Move um arquivo renderizado para o cache e aplica o limite"""
+        path = self.path_for(key, ext)
+        os.replace(tmp_path, path)
+        self.enforce_limit()
+        return path
+
+    def enforce_limit(self) -> None:
+        """Descarta os arquivos usados há mais tempo até caber no limite"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith('.part'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+
+class Transcoder:
+    """Renderiza arquivos para o formato do mixer em um pool de trabalhadores"""
+
+    def __init__(self, cache: RenderCache, sample_rate: int = 44100, channels: int = 2,
+                 max_workers: int = 0):
+        self.cache = cache
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.format = "wav"
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 1,
+            thread_name_prefix="Transcoder"
+        )
+        # origem -> (arquivo renderizado, tamanho e mtime da origem na renderização)
+        self._rendered: Dict[str, Tuple[str, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def render_key(self, source: str, volume: float = 1.0) -> str:
+        """Chave do resultado: hash do conteúdo de origem + parâmetros"""
+        params = json.dumps({
+            "source": content_hash(source),
+            "volume": round(float(volume), 4),
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "format": self.format
+        }, sort_keys=True)
+        return hashlib.sha1(params.encode('utf-8')).hexdigest()
+
+    def render(self, source: str, volume: float = 1.0,
+               progress: Optional[ProgressCallback] = None) -> str:
+        """
+        Renderiza o arquivo, reaproveitando o cache quando possível
+
+        Args:
+            source (str): Arquivo de origem
+            volume (float): Ganho a aplicar (1.0 = sem alteração)
+            progress (Callable, opcional): Recebe (origem, fração concluída)
+
+        Returns:
+            str: Caminho do arquivo renderizado
+        """
+        st = os.stat(source)
+        key = self.render_key(source, volume)
+        cached = self.cache.get(key, self.format)
+        if cached is None:
+            tmp_path = self.cache.path_for(key, self.format) + f".{threading.get_ident()}.part"
+            try:
+                self._run_ffmpeg(source, tmp_path, volume, progress)
+                cached = self.cache.put(tmp_path, key, self.format)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        if volume == 1.0:
+            with self._lock:
+                self._rendered[source] = (cached, st.st_size, st.st_mtime_ns)
+        if progress is not None:
+            progress(source, 1.0)
+        return cached
+
+    def _run_ffmpeg(self, source: str, output: str, volume: float,
+                    progress: Optional[ProgressCallback]) -> None:
+        """Executa o ffmpeg acompanhando o progresso pela saída -progress"""
+        info = get_media_probe().probe(source) or {}
+        duration = info.get("duration") or 0.0
+
+        stream = ffmpeg.input(source)
+        if volume != 1.0:
+            stream = ffmpeg.filter(stream, 'volume', volume=volume)
+        stream = ffmpeg.output(
+            stream, output,
+            acodec='pcm_s16le', ar=self.sample_rate, ac=self.channels, format=self.format
+        )
+        stream = stream.global_args('-progress', 'pipe:1', '-nostats', '-loglevel', 'error')
+        process = ffmpeg.run_async(stream, pipe_stdout=True, overwrite_output=True)
+
+        for raw in process.stdout:
+            line = raw.decode('utf-8', errors='replace').strip()
+            if progress is not None and duration and line.startswith('out_time_us='):
+                try:
+                    seconds = int(line.split('=', 1)[1]) / 1_000_000
+                except ValueError:
+                    continue
+                progress(source, min(0.99, seconds / duration))
+
+        if process.wait() != 0:
+            raise Exception(f"ffmpeg falhou ao renderizar {source}")
+
+    def submit(self, source: str, volume: float = 1.0,
+               progress: Optional[ProgressCallback] = None) -> Future:
+        """Agenda uma renderização no pool de trabalhadores"""
+        return self._executor.submit(self.render, source, volume, progress)
+
+    def render_many(self, sources: Iterable[str],
+                    progress: Optional[ProgressCallback] = None) -> Dict[str, Optional[str]]:
+        """
+        Renderiza vários arquivos em paralelo
+
+        Args:
+            sources (Iterable[str]): Arquivos de origem
+            progress (Callable, opcional): Recebe (origem, fração concluída)
+
+        Returns:
+            Dict[str, Optional[str]]: Arquivo renderizado por origem (None em caso de erro)
+        """
+        futures = {s: self.submit(s, 1.0, progress) for s in dict.fromkeys(sources) if s}
+        results = {}
+        for source, future in futures.items():
+            try:
+                results[source] = future.result()
+            except Exception as e:
+                print(f"Erro ao renderizar {source}: {str(e)}")
+                results[source] = None
+        return results
+
+    def render_in_background(self, sources: Iterable[str]) -> None:
+        """Agenda a renderização dos arquivos sem aguardar o resultado"""
+        for source in dict.fromkeys(sources):
+            if source:
+                future = self.submit(source)
+                future.add_done_callback(
+                    lambda f, s=source: self._report_failure(s, f)
+                )
+
+    @staticmethod
+    def _report_failure(source: str, future: Future) -> None:
+        """Registra o erro de uma renderização agendada em segundo plano"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Erro ao renderizar {source}: {str(error)}")
+
+    def resolve(self, source: str) -> str:
+        """
+        Arquivo a ser carregado para a origem: o renderizado, se ainda válido
+
+        Só consulta os metadados dos arquivos (sem ler o conteúdo). Se a
+        renderização foi descartada do cache ou a origem mudou desde então,
+        a entrada é removida e a própria origem é retornada.
+        """
+        with self._lock:
+            entry = self._rendered.get(source)
+        if entry is None:
+            return source
+
+        rendered, size, mtime_ns = entry
+        try:
+            st = os.stat(source)
+            valid = (st.st_size == size and st.st_mtime_ns == mtime_ns
+                     and os.path.exists(rendered))
+        except OSError:
+            valid = False
+
+        if not valid:
+            with self._lock:
+                if self._rendered.get(source) == entry:
+                    del self._rendered[source]
+            return source
+        return rendered
+
+
+_default_transcoder: Optional[Transcoder] = None
+_default_lock = threading.Lock()
+
+
+def get_transcoder(sample_rate: int = 44100, channels: int = 2) -> Transcoder:
+    """Retorna a instância compartilhada de Transcoder"""
+    global _default_transcoder
+    with _default_lock:
+        if _default_transcoder is None:
+            config_manager = get_config_manager()
+            cache = RenderCache(
+                os.path.join(config_manager.get_cache_directory(), "render"),
+                config_manager.config.get("render_cache_mb", 2048)
+            )
+            _default_transcoder = Transcoder(
+                cache, sample_rate, channels,
+                config_manager.config.get("render_workers", 0)
+            )
+        return _default_transcoder
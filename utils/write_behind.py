@@ -0,0 +1,139 @@
+# utils/write_behind.py
+"""
+Gerenciador de Playlist - Fila de Gravação Adiada
+Versão 1.0.0
+
+Agrupa gravações repetidas da mesma chave em uma só: cada nova gravação
+substitui a pendente e adia a escrita até que as alterações parem por
+uma janela configurável (ou até um atraso máximo). flush() grava tudo o
+que estiver pendente imediatamente, como no fechamento da janela.
+"""
+# utils/write_behind.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+
+class WriteBehindQueue:
+    """Fila de gravações adiadas, coalescidas por chave"""
+
+    def __init__(self, window_ms: int = 1000, max_delay_ms: Optional[int] = None):
+        self.window = max(0, int(window_ms)) / 1000
+        self.max_delay = (max_delay_ms if max_delay_ms is not None else 5 * int(window_ms)) / 1000
+        # chave -> (função de gravação, primeira submissão, última submissão)
+        self._pending: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._cond = threading.Condition()
+        # Serializa as gravações para que uma antiga nunca termine depois de uma nova
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.flush_count = 0
+        self.coalesced_count = 0
+
+    def submit(self, key: Hashable, write: Callable[[], None]) -> None:
+        """
+        Agenda uma gravação, substituindo a pendente com a mesma chave
+
+        Args:
+            key (Hashable): Identificador do destino (ex.: nome da playlist)
+            write (Callable): Função que executa a gravação
+        """
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                raise Exception("Fila de gravação encerrada")
+            entry = self._pending.pop(key, None)
+            if entry is not None:
+                self.coalesced_count += 1
+            first = entry[1] if entry is not None else now
+            self._pending[key] = (write, first, now)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="WriteBehind", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Descarta a gravação pendente da chave, se houver"""
+        with self._cond:
+            return self._pending.pop(key, None) is not None
+
+    def pending_keys(self) -> List[Hashable]:
+        """Chaves com gravação pendente"""
+        with self._cond:
+            return list(self._pending)
+
+    def _deadline(self, entry: tuple) -> float:
+        """Momento em que a gravação pendente deve ser feita"""
+        _, first, last = entry
+        return min(last + self.window, first + self.max_delay)
+
+    def _take(self, keys: List[Hashable]) -> List[Callable[[], None]]:
+        return [self._pending.pop(key)[0] for key in keys]
+
+    @staticmethod
+    def _execute(writes: List[Callable[[], None]]) -> None:
+        for write in writes:
+            try:
+                write()
+            except Exception as e:
+                print(f"Erro na gravação adiada: {str(e)}")
+
+    def _run(self) -> None:
+        """Laço da thread: grava as entradas cujo prazo venceu"""
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending:
+                        now = time.monotonic()
+                        next_deadline = min(self._deadline(e) for e in self._pending.values())
+                        if next_deadline <= now:
+                            break
+                        self._cond.wait(next_deadline - now)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+
+            with self._write_lock:
+                with self._cond:
+                    now = time.monotonic()
+                    due = [k for k, e in self._pending.items() if self._deadline(e) <= now]
+                    writes = self._take(due)
+                self._execute(writes)
+                if writes:
+                    self.flush_count += 1
+
+    def flush(self) -> int:
+        """
+        Grava imediatamente todas as entradas pendentes
+
+        Returns:
+            int: Quantidade de gravações executadas
+        """
+        with self._write_lock:
+            with self._cond:
+                writes = self._take(list(self._pending))
+            self._execute(writes)
+            if writes:
+                self.flush_count += 1
+        return len(writes)
+
+    def close(self) -> None:
+        """Grava o que estiver pendente e encerra a thread"""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de gravações e de submissões coalescidas"""
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "flushes": self.flush_count,
+                "coalesced": self.coalesced_count
+            }
@@ -0,0 +1,98 @@
+# views/diagnostics_dialog.py
+"""
+Gerenciador de Playlist - Diagnóstico
+Versão 1.0.0
+
+Exibe os tempos medidos nos pontos críticos (mixer, decodificação,
+sondagem, leitura e gravação de arquivos), com percentis, e permite
+exportá-los em JSON.
+"""
+# views/diagnostics_dialog.py
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QCheckBox,
+                             QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox,
+                             QHeaderView, QAbstractItemView)
+
+COLUMNS = ("count", "mean", "p50", "p95", "p99", "max")
+HEADERS = ["Métrica", "Amostras", "Média (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Máx. (ms)"]
+
+
+class DiagnosticsDialog(QDialog):
+    """Diálogo com as métricas de desempenho coletadas"""
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+
+        # Atualiza a tabela enquanto o diálogo estiver aberto
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.setup_ui()
+        self.refresh()
+        self.refresh_timer.start()
+
+    def setup_ui(self):
+        self.setWindowTitle("Diagnóstico")
+        self.resize(720, 420)
+        layout = QVBoxLayout(self)
+
+        self.enabled_check = QCheckBox("Coletar métricas")
+        self.enabled_check.setChecked(self.controller.metrics.enabled)
+        self.enabled_check.toggled.connect(self.controller.set_metrics_enabled)
+        layout.addWidget(self.enabled_check)
+
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Atualizar")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn = QPushButton("Zerar")
+        reset_btn.clicked.connect(self.reset)
+        export_btn = QPushButton("Exportar JSON...")
+        export_btn.clicked.connect(self.export)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.accept)
+        for button in (refresh_btn, reset_btn, export_btn):
+            buttons.addWidget(button)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+    def refresh(self):
+        """Recarrega a tabela com o resumo atual das métricas"""
+        snapshot = self.controller.metrics_snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, summary) in enumerate(snapshot.items()):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for column, key in enumerate(COLUMNS, start=1):
+                value = summary[key]
+                text = str(value) if key == "count" else f"{value:.3f}"
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def reset(self):
+        self.controller.reset_metrics()
+        self.refresh()
+
+    def export(self):
+        """Grava o resumo das métricas em um arquivo JSON"""
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar Métricas", "metricas.json",
+                                              "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.controller.dump_metrics(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", str(e))
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        super().done(result)
@@ -0,0 +1,180 @@
+# views/library_panel.py
+"""
+Gerenciador de Playlist - Painel da Biblioteca
+Versão 1.0.0
+
+Lista os arquivos da biblioteca de mídia, que podem ser arrastados para
+as linhas da lista de faixas. Os diretórios são vigiados com um
+QFileSystemWatcher e reescaneados em segundo plano quando mudam.
+"""
+# views/library_panel.py
+import os
+from typing import List, Set
+from PyQt6.QtCore import (Qt, QAbstractListModel, QModelIndex, QMimeData, QUrl,
+                          QSortFilterProxyModel, QFileSystemWatcher, QTimer)
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QLineEdit, QListView, QFileDialog, QAbstractItemView)
+
+
+class LibraryListModel(QAbstractListModel):
+    """Modelo de lista com os arquivos válidos da biblioteca"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = []
+
+    def set_entries(self, entries) -> None:
+        """Substitui os arquivos exibidos"""
+        self.beginResetModel()
+        self._entries = [e for e in entries if e.valid]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if entry.duration:
+                minutes, seconds = divmod(int(entry.duration), 60)
+                return f"{entry.name}  ({minutes}:{seconds:02d})"
+            return entry.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return entry.path
+        if role == Qt.ItemDataRole.UserRole:
+            return entry.path
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid():
+            flags |= Qt.ItemFlag.ItemIsDragEnabled
+        return flags
+
+    def mimeTypes(self) -> List[str]:
+        return ["text/uri-list"]
+
+    def mimeData(self, indexes) -> QMimeData:
+        mime = QMimeData()
+        paths = [self._entries[i.row()].path for i in indexes if i.isValid()]
+        mime.setUrls([QUrl.fromLocalFile(p) for p in dict.fromkeys(paths)])
+        return mime
+
+
+class LibraryPanel(QWidget):
+    """Painel com a biblioteca de mídia e a vigilância dos diretórios"""
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.scan_task = None
+        self._dirty_dirs: Set[str] = set()
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.directory_changed)
+
+        # Agrupa as mudanças em rajada (cópia de vários arquivos) em uma varredura
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(500)
+        self.rescan_timer.timeout.connect(self.rescan_dirty)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        buttons = QHBoxLayout()
+        add_btn = QPushButton("Adicionar pasta")
+        add_btn.clicked.connect(self.add_directory)
+        rescan_btn = QPushButton("Reescanear")
+        rescan_btn.clicked.connect(lambda: self.start_scan())
+        buttons.addWidget(add_btn)
+        buttons.addWidget(rescan_btn)
+        layout.addLayout(buttons)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar...")
+        layout.addWidget(self.filter_edit)
+
+        self.model = LibraryListModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setDragEnabled(True)
+        self.list_view.setDragDropMode(QAbstractItemView.DragDropMode.DragOnly)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.list_view)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+    def add_directory(self):
+        """Acrescenta um diretório à biblioteca e o varre"""
+        directory = QFileDialog.getExistingDirectory(self, "Adicionar Pasta à Biblioteca")
+        if directory:
+            self.controller.add_library_directory(directory)
+            self.start_scan([directory])
+
+    def start_scan(self, directories=None):
+        """Varre os diretórios (todos, por padrão) em segundo plano"""
+        if self.scan_task is not None:
+            # Uma varredura por vez: o pedido volta para a fila de diretórios
+            self._dirty_dirs.update(directories or self.controller.library_directories())
+            return
+
+        task = self.controller.scan_library_async(directories)
+        task.signals.finished.connect(self.scan_finished)
+        task.signals.failed.connect(self.scan_failed)
+        task.signals.cancelled.connect(self.scan_done)
+        self.status_label.setText("Escaneando...")
+        self.scan_task = task.start()
+
+    def scan_finished(self, summary: dict):
+        """Atualiza a lista e os diretórios vigiados após a varredura"""
+        watched = set(self.watcher.directories())
+        new_dirs = [d for d in summary["directories"] if d not in watched]
+        if new_dirs:
+            self.watcher.addPaths(new_dirs)
+
+        self.refresh()
+        self.status_label.setText(
+            f"{summary['added']} novos, {summary['changed']} alterados, "
+            f"{summary['removed']} removidos"
+        )
+        self.scan_done()
+
+    def scan_failed(self, message: str):
+        self.status_label.setText(f"Erro ao escanear: {message}")
+        self.scan_done()
+
+    def scan_done(self):
+        self.scan_task = None
+        if self._dirty_dirs:
+            self.rescan_timer.start()
+
+    def refresh(self):
+        """Recarrega a lista a partir do manifesto"""
+        self.model.set_entries(self.controller.library_entries())
+
+    def directory_changed(self, path: str):
+        """Agenda a varredura de um diretório vigiado que mudou"""
+        self._dirty_dirs.add(path)
+        if not os.path.isdir(path):
+            self.watcher.removePath(path)
+        self.rescan_timer.start()
+
+    def rescan_dirty(self):
+        """Varre os diretórios que mudaram desde a última varredura"""
+        if self.scan_task is not None or not self._dirty_dirs:
+            return
+        directories = sorted(self._dirty_dirs)
+        self._dirty_dirs.clear()
+        self.start_scan(directories)
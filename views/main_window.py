@@ -6,18 +6,21 @@ Data: 04/12/2023
 
 Interface gráfica principal do sistema.
 """
-from utils.config_manager import ConfigManager
-from models.playlist import PlaylistModel
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QLineEdit, QSlider, QLabel, QFileDialog,
+                             QPushButton, QLineEdit, QLabel, QFileDialog,
                              QInputDialog, QComboBox, QMessageBox, QMenuBar, QMenu,
-                             QDialog, QDialogButtonBox, QSpacerItem, QSizePolicy)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
+                             QDialog, QDialogButtonBox, QSpacerItem, QSizePolicy,
+                             QProgressDialog, QListWidget, QListWidgetItem, QDockWidget,
+                             QDoubleSpinBox, QFormLayout)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QPixmap, QKeySequence
 from typing import List, Dict
 from models.playlist import Track
+from views.track_table import TrackTableModel, TrackTableView, WaveformDelegate
+from views.library_panel import LibraryPanel
+from views.diagnostics_dialog import DiagnosticsDialog
+from dataclasses import replace
 import os
-import pygame.mixer
 
 
 class SavePlaylistDialog(QDialog):
@@ -53,43 +56,79 @@ class SavePlaylistDialog(QDialog):
         return self.name_combo.currentText()
 
 
+class EnvelopeDialog(QDialog):
+    """Diálogo para editar o envelope de volume de uma faixa"""
+    def __init__(self, track: Track, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Envelope - {track.name or track.sequence}")
+        layout = QFormLayout(self)
+
+        self.fade_in_spin = self._seconds_spin(track.fade_in)
+        self.fade_out_spin = self._seconds_spin(track.fade_out)
+        self.duck_spin = QDoubleSpinBox()
+        self.duck_spin.setRange(0.0, 1.0)
+        self.duck_spin.setSingleStep(0.05)
+        self.duck_spin.setValue(track.duck_level)
+        layout.addRow("Entrada gradual (s):", self.fade_in_spin)
+        layout.addRow("Saída gradual (s):", self.fade_out_spin)
+        layout.addRow("Nível sob outra voz (1.0 não abaixa):", self.duck_spin)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    @staticmethod
+    def _seconds_spin(value: float) -> QDoubleSpinBox:
+        spin = QDoubleSpinBox()
+        spin.setRange(0.0, 60.0)
+        spin.setSingleStep(0.5)
+        spin.setDecimals(2)
+        spin.setValue(value)
+        return spin
+
+    def get_envelope(self) -> Dict[str, float]:
+        return {
+            "fade_in": self.fade_in_spin.value(),
+            "fade_out": self.fade_out_spin.value(),
+            "duck_level": self.duck_spin.value()
+        }
+
+
 class MainWindow(QMainWindow):
     """Interface principal do aplicativo"""
 
+    # Eventos de reprodução do controlador, entregues na thread da interface
+    playbackEvent = pyqtSignal(dict)
+
     def __init__(self, controller):
         super().__init__()
         self.controller = controller
-        self.track_widgets: List[Dict] = []
-        self.current_playing_button = None
-        self.setup_menu()
-        self.setup_ui()
+        self.save_task = None
+        self.load_task = None
+        self.silence_task = None
+        self.current_playlist = None
+        # Deixa a destacar quando a playlist escolhida na busca terminar de carregar
+        self.focus_sequence = None
+
+        # Salvamento automático: agrupa as edições antes de enviar ao controlador
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(200)
+        self.autosave_timer.timeout.connect(self.autosave)
 
-    def setup_menu(self):
-        """Configura a barra de menu"""
-        menubar = self.menuBar()
-
-        # Menu Arquivo
-        file_menu = menubar.addMenu('Arquivo')
-
-        # Ação Carregar Playlist
-        load_action = file_menu.addAction('Carregar Playlist')
-        load_action.triggered.connect(self.update_playlist_list)
-
-        # Ação Salvar Playlist
-        save_action = file_menu.addAction('Salvar Playlist')
-        save_action.triggered.connect(self.save_playlist)
-
-        # Separador
-        file_menu.addSeparator()
+        self.setup_ui()
+        self.setup_menu()
 
-        # Ação Sair
-        exit_action = file_menu.addAction('Sair')
-        exit_action.triggered.connect(self.close)
+        # O motor de áudio acompanha as deixas e vozes e publica eventos da própria thread
+        self.playbackEvent.connect(self.on_playback_event)
+        self.controller.add_listener(self.playbackEvent.emit)
 
-        # Menu Ajuda
-        help_menu = menubar.addMenu('Ajuda')
-        about_action = help_menu.addAction('Sobre')
-        about_action.triggered.connect(self.show_about)
+    def show_diagnostics(self):
+        """Exibe as métricas de desempenho"""
+        DiagnosticsDialog(self.controller, self).exec()
 
     def show_about(self):
         """Exibe a janela Sobre"""
@@ -146,6 +185,23 @@ class MainWindow(QMainWindow):
                 border: 1px solid #FFD700;
                 padding: 5px;
             }
+            QListWidget {
+                background-color: #2E2E2E;
+                color: #FFFFFF;
+                border: 1px solid #FFD700;
+            }
+            QTableView {
+                background-color: #2E2E2E;
+                color: #FFFFFF;
+                gridline-color: #3E3E3E;
+                border: 1px solid #FFD700;
+            }
+            QHeaderView::section {
+                background-color: #1E1E1E;
+                color: #FFD700;
+                border: none;
+                padding: 4px;
+            }
             QMenuBar {
                 background-color: #1E1E1E;
                 color: #FFD700;
@@ -185,59 +241,49 @@ class MainWindow(QMainWindow):
         playlist_layout.addStretch()
         main_layout.addLayout(playlist_layout)
 
-        # Lista de faixas
-        tracks_group = QWidget()
-        tracks_layout = QVBoxLayout(tracks_group)
-
-        for i in range(10):
-            track_layout = QHBoxLayout()
-
-            sequence_label = QLabel(str(i + 1))
-            sequence_label.setFixedWidth(30)
-
-            event_edit = QLineEdit()
-            event_edit.setFixedWidth(200)
-            event_edit.setPlaceholderText("Evento da sessão")
-
-            name_edit = QLineEdit()
-            name_edit.setFixedWidth(500)
-            name_edit.setPlaceholderText("Caminho da música")
-
-            file_btn = QPushButton("...")
-            file_btn.setFixedWidth(30)
-
-            play_btn = QPushButton("▶")
-            play_btn.setFixedWidth(30)
-
-            volume_slider = QSlider(Qt.Orientation.Horizontal)
-            volume_slider.setRange(0, 100)
-            volume_slider.setValue(100)
-            volume_slider.setFixedWidth(150)
-
-            track_layout.addWidget(sequence_label)
-            track_layout.addWidget(event_edit, 1)
-            track_layout.addWidget(name_edit, 1)
-            track_layout.addWidget(file_btn)
-            track_layout.addWidget(play_btn)
-            track_layout.addWidget(volume_slider)
-
-            tracks_layout.addLayout(track_layout)
-
-            self.track_widgets.append({
-                "sequence": i + 1,
-                "event_edit": event_edit,
-                "name_edit": name_edit,
-                "file_btn": file_btn,
-                "play_btn": play_btn,
-                "volume_slider": volume_slider,
-                "file_path": ""
-            })
-
-            file_btn.clicked.connect(lambda checked, i=i: self.select_file(i))
-            play_btn.clicked.connect(lambda checked, i=i: self.play_audio(i))
-            volume_slider.valueChanged.connect(lambda value, i=i: self.volume_changed(i))
-
-        main_layout.addWidget(tracks_group)
+        # Busca em playlists, eventos, músicas e arquivos
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Buscar playlist, evento, música ou arquivo...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.search)
+        self.search_edit.returnPressed.connect(self.open_first_result)
+        main_layout.addWidget(self.search_edit)
+
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(180)
+        self.search_results.hide()
+        self.search_results.itemActivated.connect(self.open_search_result)
+        self.search_results.itemClicked.connect(self.open_search_result)
+        main_layout.addWidget(self.search_results)
+
+        # Lista de faixas: só as linhas visíveis são desenhadas
+        self.track_model = TrackTableModel(self)
+        self.track_model.volumeChanged.connect(self.volume_changed)
+        self.track_model.tracksEdited.connect(self.schedule_autosave)
+        waveform_delegate = None
+        if self.controller.config_manager.config.get("waveforms", True):
+            waveform_delegate = WaveformDelegate(self.controller.peak_file,
+                                                 self.controller.request_peaks)
+        self.track_view = TrackTableView(self.track_model, waveform_delegate=waveform_delegate)
+        self.track_view.fileRequested.connect(self.select_file)
+        self.track_view.playRequested.connect(self.play_audio)
+        self.track_view.filesDropped.connect(self.files_dropped)
+        main_layout.addWidget(self.track_view)
+
+        add_rows_btn = QPushButton("Adicionar linhas")
+        add_rows_btn.clicked.connect(lambda: self.track_model.add_rows())
+        rows_layout = QHBoxLayout()
+        rows_layout.addStretch()
+        rows_layout.addWidget(add_rows_btn)
+        main_layout.addLayout(rows_layout)
+
+        # Biblioteca de mídia: arraste os arquivos para as linhas
+        self.library_panel = LibraryPanel(self.controller)
+        self.library_dock = QDockWidget("Biblioteca", self)
+        self.library_dock.setObjectName("library_dock")
+        self.library_dock.setWidget(self.library_panel)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.library_dock)
+        QTimer.singleShot(0, self.library_panel.start_scan)
 
     def select_file(self, index: int):
         """Seleciona arquivo de música"""
@@ -249,62 +295,69 @@ class MainWindow(QMainWindow):
         )
 
         if file_path:
-            self.track_widgets[index]["file_path"] = file_path
-            # self.track_widgets[index]["file_btn"].setText("..." + file_path[-20:])
-            self.track_widgets[index]["file_btn"].setText("...")
-            # if not self.track_widgets[index]["name_edit"].text():
-            file_name = os.path.splitext(os.path.basename(file_path))[0]
-            # self.track_widgets[index]["name_edit"].setText(file_name)
-            self.track_widgets[index]["name_edit"].setText(file_path)
+            self.track_model.update_track(index, file_path=file_path, name=file_path)
+
+    def files_dropped(self, row: int, paths: List[str]):
+        """Preenche as linhas a partir de row com os arquivos arrastados"""
+        missing = row + len(paths) - self.track_model.rowCount()
+        if missing > 0:
+            self.track_model.add_rows(missing)
+        for offset, path in enumerate(paths):
+            self.track_model.update_track(
+                row + offset,
+                file_path=path,
+                name=os.path.splitext(os.path.basename(path))[0]
+            )
 
     def play_audio(self, index: int):
-        """Reproduz ou para o áudio"""
-        widget = self.track_widgets[index]
+        """Reproduz ou para o áudio da linha, sem afetar as demais"""
+        track = self.track_model.track_at(index)
 
-        if not widget["file_path"]:
+        if not track.file_path:
             QMessageBox.warning(self, "Aviso", "Selecione um arquivo de música primeiro.")
             return
 
         try:
-            if self.current_playing_button == widget["play_btn"] and \
-               self.controller.audio_utils.is_playing:
-                self.controller.stop_audio()
-                widget["play_btn"].setText("▶")
-                self.current_playing_button = None
+            if index in self.track_model.playing_rows() and self.controller.is_voice_playing(index):
+                self.controller.stop_voice(index)
+                self.track_model.set_playing(index, False)
             else:
-                if self.current_playing_button:
-                    self.current_playing_button.setText("▶")
-
-                volume = widget["volume_slider"].value() / 100
-                self.controller.play_audio(widget["file_path"], volume)
-                widget["play_btn"].setText("⏹")
-                self.current_playing_button = widget["play_btn"]
+                # Vozes roubadas para abrir espaço chegam como voice_ended
+                self.controller.play_voice(index, track.file_path, track.volume,
+                                           track.fade_in, track.fade_out)
+                self.track_model.set_playing(index, True)
 
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao reproduzir áudio: {str(e)}")
 
+    def edit_envelope(self):
+        """Edita entrada, saída gradual e abaixamento da faixa selecionada"""
+        row = self.track_view.currentIndex().row()
+        if row < 0 or not self.track_model.track_at(row).file_path:
+            QMessageBox.warning(self, "Aviso", "Selecione uma faixa com arquivo primeiro.")
+            return
+
+        dialog = EnvelopeDialog(self.track_model.track_at(row), self)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            self.track_model.update_track(row, **dialog.get_envelope())
+
+    def reset_play_buttons(self):
+        """Restaura os botões de todas as linhas"""
+        for index in self.track_model.playing_rows():
+            self.track_model.set_playing(index, False)
+
     def volume_changed(self, index: int):
         """Atualiza o volume"""
-        widget = self.track_widgets[index]
-        if self.current_playing_button == widget["play_btn"] and \
-           self.controller.audio_utils.is_playing:
-            volume = widget["volume_slider"].value() / 100
-            pygame.mixer.music.set_volume(volume)
+        if index in self.track_model.playing_rows():
+            self.controller.set_voice_volume(index, self.track_model.track_at(index).volume)
 
     def get_tracks(self) -> List[Track]:
         """Obtém lista de faixas"""
         tracks = []
-        for widget in self.track_widgets:
-            if widget["file_path"]:
-                track = Track(
-                    sequence=widget["sequence"],
-                    event=widget["event_edit"].text(),
-                    name=widget["name_edit"].text() or os.path.splitext(
-                        os.path.basename(widget["file_path"]))[0],
-                    file_path=widget["file_path"],
-                    volume=widget["volume_slider"].value() / 100
-                )
-                tracks.append(track)
+        for track in self.track_model.tracks():
+            if not track.name:
+                track = replace(track, name=os.path.splitext(os.path.basename(track.file_path))[0])
+            tracks.append(track)
         return tracks
 
     def save_playlist(self):
@@ -328,122 +381,180 @@ class MainWindow(QMainWindow):
             name = dialog.get_playlist_name()
 
             if name:
-                try:
-                    self.controller.save_playlist(name, tracks)
-                    self.update_playlist_list()
-                    self.playlist_combo.setCurrentText(name)
-                    QMessageBox.information(
-                        self,
-                        "Sucesso",
-                        f"Playlist '{name}' salva com sucesso!"
-                    )
-                except Exception as e:
-                    QMessageBox.critical(
-                        self,
-                        "Erro",
-                        f"Erro ao salvar playlist: {str(e)}"
-                    )
-
-    def load_playlist(self, name: str):
-        """Carrega playlist selecionada"""
-        if not name:
-            return
-
-        try:
-            # Carrega as faixas da playlist
-            tracks = self.controller.load_playlist(name)
-
-            # Para qualquer áudio em reprodução
-            if self.current_playing_button:
-                self.controller.stop_audio()
-                self.current_playing_button.setText("▶")
-                self.current_playing_button = None
-
-            # Atualiza os widgets com os dados da playlist carregada
-            for widget in self.track_widgets:
-                widget["event_edit"].clear()
-                widget["name_edit"].clear()
-                widget["file_btn"].setText("...")
-                widget["volume_slider"].setValue(100)
-                widget["file_path"] = ""
-                widget["play_btn"].setText("▶")
-
-            for track in tracks:
-                index = track.sequence - 1
-                if index < len(self.track_widgets):
-                    widget = self.track_widgets[index]
-                    widget["event_edit"].setText(track.event)
-                    widget["name_edit"].setText(track.name)
-                    widget["file_btn"].setText("...")
-                    widget["volume_slider"].setValue(int(track.volume * 100))
-                    widget["file_path"] = track.file_path
-
-            # Atualiza o layout para garantir que os widgets sejam exibidos
-            self.centralWidget().update()
-
+                self.start_save(name, tracks)
+
+    def start_save(self, name: str, tracks: List[Track]):
+        """Salva a playlist em segundo plano, com opção de cancelar"""
+        if self.save_task is not None:
+            self.save_task.cancel()
+
+        task = self.controller.save_playlist_async(name, tracks)
+
+        progress = QProgressDialog("Validando e salvando a playlist...", "Cancelar", 0, 0, self)
+        progress.setWindowTitle("Salvar Playlist")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(task.cancel)
+
+        def close_progress():
+            progress.canceled.disconnect()
+            progress.close()
+
+        def on_saved(_):
+            close_progress()
+            self.current_playlist = name
+            self.update_playlist_list()
+            self.playlist_combo.setCurrentText(name)
+            self.start_silence_analysis(name)
             QMessageBox.information(
                 self,
                 "Sucesso",
-                f"Playlist '{name}' carregada com sucesso!"
+                f"Playlist '{name}' salva com sucesso!"
             )
 
-        except Exception as e:
+        def on_failed(message: str):
+            close_progress()
             QMessageBox.critical(
                 self,
                 "Erro",
-                f"Erro ao carregar playlist: {str(e)}"
-            )                    
+                f"Erro ao salvar playlist: {message}"
+            )
+
+        task.signals.finished.connect(on_saved)
+        task.signals.failed.connect(on_failed)
+        task.signals.cancelled.connect(close_progress)
+        self.save_task = task.start()
 
     def load_playlist(self, name: str):
-        """Carrega playlist selecionada"""
+        """Carrega playlist selecionada em segundo plano"""
         if not name:
             return
 
-        try:
-            # Carrega as faixas da playlist
-            tracks = self.controller.load_playlist(name)
-
-            # Para qualquer áudio em reprodução
-            if self.current_playing_button:
-                self.controller.stop_audio()
-                self.current_playing_button.setText("▶")
-                self.current_playing_button = None
-
-            # Limpa os widgets existentes
-            for widget in self.track_widgets:
-                widget["event_edit"].setText("")  # Limpa o campo de evento
-                widget["name_edit"].setText("")  # Limpa o campo de nome
-                widget["file_btn"].setText("...")  # Reseta o botão de arquivo
-                widget["volume_slider"].setValue(100)  # Reseta o volume
-                widget["file_path"] = ""  # Limpa o caminho do arquivo
-                widget["play_btn"].setText("▶")  # Reseta o botão de play
-
-            # Atualiza os widgets com os dados da playlist carregada
-            for track in tracks:
-                index = track.sequence - 1
-                if index < len(self.track_widgets):
-                    widget = self.track_widgets[index]
-                    widget["event_edit"].setText(track.event)
-                    widget["name_edit"].setText(track.name)
-                    widget["file_btn"].setText("...")
-                    widget["volume_slider"].setValue(int(track.volume * 100))
-                    widget["file_path"] = track.file_path
-
-            # Atualiza o layout para garantir que os widgets sejam exibidos
-            self.centralWidget().update()
+        # Uma seleção nova substitui o carregamento ainda em andamento
+        if self.load_task is not None:
+            self.load_task.cancel()
 
-            QMessageBox.information(
-                self,
-                "Sucesso",
-                f"Playlist '{name}' carregada com sucesso!"
-            )
-
-        except Exception as e:
-            QMessageBox.critical(
+        task = self.controller.load_playlist_async(name)
+        task.signals.finished.connect(lambda tracks: self.apply_playlist(name, tracks))
+        task.signals.failed.connect(
+            lambda message: QMessageBox.critical(
                 self,
                 "Erro",
-                f"Erro ao carregar playlist: {str(e)}"
+                f"Erro ao carregar playlist: {message}"
             )
+        )
+        self.load_task = task.start()
+
+    def apply_playlist(self, name: str, tracks: List[Track], remote: bool = False):
+        """Preenche as faixas com a playlist carregada"""
+        # Para qualquer áudio em reprodução
+        if self.track_model.playing_rows():
+            self.controller.stop_audio()
+            self.reset_play_buttons()
+
+        # Grava a edição ainda não salva da playlist anterior antes de trocá-la
+        if self.autosave_timer.isActive():
+            self.autosave_timer.stop()
+            self.autosave()
+
+        # Substitui as linhas da tabela pelas faixas carregadas
+        self.track_model.set_tracks(tracks)
+        self.current_playlist = name
+        if self.focus_sequence is not None:
+            self.focus_track(self.focus_sequence)
+            self.focus_sequence = None
+
+        # Prepara o encadeamento das deixas da playlist
+        self.show_current_cue(None)
+        if remote:
+            # As deixas já foram definidas pelo controle remoto: só atualiza a seleção
+            self.playlist_combo.blockSignals(True)
+            self.playlist_combo.setCurrentText(name)
+            self.playlist_combo.blockSignals(False)
+            self.start_silence_analysis(name)
+            return
+        self.controller.set_cues(tracks, name)
+        self.start_silence_analysis(name)
+
+        QMessageBox.information(
+            self,
+            "Sucesso",
+            f"Playlist '{name}' carregada com sucesso!"
+        )
+
+    def start_silence_analysis(self, name: str):
+        """Detecta em segundo plano o silêncio das faixas ainda sem corte"""
+        if self.silence_task is not None:
+            self.silence_task.cancel()
+
+        task = self.controller.analyze_silence_async(name)
+
+        def on_analyzed(tracks):
+            self.silence_task = None
+            if tracks and name == self.current_playlist:
+                self.track_model.apply_offsets(tracks)
+
+        def on_failed(message: str):
+            self.silence_task = None
+            print(f"Erro ao detectar silêncio: {message}")
+
+        task.signals.finished.connect(on_analyzed)
+        task.signals.failed.connect(on_failed)
+        self.silence_task = task.start()
+
+    def search(self, text: str):
+        """Atualiza os resultados da busca enquanto o usuário digita"""
+        self.search_results.clear()
+        if not text.strip():
+            self.search_results.hide()
+            return
+
+        if not self.controller.search_ready:
+            self.search_results.addItem("Indexando playlists...")
+        else:
+            labels = {"playlist": "Playlist", "event": "Evento", "name": "Música", "file": "Arquivo"}
+            for result in self.controller.search(text):
+                if result.sequence is None:
+                    label = f"{labels[result.kind]}: {result.text}"
+                else:
+                    label = f"{labels[result.kind]}: {result.text} — {result.playlist} #{result.sequence}"
+                item = QListWidgetItem(label)
+                item.setData(Qt.ItemDataRole.UserRole, (result.playlist, result.sequence))
+                self.search_results.addItem(item)
+            if not self.search_results.count():
+                self.search_results.addItem("Nenhum resultado")
+        self.search_results.show()
+
+    def open_first_result(self):
+        """Abre o primeiro resultado da busca (Enter na caixa de busca)"""
+        if self.search_results.count():
+            self.open_search_result(self.search_results.item(0))
+
+    def open_search_result(self, item: QListWidgetItem):
+        """Carrega a playlist do resultado e destaca a deixa encontrada"""
+        target = item.data(Qt.ItemDataRole.UserRole)
+        if target is None:
+            return
+        playlist, sequence = target
+
+        if playlist == self.current_playlist:
+            if sequence is not None:
+                self.focus_track(sequence)
+        else:
+            self.focus_sequence = sequence
+            if self.playlist_combo.findText(playlist) < 0:
+                self.update_playlist_list()
+            if self.playlist_combo.currentText() == playlist:
+                self.load_playlist(playlist)
+            else:
+                self.playlist_combo.setCurrentText(playlist)
+
+    def focus_track(self, sequence: int):
+        """Rola a lista de faixas até a deixa informada"""
+        row = self.track_model.row_of(sequence)
+        if row is not None:
+            self.track_view.focus_row(row)
+
     def update_playlist_list(self):
         """Atualiza lista de playlists"""
         current = self.playlist_combo.currentText()
@@ -456,17 +567,91 @@ class MainWindow(QMainWindow):
         if current in names:
             self.playlist_combo.setCurrentText(current)
 
+    def go_next_cue(self):
+        """Dispara a próxima deixa da playlist"""
+        try:
+            track = self.controller.go_next()
+            self.show_current_cue(track)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao disparar deixa: {str(e)}")
+
+    def go_to_cue(self):
+        """Pergunta o número e dispara a deixa correspondente"""
+        sequence, ok = QInputDialog.getInt(self, "Ir para Deixa", "Número da deixa:", 1, 1)
+        if not ok:
+            return
+        try:
+            track = self.controller.go_to_cue(sequence)
+            self.show_current_cue(track)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao disparar deixa: {str(e)}")
+
+    def stop_cues(self):
+        """Interrompe as deixas em reprodução"""
+        self.controller.stop_cues()
+        self.show_current_cue(None)
+
+    def on_playback_event(self, event: Dict):
+        """Acompanha na interface as deixas e vozes do motor de áudio"""
+        kind = event.get("event")
+        if kind == "cue":
+            self.show_current_cue(self.controller.current_cue())
+        elif kind == "stopped":
+            self.show_current_cue(None)
+        elif kind == "voice_ended":
+            if event.get("key") in self.track_model.playing_rows():
+                self.track_model.set_playing(event["key"], False)
+        elif kind == "voice_error":
+            # Falha de um disparo por streaming, feito depois do clique
+            if event.get("key") in self.track_model.playing_rows():
+                self.track_model.set_playing(event["key"], False)
+            QMessageBox.critical(self, "Erro", event.get("error", "Erro ao reproduzir áudio"))
+        elif kind == "playlist" and event.get("name") != self.current_playlist:
+            try:
+                tracks = self.controller.playlist_model.load_playlist(event["name"])
+            except Exception as e:
+                print(f"Erro ao exibir playlist remota: {str(e)}")
+                return
+            self.apply_playlist(event["name"], tracks, remote=True)
+
+    def show_current_cue(self, track):
+        """Mostra a deixa atual na barra de status"""
+        if track is None:
+            self.statusBar().clearMessage()
+        else:
+            self.statusBar().showMessage(f"Deixa {track.sequence}: {track.event or track.name}")
+
+    def schedule_autosave(self):
+        """Agenda o salvamento automático da playlist atual após uma edição"""
+        if self.current_playlist and self.controller.config_manager.config.get("autosave", True):
+            self.autosave_timer.start()
+
+    def autosave(self):
+        """Envia a playlist atual para a fila de salvamento automático"""
+        if self.current_playlist:
+            self.controller.autosave_playlist(self.current_playlist, self.get_tracks())
+
     def closeEvent(self, event):
         """Manipula o evento de fechamento"""
-        if self.current_playing_button:
+        if self.track_model.playing_rows() or self.controller.is_cue_playing():
             self.controller.stop_audio()
+
+        # Garante que nenhuma edição fique sem gravar
+        if self.autosave_timer.isActive():
+            self.autosave_timer.stop()
+            self.autosave()
+        try:
+            self.controller.flush_pending_saves()
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao salvar playlists: {str(e)}")
+        self.controller.shutdown()
         event.accept()
 
 # E ajuste a função show_config_dialog na classe MainWindow:
     def show_config_dialog(self):
         """Exibe diálogo de configurações"""
         try:
-            config_manager = ConfigManager()
+            config_manager = self.controller.config_manager
             current_dir = config_manager.config.get("playlist_directory")
 
             new_dir = QFileDialog.getExistingDirectory(
@@ -476,12 +661,13 @@ class MainWindow(QMainWindow):
             )
 
             if new_dir:
-                config = config_manager.config
-                config["playlist_directory"] = new_dir
-                config_manager.save_config(config)
+                # A edição ainda no temporizador vai para o diretório atual
+                if self.autosave_timer.isActive():
+                    self.autosave_timer.stop()
+                    self.autosave()
 
                 # Recarrega o modelo com o novo caminho
-                self.controller.playlist_model = PlaylistModel()
+                self.controller.change_playlist_directory(new_dir)
                 self.update_playlist_list()
 
                 QMessageBox.information(
@@ -523,7 +709,33 @@ class MainWindow(QMainWindow):
         exit_action = file_menu.addAction('Sair')
         exit_action.triggered.connect(self.close)
 
+        # Menu Deixas
+        cue_menu = menubar.addMenu('Deixas')
+
+        next_action = cue_menu.addAction('Próxima Deixa')
+        next_action.setShortcut(QKeySequence("F5"))
+        next_action.triggered.connect(self.go_next_cue)
+
+        goto_action = cue_menu.addAction('Ir para Deixa...')
+        goto_action.setShortcut(QKeySequence("F6"))
+        goto_action.triggered.connect(self.go_to_cue)
+
+        stop_action = cue_menu.addAction('Parar Deixas')
+        stop_action.setShortcut(QKeySequence("F8"))
+        stop_action.triggered.connect(self.stop_cues)
+
+        cue_menu.addSeparator()
+        envelope_action = cue_menu.addAction('Envelope da Faixa...')
+        envelope_action.setShortcut(QKeySequence("F7"))
+        envelope_action.triggered.connect(self.edit_envelope)
+
+        # Menu Exibir
+        view_menu = menubar.addMenu('Exibir')
+        view_menu.addAction(self.library_dock.toggleViewAction())
+
         # Menu Ajuda
         help_menu = menubar.addMenu('Ajuda')
+        diagnostics_action = help_menu.addAction('Diagnóstico')
+        diagnostics_action.triggered.connect(self.show_diagnostics)
         about_action = help_menu.addAction('Sobre')
         about_action.triggered.connect(self.show_about)
\ No newline at end of file
@@ -0,0 +1,457 @@
+"""
+Gerenciador de Playlist - Tabela de Faixas
+Versão 1.0.0
+
+Modelo e delegates da lista de faixas. A tabela só desenha as linhas
+visíveis, então playlists com milhares de deixas não criam um widget por
+linha.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Iterable, List, Optional, Set
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QLineF,
+                          pyqtSignal)
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (QStyledItemDelegate, QStyleOptionButton, QStyleOptionSlider,
+                             QStyle, QApplication, QTableView, QHeaderView,
+                             QAbstractItemView)
+from models.playlist import Track
+
+COL_SEQUENCE = 0
+COL_EVENT = 1
+COL_NAME = 2
+COL_WAVEFORM = 3
+COL_FILE = 4
+COL_PLAY = 5
+COL_VOLUME = 6
+
+HEADERS = ["#", "Evento", "Música", "Forma de onda", "", "", "Volume"]
+
+# Quantidade mínima de linhas exibidas, como na lista original de 10 faixas
+MIN_ROWS = 10
+
+
+class TrackTableModel(QAbstractTableModel):
+    """Modelo de tabela com as faixas da playlist"""
+
+    volumeChanged = pyqtSignal(int)
+    # Emitido quando o usuário altera alguma faixa (não ao carregar uma playlist)
+    tracksEdited = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tracks: List[Track] = []
+        self._playing: Set[int] = set()
+        self.set_tracks([])
+
+    @staticmethod
+    def empty_track(sequence: int) -> Track:
+        """Linha vazia, ainda sem arquivo"""
+        return Track(sequence=sequence, event="", name="", file_path="", volume=1.0)
+
+    def set_tracks(self, tracks: List[Track]) -> None:
+        """
+        Substitui as faixas exibidas
+
+        Args:
+            tracks (List[Track]): Faixas da playlist
+        """
+        self.beginResetModel()
+        rows = sorted(tracks, key=lambda t: t.sequence)
+        next_sequence = rows[-1].sequence + 1 if rows else 1
+        while len(rows) < MIN_ROWS:
+            rows.append(self.empty_track(next_sequence))
+            next_sequence += 1
+        self._tracks = rows
+        self._playing = set()
+        self.endResetModel()
+
+    def add_rows(self, count: int = MIN_ROWS) -> None:
+        """Acrescenta linhas vazias ao final"""
+        start = len(self._tracks)
+        next_sequence = self._tracks[-1].sequence + 1 if self._tracks else 1
+        self.beginInsertRows(QModelIndex(), start, start + count - 1)
+        self._tracks.extend(self.empty_track(next_sequence + i) for i in range(count))
+        self.endInsertRows()
+
+    def track_at(self, row: int) -> Track:
+        """Retorna a faixa da linha"""
+        return self._tracks[row]
+
+    def row_of(self, sequence: int) -> Optional[int]:
+        """Linha da faixa com a sequência informada"""
+        for row, track in enumerate(self._tracks):
+            if track.sequence == sequence:
+                return row
+        return None
+
+    def tracks(self) -> List[Track]:
+        """Faixas com arquivo selecionado, prontas para salvar"""
+        return [t for t in self._tracks if t.file_path]
+
+    def update_track(self, row: int, **changes) -> None:
+        """Altera campos da faixa e atualiza a linha na tabela"""
+        if "file_path" in changes and changes["file_path"] != self._tracks[row].file_path:
+            # Os pontos de corte pertencem ao arquivo anterior
+            changes.setdefault("start_offset", 0.0)
+            changes.setdefault("end_offset", 0.0)
+        self._tracks[row] = replace(self._tracks[row], **changes)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+        self.tracksEdited.emit()
+
+    def apply_offsets(self, tracks: List[Track]) -> None:
+        """
+        Copia os pontos de corte já gravados para as linhas correspondentes
+
+        Não emite tracksEdited: a playlist em disco já contém os cortes.
+
+        Args:
+            tracks (List[Track]): Faixas com os novos pontos de corte
+        """
+        for track in tracks:
+            row = self.row_of(track.sequence)
+            if row is not None and self._tracks[row].file_path == track.file_path:
+                self._tracks[row] = replace(self._tracks[row], start_offset=track.start_offset,
+                                            end_offset=track.end_offset)
+
+    def set_playing(self, row: int, playing: bool) -> None:
+        """Alterna o botão ▶/⏹ da linha"""
+        if playing:
+            self._playing.add(row)
+        else:
+            self._playing.discard(row)
+        index = self.index(row, COL_PLAY)
+        self.dataChanged.emit(index, index)
+
+    def playing_rows(self) -> Set[int]:
+        """Linhas marcadas como em reprodução"""
+        return set(self._playing)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tracks)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        track = self._tracks[index.row()]
+        column = index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == COL_SEQUENCE:
+                return str(track.sequence)
+            if column == COL_EVENT:
+                return track.event
+            if column == COL_NAME:
+                return track.name
+            if column == COL_WAVEFORM:
+                return None
+            if column == COL_FILE:
+                return "..."
+            if column == COL_PLAY:
+                return "⏹" if index.row() in self._playing else "▶"
+            if column == COL_VOLUME:
+                return int(round(track.volume * 100))
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if column == COL_EVENT:
+                return track.event or "Evento da sessão"
+            if column == COL_NAME:
+                return track.file_path or "Caminho da música"
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column == COL_SEQUENCE:
+            return Qt.AlignmentFlag.AlignCenter
+        elif role == Qt.ItemDataRole.UserRole:
+            return track.file_path
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() in (COL_EVENT, COL_NAME):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        if column == COL_EVENT:
+            self.update_track(row, event=str(value))
+        elif column == COL_NAME:
+            self.update_track(row, name=str(value))
+        elif column == COL_VOLUME:
+            volume = max(0, min(100, int(value))) / 100
+            if volume == self._tracks[row].volume:
+                return True
+            self.update_track(row, volume=volume)
+            self.volumeChanged.emit(row)
+        else:
+            return False
+        return True
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Desenha um botão na célula e emite clicked(linha) ao ser clicado"""
+
+    clicked = pyqtSignal(int)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data()
+        button.state = QStyle.StateFlag.State_Enabled
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            button.state |= QStyle.StateFlag.State_MouseOver
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and \
+           event.button() == Qt.MouseButton.LeftButton and \
+           option.rect.contains(event.position().toPoint()):
+            self.clicked.emit(index.row())
+            return True
+        return event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick)
+
+
+class SliderDelegate(QStyledItemDelegate):
+    """Desenha um controle deslizante de volume (0 a 100) na célula"""
+
+    MARGIN = 6
+
+    def _groove(self, rect: QRect) -> QRect:
+        return rect.adjusted(self.MARGIN, 0, -self.MARGIN, 0)
+
+    def paint(self, painter, option, index):
+        slider = QStyleOptionSlider()
+        slider.rect = self._groove(option.rect)
+        slider.orientation = Qt.Orientation.Horizontal
+        slider.minimum = 0
+        slider.maximum = 100
+        slider.sliderPosition = int(index.data())
+        slider.sliderValue = slider.sliderPosition
+        slider.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Horizontal
+        slider.subControls = QStyle.SubControl.SC_SliderGroove | QStyle.SubControl.SC_SliderHandle
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawComplexControl(QStyle.ComplexControl.CC_Slider, slider, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseMove) and \
+           event.buttons() & Qt.MouseButton.LeftButton:
+            groove = self._groove(option.rect)
+            x = event.position().x() - groove.left()
+            value = round(100 * x / max(1, groove.width()))
+            model.setData(index, max(0, min(100, value)), Qt.ItemDataRole.EditRole)
+            return True
+        return event.type() in (QEvent.Type.MouseButtonRelease, QEvent.Type.MouseButtonDblClick)
+
+
+# Arquivo sem picos e sem geração a pedir (ex.: arquivo inexistente)
+_MISSING = object()
+
+
+class _Lookup:
+    """Consulta de picos em andamento; identifica o resultado esperado"""
+    __slots__ = ()
+
+
+class WaveformDelegate(QStyledItemDelegate):
+    """
+    Desenha a forma de onda resumida da faixa a partir dos picos em cache
+
+    A pintura só lê o que já está na memória. Abrir o arquivo de picos (e
+    pedir a geração, se ele não existir) fica com uma thread auxiliar, que
+    devolve o resultado por sinal; disco lento não trava a rolagem.
+
+    Args:
+        peaks_for (Callable): Retorna os picos já gerados do arquivo, ou None
+        request_peaks (Callable): Agenda a geração dos picos; recebe o
+            arquivo e uma função chamada com (arquivo, sucesso) ao fim da
+            geração, e retorna None se não houver nada a gerar
+        max_cached (int): Arquivos guardados, os menos desenhados descartados
+    """
+
+    # Arquivo e se os picos foram gerados
+    peaksReady = pyqtSignal(str, bool)
+    # Arquivo, consulta que o buscou e picos abertos (ou None)
+    peaksLoaded = pyqtSignal(str, object, object)
+
+    def __init__(self, peaks_for, request_peaks, parent=None, max_cached: int = 256):
+        super().__init__(parent)
+        self.peaks_for = peaks_for
+        self.request_peaks = request_peaks
+        self.max_cached = max(1, int(max_cached))
+        # Por arquivo: os picos abertos, _MISSING ou a consulta (_Lookup) em andamento
+        self._peaks: "OrderedDict[str, object]" = OrderedDict()
+        self._lookups = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Waveform")
+        self.color = QColor("#FFD700")
+        self.peaksReady.connect(self._peaks_finished)
+        self.peaksLoaded.connect(self._peaks_loaded)
+
+    def forget(self, file_paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Descarta os picos guardados, que são buscados de novo na próxima pintura
+
+        Args:
+            file_paths (Iterable[str], opcional): Arquivos a descartar (padrão: todos)
+        """
+        if file_paths is None:
+            self._peaks.clear()
+            return
+        for file_path in file_paths:
+            self._peaks.pop(file_path, None)
+
+    def _look_up(self, file_path: str, lookup: _Lookup) -> None:
+        """Abre os picos ou pede a geração (na thread auxiliar)"""
+        try:
+            peaks = self.peaks_for(file_path)
+            if peaks is None:
+                # O callback roda em outra thread; o sinal volta para a da interface
+                if self.request_peaks(file_path, self.peaksReady.emit) is not None:
+                    return
+        except Exception as e:
+            print(f"Erro ao buscar picos de {file_path}: {str(e)}")
+            peaks = None
+        self.peaksLoaded.emit(file_path, lookup, peaks)
+
+    def _peaks_loaded(self, file_path: str, lookup: _Lookup, peaks) -> None:
+        # Resultado de uma consulta já descartada por forget()
+        if self._peaks.get(file_path) is not lookup:
+            return
+        self._peaks[file_path] = _MISSING if peaks is None else peaks
+        if peaks is not None and self.parent() is not None:
+            self.parent().viewport().update()
+
+    def _peaks_finished(self, file_path: str, ok: bool) -> None:
+        """Ao fim da geração, abre os picos (ou pede de novo, se falhou) na próxima pintura"""
+        self._peaks.pop(file_path, None)
+
+    def _cached(self, file_path: str):
+        """Picos guardados do arquivo; agenda a busca se ainda não houver"""
+        entry = self._peaks.get(file_path)
+        if entry is None:
+            entry = self._peaks[file_path] = _Lookup()
+            self._lookups.submit(self._look_up, file_path, entry)
+            while len(self._peaks) > self.max_cached:
+                self._peaks.popitem(last=False)
+        else:
+            self._peaks.move_to_end(file_path)
+        return None if entry is _MISSING or isinstance(entry, _Lookup) else entry
+
+    def paint(self, painter, option, index):
+        file_path = index.data(Qt.ItemDataRole.UserRole)
+        if not file_path:
+            return
+        rect = option.rect.adjusted(2, 3, -2, -3)
+        mid = rect.center().y()
+
+        peaks = self._cached(file_path)
+        painter.save()
+        painter.setPen(self.color)
+        if peaks is None:
+            painter.drawLine(rect.left(), mid, rect.right(), mid)
+        else:
+            mins, maxs = peaks.overview(rect.width())
+            half = rect.height() / 2
+            left = rect.left()
+            painter.drawLines([
+                QLineF(left + x, mid - hi * half, left + x, mid - lo * half)
+                for x, (lo, hi) in enumerate(zip(mins.tolist(), maxs.tolist()))
+            ])
+        painter.restore()
+
+
+class TrackTableView(QTableView):
+    """Tabela de faixas com botões e volume desenhados por delegates"""
+
+    fileRequested = pyqtSignal(int)
+    playRequested = pyqtSignal(int)
+    # Arquivos arrastados (da biblioteca ou do gerenciador de arquivos) sobre uma linha
+    filesDropped = pyqtSignal(int, list)
+
+    def __init__(self, model: TrackTableModel, parent=None, waveform_delegate=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setMouseTracking(True)
+        self.setAcceptDrops(True)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.DropOnly)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked |
+            QAbstractItemView.EditTrigger.SelectedClicked |
+            QAbstractItemView.EditTrigger.EditKeyPressed |
+            QAbstractItemView.EditTrigger.AnyKeyPressed
+        )
+
+        self.file_delegate = ButtonDelegate(self)
+        self.file_delegate.clicked.connect(self.fileRequested)
+        self.play_delegate = ButtonDelegate(self)
+        self.play_delegate.clicked.connect(self.playRequested)
+        self.volume_delegate = SliderDelegate(self)
+        self.setItemDelegateForColumn(COL_FILE, self.file_delegate)
+        self.setItemDelegateForColumn(COL_PLAY, self.play_delegate)
+        self.setItemDelegateForColumn(COL_VOLUME, self.volume_delegate)
+        self.waveform_delegate = waveform_delegate
+        if waveform_delegate is not None:
+            waveform_delegate.setParent(self)
+            waveform_delegate.peaksReady.connect(
+                lambda _, ok: ok and self.viewport().update()
+            )
+            self.setItemDelegateForColumn(COL_WAVEFORM, waveform_delegate)
+            # Linhas novas ou alteradas buscam os picos de novo (o arquivo pode ter mudado)
+            model.modelReset.connect(lambda: waveform_delegate.forget())
+            model.dataChanged.connect(lambda top, bottom, *_: waveform_delegate.forget(
+                model.track_at(row).file_path for row in range(top.row(), bottom.row() + 1)
+            ))
+
+        # Altura fixa das linhas: a tabela não precisa medir cada linha
+        vertical = self.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(30)
+
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(COL_EVENT, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(COL_NAME, QHeaderView.ResizeMode.Stretch)
+        self.setColumnWidth(COL_SEQUENCE, 40)
+        self.setColumnWidth(COL_FILE, 34)
+        self.setColumnWidth(COL_PLAY, 34)
+        self.setColumnWidth(COL_VOLUME, 150)
+        self.setColumnWidth(COL_WAVEFORM, 160)
+        self.setColumnHidden(COL_WAVEFORM, waveform_delegate is None)
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            super().dragEnterEvent(event)
+
+    def dragMoveEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            super().dragMoveEvent(event)
+
+    def dropEvent(self, event):
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if not paths:
+            super().dropEvent(event)
+            return
+        row = self.indexAt(event.position().toPoint()).row()
+        if row < 0:
+            row = self.model().rowCount()
+        self.filesDropped.emit(row, paths)
+        event.acceptProposedAction()
+
+    def focus_row(self, row: int) -> None:
+        """Rola a tabela até a linha e a torna a linha atual"""
+        index = self.model().index(row, COL_EVENT)
+        self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+        self.setCurrentIndex(index)